@@ -1,5 +1,6 @@
 # app/config.py
 import os
+import tempfile
 from dotenv import load_dotenv
 
 load_dotenv()  # reads .env automatically
@@ -13,3 +14,110 @@ class Config:
     SUPABASE_SERVICE_ROLE_KEY = os.getenv("SUPABASE_SERVICE_ROLE_KEY")
     SUPABASE_ANON_KEY = os.getenv("SUPABASE_ANON_KEY")
     SUPABASE_JWT_SECRET=os.getenv("SUPABASE_JWT_SECRET")
+
+    # Shared Supabase (PostgREST) connection pool
+    SUPABASE_POOL_SIZE = int(os.getenv("SUPABASE_POOL_SIZE", "20"))
+    SUPABASE_KEEPALIVE = int(os.getenv("SUPABASE_KEEPALIVE", "10"))
+    SUPABASE_TIMEOUT = float(os.getenv("SUPABASE_TIMEOUT", "10"))
+    SUPABASE_CONNECT_TIMEOUT = float(os.getenv("SUPABASE_CONNECT_TIMEOUT", "5"))
+    SUPABASE_MAX_RETRIES = int(os.getenv("SUPABASE_MAX_RETRIES", "3"))
+    SUPABASE_RETRY_BACKOFF = float(os.getenv("SUPABASE_RETRY_BACKOFF", "0.25"))
+
+    # Keyword extraction cache (set KEYWORD_CACHE_DB to a path to persist across restarts)
+    KEYWORD_CACHE_SIZE = int(os.getenv("KEYWORD_CACHE_SIZE", "1024"))
+    KEYWORD_CACHE_TTL = float(os.getenv("KEYWORD_CACHE_TTL", "86400"))
+    KEYWORD_FALLBACK_TTL = float(os.getenv("KEYWORD_FALLBACK_TTL", "300"))
+    KEYWORD_CACHE_DB = os.getenv("KEYWORD_CACHE_DB", "")
+
+    # LaTeX compilation: "remote" (latexonline.cc), "local" (pdflatex/tectonic) or "auto"
+    COMPILE_BACKEND = os.getenv("COMPILE_BACKEND", "auto")
+    LATEX_COMPILER = os.getenv("LATEX_COMPILER", "pdflatex")
+    COMPILE_CONCURRENCY = int(os.getenv("COMPILE_CONCURRENCY", "2"))
+    COMPILE_TIMEOUT = float(os.getenv("COMPILE_TIMEOUT", "30"))
+    COMPILE_TIMEOUT_REMOTE = float(os.getenv("COMPILE_TIMEOUT_REMOTE", "90"))
+    COMPILE_CACHE_SIZE = int(os.getenv("COMPILE_CACHE_SIZE", "256"))
+    COMPILE_CACHE_MB = int(os.getenv("COMPILE_CACHE_MB", "64"))
+    COMPILE_CACHE_TTL = float(os.getenv("COMPILE_CACHE_TTL", "3600"))
+
+    # Live-editing score sessions
+    SCORE_SESSION_MAX = int(os.getenv("SCORE_SESSION_MAX", "1000"))
+    SCORE_SESSION_TTL = float(os.getenv("SCORE_SESSION_TTL", "1800"))
+    SCORE_SESSION_MAX_MB = int(os.getenv("SCORE_SESSION_MAX_MB", "64"))
+
+    # Load heavy models in a background thread at startup (otherwise on first use)
+    MODEL_WARMUP = os.getenv("MODEL_WARMUP", "true").lower() in ("1", "true", "yes")
+
+    # Resume uploads: per-file size limit, and the cap on a whole request body (upload
+    # plus form fields) enforced before it is parsed
+    MAX_UPLOAD_BYTES = int(float(os.getenv("MAX_UPLOAD_MB", "10")) * 1024 * 1024)
+    MAX_REQUEST_BYTES = int(float(os.getenv("MAX_REQUEST_MB", "12")) * 1024 * 1024)
+
+    # Process pool for CPU-bound NLP/scoring (-1 = one worker per core, 0 = run in threads instead)
+    CPU_POOL_WORKERS = int(os.getenv("CPU_POOL_WORKERS", "-1"))
+    CPU_TASK_TIMEOUT = float(os.getenv("CPU_TASK_TIMEOUT", "30"))
+
+    # Verified-JWT cache (entries also expire at the token's exp)
+    JWT_CACHE_SIZE = int(os.getenv("JWT_CACHE_SIZE", "4096"))
+    JWT_CACHE_MAX_TTL = float(os.getenv("JWT_CACHE_MAX_TTL", "3600"))
+    JWT_NEGATIVE_TTL = float(os.getenv("JWT_NEGATIVE_TTL", "30"))
+
+    # Per-user profile cache (experiences, projects, templates) for /rewrite
+    PROFILE_CACHE_SIZE = int(os.getenv("PROFILE_CACHE_SIZE", "2048"))
+    PROFILE_CACHE_TTL = float(os.getenv("PROFILE_CACHE_TTL", "600"))
+    PROFILE_CACHE_MB = int(os.getenv("PROFILE_CACHE_MB", "32"))
+    # Write stamps shared by all worker processes on the host, so a write seen
+    # by one worker invalidates the others' caches ("" = per-process only)
+    PROFILE_STAMP_DB = os.getenv("PROFILE_STAMP_DB", os.path.join(tempfile.gettempdir(), "resumatch", "profile_stamps.db"))
+
+    # Parsed user LaTeX templates, keyed by template id + content hash
+    TEMPLATE_CACHE_SIZE = int(os.getenv("TEMPLATE_CACHE_SIZE", "512"))
+    TEMPLATE_CACHE_TTL = float(os.getenv("TEMPLATE_CACHE_TTL", "3600"))
+
+    # /rewrite mode: "full" (one Gemini call) or "sections" (one concurrent call per \section)
+    REWRITE_MODE = os.getenv("REWRITE_MODE", "full")
+    REWRITE_SECTION_CONCURRENCY = int(os.getenv("REWRITE_SECTION_CONCURRENCY", "4"))
+
+    # Rewrite prompt budget: estimated tokens (chars / PROMPT_CHARS_PER_TOKEN) and saved entries kept
+    PROMPT_TOKEN_BUDGET = int(os.getenv("PROMPT_TOKEN_BUDGET", "12000"))
+    PROMPT_CHARS_PER_TOKEN = int(os.getenv("PROMPT_CHARS_PER_TOKEN", "4"))
+    PROMPT_MAX_SAVED_ENTRIES = int(os.getenv("PROMPT_MAX_SAVED_ENTRIES", "8"))
+
+    # Gemini client: rate limit, concurrency cap, per-call timeout and circuit breaker
+    LLM_RATE_PER_SEC = float(os.getenv("LLM_RATE_PER_SEC", "5"))
+    LLM_BURST = int(os.getenv("LLM_BURST", "10"))
+    LLM_MAX_CONCURRENCY = int(os.getenv("LLM_MAX_CONCURRENCY", "8"))
+    LLM_TIMEOUT = float(os.getenv("LLM_TIMEOUT", "120"))
+    LLM_BREAKER_FAILURES = int(os.getenv("LLM_BREAKER_FAILURES", "5"))
+    LLM_BREAKER_RESET = float(os.getenv("LLM_BREAKER_RESET", "30"))
+
+    # Keyword extraction: start the local TF-IDF/spaCy extractor if Gemini hasn't answered by then
+    KEYWORD_HEDGE_DEADLINE = float(os.getenv("KEYWORD_HEDGE_DEADLINE", "3"))
+    KEYWORD_LLM_TIMEOUT = float(os.getenv("KEYWORD_LLM_TIMEOUT", "20"))
+
+    # Background rewrite jobs (/api/jobs): worker tasks, queue bound (429 when full), per-job timeout, result retention
+    JOB_WORKERS = int(os.getenv("JOB_WORKERS", "4"))
+    JOB_QUEUE_SIZE = int(os.getenv("JOB_QUEUE_SIZE", "100"))
+    JOB_TIMEOUT = float(os.getenv("JOB_TIMEOUT", "300"))
+    JOB_RESULT_MAX = int(os.getenv("JOB_RESULT_MAX", "1000"))
+    JOB_RESULT_TTL = float(os.getenv("JOB_RESULT_TTL", "3600"))
+
+    # /rewrite/batch: job descriptions per request, and how many are tailored concurrently
+    BATCH_MAX_JOB_DESCRIPTIONS = int(os.getenv("BATCH_MAX_JOB_DESCRIPTIONS", "25"))
+    BATCH_CONCURRENCY = int(os.getenv("BATCH_CONCURRENCY", "4"))
+
+    # Tailored-result store: repeat rewrites of the same resume/JD/profile skip Gemini.
+    # RESULT_STORE_DB persists results on disk for all workers (LRU-evicted above
+    # RESULT_STORE_MB); set it to "" for a per-process memory store only.
+    RESULT_CACHE_SIZE = int(os.getenv("RESULT_CACHE_SIZE", "256"))
+    RESULT_STORE_TTL = float(os.getenv("RESULT_STORE_TTL", str(30 * 86400)))
+    RESULT_STORE_DB = os.getenv("RESULT_STORE_DB", os.path.join(tempfile.gettempdir(), "resumatch", "tailored_results.db"))
+    RESULT_STORE_MB = int(os.getenv("RESULT_STORE_MB", "256"))
+
+    # Skill taxonomy for keyword fallback and ATS matching (JSON; empty = bundled app/data/skill_taxonomy.json)
+    SKILL_TAXONOMY_PATH = os.getenv("SKILL_TAXONOMY_PATH", "")
+
+    # spaCy for keyword fallback: model, characters of JD text it sees, and nlp.pipe batching
+    SPACY_MODEL = os.getenv("SPACY_MODEL", "en_core_web_sm")
+    SPACY_MAX_CHARS = int(os.getenv("SPACY_MAX_CHARS", "20000"))
+    SPACY_BATCH_SIZE = int(os.getenv("SPACY_BATCH_SIZE", "32"))
+    SPACY_PROCESSES = int(os.getenv("SPACY_PROCESSES", "1"))
@@ -1,18 +1,48 @@
+from contextlib import asynccontextmanager
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 from app.routes.health import router as health_router
+from app.routes.job_routes import router as job_router
+from app.routes.metrics import router as metrics_router
 from app.routes.resume_routes import router as resume_router
 from app.routes.user_data_routes import router as user_data_router
+from app.services import supabase_service, compile_service, model_registry, cpu_pool, job_service
+from app.config import Config
+from app.utils.body_limit import BodyLimitMiddleware
+from app.utils.metrics import ServerTimingMiddleware
 import os
 
 FRONTEND_ORIGIN = os.getenv("FRONTEND_ORIGIN", "http://localhost:3000")
 
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    # Shared resources live for the whole app, not per request
+    await supabase_service.startup()
+    if Config.MODEL_WARMUP:
+        # Load spaCy, scikit-learn, NLTK and Gemini in the background so
+        # startup (and /api/health) doesn't wait on them; see /api/ready
+        model_registry.start_warmup()
+    # Worker processes preload spaCy/sklearn/NLTK for keyword fallback and scoring
+    cpu_pool.startup()
+    yield
+    await job_service.jobs.shutdown()
+    cpu_pool.shutdown()
+    await supabase_service.shutdown()
+    await compile_service.shutdown()
+
+
 app = FastAPI(
     title="ResuMatch AI Backend",
     description="API for AI-powered resume tailoring",
-    version="0.1.0"
+    version="0.1.0",
+    lifespan=lifespan
 )
 
+# Oversized bodies are refused before the multipart parser receives them
+# (added first: innermost, so the 413 still gets CORS headers)
+app.add_middleware(BodyLimitMiddleware, max_bytes=Config.MAX_REQUEST_BYTES)
+
 # --- CORS: allow Next dev server to connect ---
 origins = [
     "http://localhost:3000",  # Next.js dev server
@@ -26,12 +56,19 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    # Let the frontend read per-stage timings and the compile cache status
+    expose_headers=["Server-Timing", "X-Compile-Cache"],
 )
+# Per-request stage timings (see app/utils/metrics.py)
+app.add_middleware(ServerTimingMiddleware)
 
 # --- Register Routers ---
 app.include_router(health_router, prefix="/api")
 app.include_router(resume_router, prefix="/api")
 app.include_router(user_data_router, prefix="/api")
+app.include_router(job_router, prefix="/api")
+# Prometheus scrapes /metrics at the root by convention
+app.include_router(metrics_router)
 
 
 @app.get("/")
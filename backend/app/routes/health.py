@@ -1,4 +1,9 @@
 from fastapi import APIRouter
+from fastapi.responses import JSONResponse
+from app.services.supabase_service import get_supabase
+from app.utils.auth import jwt_cache
+from app.utils.singleflight import gemini_flights
+from app.services import llm_client, latex_service, keyword_service, compile_service, score_session_service, model_registry, cpu_pool, profile_service, job_service, result_store
 
 router = APIRouter()
 
@@ -6,3 +11,36 @@ router = APIRouter()
 async def health_check():
     """Simple health endpoint to verify backend is alive."""
     return {"status": "ok", "message": "ResuMatch AI backend running"}
+
+
+@router.get("/ready", tags=["Health"])
+async def readiness_check():
+    """Reports which heavy models/libraries are loaded; 503 until all are."""
+    status = model_registry.readiness()
+    return JSONResponse(status, status_code=200 if status["ready"] else 503)
+
+
+@router.get("/health/pool", tags=["Health"])
+async def pool_stats():
+    """Connection-pool usage for the shared Supabase client, the CPU process pool and the job queue."""
+    return {"supabase": get_supabase().stats(), "cpu": cpu_pool.stats(), "jobs": job_service.jobs.stats()}
+
+
+@router.get("/health/caches", tags=["Health"])
+async def cache_stats():
+    """Hit/miss/eviction counters for in-process caches."""
+    return {
+        "keywords": keyword_service.keyword_cache.stats(),
+        "compiled_pdfs": compile_service.pdf_cache.stats(),
+        "score_sessions": score_session_service.sessions.stats(),
+        "jwt": jwt_cache.stats(),
+        "profiles": profile_service.profile_cache.stats(),
+        "templates": latex_service.template_cache.stats(),
+        "tailored_results": result_store.stats()
+    }
+
+
+@router.get("/health/llm", tags=["Health"])
+async def llm_stats():
+    """Gemini client limits, circuit state and call counters (incl. coalesced in-flight calls)."""
+    return {"gemini": llm_client.gemini.stats(), "singleflight": gemini_flights.stats()}
@@ -0,0 +1,88 @@
+from fastapi import APIRouter, UploadFile, Form, HTTPException, Request, Depends
+from fastapi.responses import JSONResponse
+from app.routes.resume_routes import load_resume, resolve_rewrite_mode, run_rewrite
+from app.services import job_service
+from app.services.supabase_service import SupabaseClient, get_supabase
+from app.utils.auth import get_optional_user
+
+router = APIRouter()
+
+# Seconds a client is asked to wait before retrying when the queue is full
+RETRY_AFTER = "5"
+
+
+def job_status(job: job_service.Job) -> dict:
+    status = job.to_dict()
+    status["queue_position"] = job_service.jobs.queue_position(job)
+    status["status_url"] = f"/api/jobs/{job.id}"
+    status["result_url"] = f"/api/jobs/{job.id}/result"
+    return status
+
+
+def get_job_for(job_id: str, user: dict | None) -> job_service.Job:
+    """The job if it exists (or its result is still retained) and belongs to the caller."""
+    job = job_service.jobs.get(job_id)
+    user_id = user.get("sub") if user else None
+    if job is None or (job.owner is not None and job.owner != user_id):
+        raise HTTPException(status_code=404, detail="Job not found or its result has expired.")
+    return job
+
+
+@router.post("/jobs/rewrite", tags=["Jobs"], status_code=202)
+async def submit_rewrite_job(
+    request: Request,
+    resume: UploadFile | None = None,
+    latex_content: str | None = Form(None),
+    latex_resume: str | None = Form(None),
+    job_description: str = Form(...),
+    template_id: str | None = Form(None),
+    rewrite_mode: str | None = Form(None),
+    bypass_cache: bool = Form(False),
+    supabase: SupabaseClient = Depends(get_supabase),
+    user: dict | None = Depends(get_optional_user),
+):
+    """
+    Queue a /rewrite and return at once with a job id (202). The upload is
+    parsed here, so input errors still fail fast; keywords, the Gemini
+    rewrite and scoring run on the background workers. Poll
+    /api/jobs/{job_id} for progress and fetch /api/jobs/{job_id}/result.
+    Returns 429 with Retry-After when the queue is full.
+    """
+    rewrite_mode = resolve_rewrite_mode(rewrite_mode)
+    latex_resume_final, resume_doc = await load_resume(
+        request, resume, latex_content, latex_resume, template_id, supabase
+    )
+    user_id = user.get("sub") if user else None
+
+    async def work(job):
+        return await run_rewrite(
+            latex_resume_final, job_description, rewrite_mode, user_id, supabase,
+            progress=job.set_stage, bypass_cache=bypass_cache, resume_doc=resume_doc
+        )
+
+    try:
+        job = job_service.jobs.submit("rewrite", work, owner=user_id)
+    except job_service.QueueFull as e:
+        raise HTTPException(status_code=429, detail=str(e), headers={"Retry-After": RETRY_AFTER})
+
+    return JSONResponse(job_status(job), status_code=202, headers={"Location": f"/api/jobs/{job.id}"})
+
+
+@router.get("/jobs/{job_id}", tags=["Jobs"])
+async def get_job_status(job_id: str, user: dict | None = Depends(get_optional_user)):
+    """Status, current stage, finished stage timings and queue position."""
+    return job_status(get_job_for(job_id, user))
+
+
+@router.get("/jobs/{job_id}/result", tags=["Jobs"])
+async def get_job_result(job_id: str, user: dict | None = Depends(get_optional_user)):
+    """
+    The /rewrite response body once the job is done; 202 with the status
+    while it is queued or running; the job's error status if it failed.
+    """
+    job = get_job_for(job_id, user)
+    if job.status == "done":
+        return job.result
+    if job.status == "failed":
+        raise HTTPException(status_code=job.error["status_code"], detail=job.error["detail"])
+    return JSONResponse(job_status(job), status_code=202)
@@ -0,0 +1,70 @@
+from fastapi import APIRouter
+from fastapi.responses import PlainTextResponse
+from app.utils import metrics
+from app.utils.auth import jwt_cache
+from app.utils.singleflight import gemini_flights
+from app.services import llm_client, latex_service, keyword_service, compile_service, score_session_service, profile_service, job_service, result_store
+
+router = APIRouter()
+
+
+def cache_stats() -> dict:
+    """cache name -> TTLCache/SQLiteCache stats, with tiered caches flattened."""
+    stats = {
+        "compiled_pdfs": compile_service.pdf_cache.stats(),
+        "score_sessions": score_session_service.sessions.stats(),
+        "jwt": jwt_cache.stats(),
+        "profiles": profile_service.profile_cache.stats(),
+        "templates": latex_service.template_cache.stats(),
+    }
+    for name, tiered in (("keywords", keyword_service.keyword_cache.stats()), ("tailored_results", result_store.stats())):
+        for tier, tier_stats in tiered.items():
+            stats[f"{name}_{tier}"] = tier_stats
+    return stats
+
+
+def render_metrics() -> str:
+    lines = metrics.stage_seconds.render() + metrics.keyword_fallbacks.render()
+
+    caches = cache_stats()
+    for field in ("hits", "misses", "evictions", "expirations"):
+        samples = {name: s[field] for name, s in caches.items() if field in s}
+        lines += metrics.render_samples(
+            f"resumatch_cache_{field}_total", f"Cache {field} per in-process cache.", "counter", "cache", samples
+        )
+    lines += metrics.render_samples(
+        "resumatch_cache_entries", "Entries currently held per cache.", "gauge", "cache",
+        {name: s["entries"] for name, s in caches.items()},
+    )
+
+    llm = llm_client.gemini.stats()
+    lines += metrics.render_samples(
+        "resumatch_llm_calls_total", "Gemini upstream calls by outcome.", "counter", "outcome",
+        {"started": llm["calls"], "failed": llm["failures"], "timed_out": llm["timeouts"],
+         "rejected_open_circuit": llm["circuit"]["rejected"]},
+    )
+    lines += metrics.render_samples(
+        "resumatch_llm_in_flight", "Gemini calls currently running.", "gauge", "model",
+        {llm_client.gemini.backend.model_name: llm["in_flight"]},
+    )
+    flights = gemini_flights.stats()
+    lines += metrics.render_samples(
+        "resumatch_singleflight_calls_total", "Gemini call requests, split into upstream and coalesced.", "counter", "kind",
+        {"upstream": flights["upstream_calls"], "coalesced": flights["coalesced"]},
+    )
+    queue = job_service.jobs.stats()
+    lines += metrics.render_samples(
+        "resumatch_jobs", "Background jobs currently queued or running.", "gauge", "state",
+        {"queued": queue["queued"], "running": queue["running"]},
+    )
+    lines += metrics.render_samples(
+        "resumatch_jobs_total", "Background jobs by outcome.", "counter", "outcome",
+        {"completed": queue["completed"], "failed": queue["failed"], "rejected": queue["rejected"]},
+    )
+    return "\n".join(lines) + "\n"
+
+
+@router.get("/metrics", tags=["Health"], response_class=PlainTextResponse)
+async def prometheus_metrics():
+    """Stage latency histograms, cache and LLM counters in Prometheus text format."""
+    return PlainTextResponse(render_metrics(), media_type="text/plain; version=0.0.4")
@@ -1,28 +1,227 @@
-from fastapi import APIRouter, UploadFile, Form, HTTPException, Request
+from fastapi import APIRouter, UploadFile, Form, HTTPException, Request, Depends
 from fastapi.responses import StreamingResponse
-from app.services import parsing_service, latex_service, keyword_service, rewrite_service, score_service
-from app.utils.auth import verify_jwt
+from app.services import parsing_service, latex_service, keyword_service, rewrite_service, score_service, compile_service, score_session_service, model_registry, cpu_pool, profile_service, llm_client, result_store, resume_parser
 from app.config import Config
+from app.services.supabase_service import SupabaseClient, get_supabase
+from app.utils.auth import bearer_token, get_optional_user
+from app.utils.metrics import timed, timed_await
+from app.utils.sse import sse_event, SSE_HEADERS
 from io import BytesIO
-import requests
-import re
+import asyncio
 import json
-import google.generativeai as genai
 import os
 
 router = APIRouter()
 
-# Supabase config for personalization
-SUPABASE_URL = Config.SUPABASE_URL
-SUPABASE_KEY = Config.SUPABASE_SERVICE_ROLE_KEY
 
-supabase_headers = {
-    "apikey": SUPABASE_KEY,
-    "Authorization": f"Bearer {SUPABASE_KEY}",
-    "Content-Type": "application/json"
-}
+# -------------------- REWRITE PIPELINE STAGES --------------------
+
+def extract_and_parse(resume) -> resume_parser.ResumeDocument:
+    """Upload -> ResumeDocument, parsed once and shared by rendering and prompt planning."""
+    return resume_parser.parse_resume(parsing_service.extract_text_from_resume(resume))
+
+
+async def load_resume(request, resume, latex_content, latex_resume, template_id, supabase):
+    """
+    Turn the uploaded resume / LaTeX input into the LaTeX document to
+    rewrite. Returns (latex, doc): an upload is parsed once into a
+    ResumeDocument that rendering and prompt planning share; LaTeX input
+    has no doc (None).
+    """
+    if resume:
+        try:
+            with timed("parse"):
+                doc = await asyncio.to_thread(extract_and_parse, resume)
+        except parsing_service.UploadTooLargeError as e:
+            raise HTTPException(status_code=413, detail=str(e))
+
+        # Default template (Jake)
+        template_latex = None
+
+        # If user provided template_id, require auth and fetch it
+        if template_id:
+            if not bearer_token(request):
+                raise HTTPException(status_code=401, detail="Login required to use custom templates.")
+
+            payload = await get_optional_user(request)
+            if payload is None:
+                raise HTTPException(status_code=401, detail="Invalid or expired JWT")
+            user_id = payload.get("sub")
+            if not user_id:
+                raise HTTPException(status_code=401, detail="Invalid auth token.")
+
+            with timed("template_fetch"):
+                template_latex = await profile_service.get_template_latex(supabase, user_id, template_id)
+            if template_latex is None:
+                raise HTTPException(status_code=404, detail="Template not found.")
+
+        with timed("render"):
+            if template_latex:
+                latex = await asyncio.to_thread(latex_service.wrap_in_template, doc, template_latex, template_id)
+            else:
+                latex = await asyncio.to_thread(latex_service.wrap_in_jake_template, doc)
+        return latex, doc
+
+    elif latex_resume:
+        with timed("parse"):
+            return latex_service.clean_and_validate_latex(latex_resume), None
+
+    elif latex_content:
+        with timed("parse"):
+            return latex_service.clean_and_validate_latex(latex_content), None
+
+    raise HTTPException(
+        status_code=400,
+        detail="Please upload a resume (PDF) or a LaTeX (.tex) file."
+    )
+
+
+async def load_profile(user_id, supabase: SupabaseClient):
+    """Saved (experiences, projects) for a signed-in user; empty for guests."""
+    if not user_id:
+        print("Guest user — skipping saved experiences/projects.")
+        return [], []
+    print("Fetching personalized experiences and projects...")
+    experiences, projects = await timed_await("profile_fetch", asyncio.gather(
+        profile_service.get_user_rows(supabase, user_id, "experiences"),
+        profile_service.get_user_rows(supabase, user_id, "projects"),
+    ))
+    print(f"Loaded {len(experiences)} experiences, {len(projects)} projects.")
+    return experiences, projects
+
+
+async def extract_keywords(job_description: str, fallback_batch=None):
+    """Keyword extraction as a timed stage."""
+    return await timed_await("keywords", keyword_service.extract_keywords_async(
+        job_description, fallback_batch=fallback_batch
+    ))
+
+
+async def keywords_and_profile(job_description: str, user_id, supabase: SupabaseClient):
+    """Keywords and saved profile are independent: run them concurrently."""
+    print("Extracting keywords...")
+    keywords, (experiences, projects) = await asyncio.gather(
+        extract_keywords(job_description),
+        load_profile(user_id, supabase),
+    )
+    return keywords, experiences, projects
+
+
+def plan_prompt(latex_resume: str, job_description: str, keywords, experiences, projects, resume_doc=None):
+    """Fit the rewrite prompt to the token budget and log what was kept."""
+    plan = rewrite_service.plan_rewrite_prompt(
+        latex_resume, job_description, keywords, experiences, projects, resume_doc=resume_doc
+    )
+    stats = plan.stats
+    print(
+        f"Prompt ~{stats['prompt_tokens']}/{stats['budget']} tokens, "
+        f"experiences {stats['experiences']}, projects {stats['projects']}, "
+        f"JD trimmed: {stats['jd_trimmed']}"
+    )
+    return plan
+
+
+def resolve_rewrite_mode(rewrite_mode: str | None) -> str:
+    rewrite_mode = rewrite_mode or Config.REWRITE_MODE
+    if rewrite_mode not in ("full", "sections"):
+        raise HTTPException(status_code=400, detail="rewrite_mode must be 'full' or 'sections'.")
+    return rewrite_mode
+
+
+async def run_rewrite(latex_resume: str, job_description: str, rewrite_mode: str, user_id, supabase: SupabaseClient,
+                      progress=None, profile=None, bypass_cache: bool = False, resume_doc=None,
+                      keyword_fallback=None) -> dict:
+    """
+    Keywords + saved profile -> Gemini rewrite -> ATS score, on an already
+    parsed resume. Shared by /rewrite, background jobs and batches;
+    `progress(stage)` is called as each stage starts, and a preloaded
+    `profile` (experiences, projects) is used instead of fetching it.
+    `resume_doc` is the parsed upload (load_resume), if any, for the prompt
+    planner; `keyword_fallback` is a keyword_service.FallbackBatch shared by
+    the JDs of a batch.
+
+    A stored result for the same resume, JD, profile, mode, model and
+    prompt version is returned without calling Gemini (`"cached": true`)
+    unless `bypass_cache` is set; fresh results are stored either way,
+    only briefly if the keywords came from the local fallback.
+    """
+    progress = progress or (lambda stage: None)
+
+    # Keywords run while the profile loads; the profile is part of the
+    # result key, and a stored result makes the keywords unnecessary. With
+    # no profile fetch to overlap, they wait for the store lookup instead.
+    print("Extracting keywords...")
+    keywords_task = None
+    if profile is None and user_id:
+        keywords_task = asyncio.ensure_future(extract_keywords(job_description, keyword_fallback))
+    try:
+        experiences, projects = profile if profile is not None else await load_profile(user_id, supabase)
+        key = result_store.result_key(latex_resume, job_description, rewrite_mode, experiences, projects)
+        if not bypass_cache:
+            stored = await timed_await("result_store", result_store.get(key))
+            if stored is not None:
+                print("Serving stored tailored result.")
+                if keywords_task is not None:
+                    keywords_task.cancel()
+                return {**stored, "cached": True}
+
+        progress("keywords")
+        keywords = await (keywords_task or extract_keywords(job_description, keyword_fallback))
+    except BaseException:
+        if keywords_task is not None:
+            keywords_task.cancel()
+        raise
+
+    # -------------------------
+    # Rewrite using Gemini
+    # -------------------------
+    progress("rewrite")
+    print(f"Rewriting resume ({rewrite_mode})...")
+    rewrite = (
+        rewrite_service.rewrite_resume_sectioned_async if rewrite_mode == "sections"
+        else rewrite_service.rewrite_resume_with_gemini_async
+    )
+    try:
+        with timed("rewrite"):
+            plan = plan_prompt(latex_resume, job_description, keywords, experiences, projects, resume_doc)
+            tailored_resume = await rewrite(
+                latex_resume,
+                plan.job_description,
+                keywords,
+                experiences=plan.experiences,
+                projects=plan.projects
+            )
+    except llm_client.LLMUnavailable as e:
+        raise HTTPException(status_code=503, detail=f"Rewrite service unavailable: {str(e)}")
+
+    # -------------------------
+    # Score rewritten resume
+    # -------------------------
+    progress("score")
+    print("ATS Scoring...")
+    with timed("score"):
+        ats_score = await cpu_pool.run(
+            score_service.compute_ats_score,
+            job_description,
+            tailored_resume,
+            keywords
+        )
+
+    print("Done")
+    result = {
+        "tailored_resume": tailored_resume,
+        "ats_score": ats_score,
+        "keywords": keywords,
+        "job_description": job_description,
+        "prompt_stats": plan.stats
+    }
+    # Degraded (fallback) keywords shouldn't pin a result for the full store TTL
+    await result_store.put(key, result, ttl=Config.KEYWORD_FALLBACK_TTL if keyword_service.is_fallback(keywords) else None)
+    return {**result, "cached": False}
 
 
+# -------------------- REWRITE --------------------
+
 @router.post("/rewrite", tags=["Resume"])
 async def rewrite_resume(
     request: Request,
@@ -31,174 +230,214 @@ async def rewrite_resume(
     latex_resume: str | None = Form(None),
     job_description: str = Form(...),
     template_id: str | None = Form(None),
+    rewrite_mode: str | None = Form(None),
+    bypass_cache: bool = Form(False),
+    supabase: SupabaseClient = Depends(get_supabase),
+    user: dict | None = Depends(get_optional_user),
 ):
+    rewrite_mode = resolve_rewrite_mode(rewrite_mode)
+
     try:
         print("Parsing input...")
+        latex_resume_final, resume_doc = await load_resume(
+            request, resume, latex_content, latex_resume, template_id, supabase
+        )
 
-        # -------------------------
-        # Load original LaTeX resume
-        # -------------------------
-        if resume:
-            resume_text = parsing_service.extract_text_from_resume(resume)
-
-            # Default template (Jake)
-            template_latex = None
-
-            # If user provided template_id, require auth and fetch it
-            if template_id:
-                auth_header = request.headers.get("authorization") or request.headers.get("Authorization")
-                if not auth_header or not auth_header.lower().startswith("bearer "):
-                    raise HTTPException(status_code=401, detail="Login required to use custom templates.")
-
-                token = auth_header.split(" ", 1)[1].strip()
-                payload = verify_jwt(token)
-                user_id = payload.get("sub")
-                if not user_id:
-                    raise HTTPException(status_code=401, detail="Invalid auth token.")
-
-                tpl_res = requests.get(
-                    f"{SUPABASE_URL}/rest/v1/resume_templates?id=eq.{template_id}&user_id=eq.{user_id}&select=latex",
-                    headers=supabase_headers
-                )
-                if tpl_res.status_code != 200 or not tpl_res.json():
-                    raise HTTPException(status_code=404, detail="Template not found.")
-                template_latex = tpl_res.json()[0]["latex"]
+        user_id = user.get("sub") if user else None
+        return await run_rewrite(
+            latex_resume_final, job_description, rewrite_mode, user_id, supabase,
+            bypass_cache=bypass_cache, resume_doc=resume_doc
+        )
 
-            if template_latex:
-                latex_resume_final = latex_service.wrap_in_template(resume_text, template_latex)
-            else:
-                latex_resume_final = latex_service.wrap_in_jake_template(resume_text)
+    except HTTPException:
+        raise
+    except Exception as e:
+        raise HTTPException(
+            status_code=500,
+            detail=f"Error processing resume: {str(e)}"
+        )
 
-        elif latex_resume:
-            latex_resume_final = latex_service.clean_and_validate_latex(latex_resume)
 
-        elif latex_content:
-            latex_resume_final = latex_service.clean_and_validate_latex(latex_content)
+def parse_job_descriptions(job_descriptions_json: str) -> list:
+    """Validate the batch's JSON array of job description strings (400 on bad input)."""
+    try:
+        job_descriptions = json.loads(job_descriptions_json)
+    except json.JSONDecodeError:
+        raise HTTPException(status_code=400, detail="job_descriptions must be a JSON array of strings.")
+    if not isinstance(job_descriptions, list) or not all(isinstance(jd, str) and jd.strip() for jd in job_descriptions):
+        raise HTTPException(status_code=400, detail="job_descriptions must be a JSON array of non-empty strings.")
+    if not job_descriptions:
+        raise HTTPException(status_code=400, detail="Provide at least one job description.")
+    if len(job_descriptions) > Config.BATCH_MAX_JOB_DESCRIPTIONS:
+        raise HTTPException(
+            status_code=400,
+            detail=f"At most {Config.BATCH_MAX_JOB_DESCRIPTIONS} job descriptions per batch."
+        )
+    return job_descriptions
 
-        else:
-            raise HTTPException(
-                status_code=400,
-                detail="Please upload a resume (PDF) or a LaTeX (.tex) file."
-            )
 
-        print("Extracting keywords...")
-        keywords = keyword_service.extract_keywords(job_description)
+@router.post("/rewrite/batch", tags=["Resume"])
+async def rewrite_resume_batch(
+    request: Request,
+    resume: UploadFile | None = None,
+    latex_content: str | None = Form(None),
+    latex_resume: str | None = Form(None),
+    job_descriptions: str = Form(...),
+    template_id: str | None = Form(None),
+    rewrite_mode: str | None = Form(None),
+    bypass_cache: bool = Form(False),
+    supabase: SupabaseClient = Depends(get_supabase),
+    user: dict | None = Depends(get_optional_user),
+):
+    """
+    Tailor one resume to many job descriptions (`job_descriptions` is a JSON
+    array of strings). The resume is parsed and rendered, the JWT verified
+    and the saved profile fetched once; keyword extraction, rewrite and
+    scoring then run per JD, BATCH_CONCURRENCY at a time.
+
+    Server-sent events: `start` with the count, then one `result` (the
+    /rewrite body plus `index`) or `error` (`index`, `detail`) per JD in
+    completion order, and a final `done` with the totals.
+    """
+    rewrite_mode = resolve_rewrite_mode(rewrite_mode)
+    job_descriptions = parse_job_descriptions(job_descriptions)
+    latex_resume_final, resume_doc = await load_resume(
+        request, resume, latex_content, latex_resume, template_id, supabase
+    )
+    user_id = user.get("sub") if user else None
+    try:
+        profile = await load_profile(user_id, supabase)
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Error loading saved profile: {str(e)}")
 
-        # -------------------------
-        # Optional auth: try to read JWT from Authorization header
-        # -------------------------
-        experiences: list = []
-        projects: list = []
-        user_id = None
+    limit = asyncio.Semaphore(Config.BATCH_CONCURRENCY)
+    # JDs that fall back to local extraction share one spaCy batch
+    keyword_fallback = keyword_service.FallbackBatch(job_descriptions)
 
-        auth_header = request.headers.get("authorization") or request.headers.get("Authorization")
-        if auth_header and auth_header.lower().startswith("bearer "):
-            token = auth_header.split(" ", 1)[1].strip()
+    async def tailor(index: int, job_description: str):
+        async with limit:
             try:
-                payload = verify_jwt(token)
-                user_id = payload.get("sub")
+                result = await run_rewrite(
+                    latex_resume_final, job_description, rewrite_mode, user_id, supabase,
+                    profile=profile, bypass_cache=bypass_cache, resume_doc=resume_doc,
+                    keyword_fallback=keyword_fallback
+                )
+                return "result", {"index": index, **result}
+            except HTTPException as e:
+                return "error", {"index": index, "status_code": e.status_code, "detail": e.detail}
             except Exception as e:
-                print("JWT invalid or failed to verify, treating as guest. Error:", e)
-
-        if user_id:
-            print("Fetching personalized experiences and projects...")
-
-            # Fetch experiences
-            exp_res = requests.get(
-                f"{SUPABASE_URL}/rest/v1/experiences?user_id=eq.{user_id}",
-                headers=supabase_headers
-            )
-            if exp_res.status_code == 200:
-                experiences = exp_res.json()
-
-            # Fetch projects
-            proj_res = requests.get(
-                f"{SUPABASE_URL}/rest/v1/projects?user_id=eq.{user_id}",
-                headers=supabase_headers
-            )
-            if proj_res.status_code == 200:
-                projects = proj_res.json()
-
-            print(f"Loaded {len(experiences)} experiences, {len(projects)} projects.")
-        else:
-            print("Guest user — skipping saved experiences/projects.")
-
-        # -------------------------
-        # Rewrite using Gemini
-        # -------------------------
-        print("Rewriting resume...")
-        tailored_resume = rewrite_service.rewrite_resume_with_gemini(
-            latex_resume_final,
-            job_description,
-            keywords,
-            experiences=experiences,
-            projects=projects
-        )
-
-        # -------------------------
-        # Score rewritten resume
-        # -------------------------
-        print("ATS Scoring...")
-        ats_score = score_service.compute_ats_score(
-            job_description,
-            tailored_resume,
-            keywords
+                return "error", {"index": index, "status_code": 500, "detail": f"Error processing resume: {str(e)}"}
+
+    async def events():
+        yield sse_event("start", {"count": len(job_descriptions), "rewrite_mode": rewrite_mode})
+        tasks = [asyncio.ensure_future(tailor(i, jd)) for i, jd in enumerate(job_descriptions)]
+        failed = 0
+        try:
+            for next_done in asyncio.as_completed(tasks):
+                event, data = await next_done
+                failed += event == "error"
+                yield sse_event(event, data)
+            yield sse_event("done", {"count": len(job_descriptions), "failed": failed})
+        finally:
+            # Client went away: don't keep spending Gemini calls on it
+            for task in tasks:
+                task.cancel()
+
+    return StreamingResponse(events(), media_type="text/event-stream", headers=SSE_HEADERS)
+
+
+@router.post("/rewrite/stream", tags=["Resume"])
+async def rewrite_resume_stream(
+    request: Request,
+    resume: UploadFile | None = None,
+    latex_content: str | None = Form(None),
+    latex_resume: str | None = Form(None),
+    job_description: str = Form(...),
+    template_id: str | None = Form(None),
+    supabase: SupabaseClient = Depends(get_supabase),
+    user: dict | None = Depends(get_optional_user),
+):
+    """
+    Server-sent-events variant of /rewrite. Emits `stage` and `keywords`
+    events, then `chunk` events with LaTeX text as Gemini generates it, and
+    a final `done` event with the full resume, keywords and ATS score
+    (or an `error` event).
+    """
+    # Input problems (bad upload, missing template, 401) still fail fast as HTTP errors
+    try:
+        latex_resume_final, resume_doc = await load_resume(
+            request, resume, latex_content, latex_resume, template_id, supabase
         )
+    except HTTPException:
+        raise
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Error processing resume: {str(e)}")
+
+    user_id = user.get("sub") if user else None
+
+    async def events():
+        try:
+            yield sse_event("stage", {"stage": "keywords"})
+            keywords, experiences, projects = await keywords_and_profile(job_description, user_id, supabase)
+            yield sse_event("keywords", {"keywords": keywords})
+
+            yield sse_event("stage", {"stage": "rewrite"})
+            with timed("rewrite"):
+                plan = plan_prompt(latex_resume_final, job_description, keywords, experiences, projects, resume_doc)
+                chunks = []
+                async for chunk in rewrite_service.stream_rewrite_with_gemini(
+                    latex_resume_final,
+                    plan.job_description,
+                    keywords,
+                    experiences=plan.experiences,
+                    projects=plan.projects
+                ):
+                    chunks.append(chunk)
+                    yield sse_event("chunk", {"text": chunk})
+            tailored_resume = "".join(chunks).strip()
+
+            yield sse_event("stage", {"stage": "score"})
+            with timed("score"):
+                ats_score = await cpu_pool.run(
+                    score_service.compute_ats_score,
+                    job_description,
+                    tailored_resume,
+                    keywords
+                )
 
-        print("Done")
-        return {
-            "tailored_resume": tailored_resume,
-            "ats_score": ats_score,
-            "keywords": keywords,
-            "job_description": job_description
-        }
+            yield sse_event("done", {
+                "tailored_resume": tailored_resume,
+                "ats_score": ats_score,
+                        "keywords": keywords,
+                "job_description": job_description,
+                "prompt_stats": plan.stats
+            })
+        except Exception as e:
+            yield sse_event("error", {"detail": f"Error processing resume: {str(e)}"})
 
-    except Exception as e:
-        raise HTTPException(
-            status_code=500,
-            detail=f"Error processing resume: {str(e)}"
-        )
+    return StreamingResponse(events(), media_type="text/event-stream", headers=SSE_HEADERS)
 
 
 @router.post("/compile", tags=["Resume"])
 async def compile_latex(latex_content: str = Form(...)):
     try:
-        latex_content = latex_content.strip()
-        latex_content = re.sub(
-            r"^```[a-zA-Z]*|```$",
-            "",
-            latex_content,
-            flags=re.MULTILINE
-        ).strip()
-
-        latex_content = latex_content.replace(
-            "\\input{glyphtounicode}",
-            "% Removed glyphtounicode for remote compilation"
-        )
-
-        response = requests.get(
-            "https://latexonline.cc/compile",
-            params={"text": latex_content},
-            timeout=90
-        )
-
-        if response.status_code != 200:
-            raise HTTPException(
-                status_code=500,
-                detail=f"LaTeX API returned {response.status_code}: {response.text[:500]}"
-            )
+        with timed("compile"):
+            pdf, cache_hit = await compile_service.compile_pdf(latex_content)
 
-        pdf_stream = BytesIO(response.content)
+        pdf_stream = BytesIO(pdf)
         return StreamingResponse(
             pdf_stream,
             media_type="application/pdf",
-            headers={"Content-Disposition": "attachment; filename=tailored_resume.pdf"}
+            headers={
+                "Content-Disposition": "attachment; filename=tailored_resume.pdf",
+                "X-Compile-Cache": "hit" if cache_hit else "miss"
+            }
         )
 
-    except requests.Timeout:
-        raise HTTPException(status_code=504, detail="Remote LaTeX API timed out.")
+    except compile_service.CompileTimeout as e:
+        raise HTTPException(status_code=504, detail=str(e))
     except Exception as e:
-        raise HTTPException(status_code=500, detail=f"Error using LaTeX API: {str(e)}")
+        raise HTTPException(status_code=500, detail=f"Error compiling LaTeX: {str(e)}")
 
 
 @router.post("/score", tags=["Resume"])
@@ -214,35 +453,111 @@ async def score_resume(
         print("keywords_json:", keywords_json)
         print("----------------------------------")
 
-        cleaned_latex = latex_body.strip()
-        cleaned_latex = re.sub(
-            r"^```[a-zA-Z]*|```$",
-            "",
-            cleaned_latex,
-            flags=re.MULTILINE
-        ).strip()
+        cleaned_latex = latex_service.strip_code_fences(latex_body)
 
         keywords = json.loads(keywords_json)
 
-        ats_score = score_service.compute_ats_score(
-            job_description,
-            cleaned_latex,
-            keywords
+        with timed("score"):
+            ats_score = await cpu_pool.run(
+                score_service.compute_ats_score,
+                job_description,
+                cleaned_latex,
+                keywords
+            )
+
+        return {
+            "ats_score": ats_score,
+            "keywords": keywords
+        }
+
+    except cpu_pool.CPUTaskTimeout as e:
+        raise HTTPException(status_code=504, detail=str(e))
+    except Exception as e:
+        raise HTTPException(
+            status_code=500,
+            detail=f"Error calculating ATS score: {str(e)}"
         )
 
+
+# -------------------- LIVE SCORING SESSIONS --------------------
+
+@router.post("/score/sessions", tags=["Resume"])
+async def create_score_session(
+    job_description: str = Form(...),
+    keywords_json: str = Form(...),
+    latex_body: str | None = Form(None)
+):
+    """Precompute JD/keyword state once; later edits are scored incrementally."""
+    try:
+        keywords = json.loads(keywords_json)
+        session_id, session = await asyncio.to_thread(
+            score_session_service.create_session, job_description, keywords
+        )
+
+        ats_score = None
+        if latex_body is not None:
+            ats_score = await asyncio.to_thread(session.update, latex_body)
+            score_session_service.save_session(session_id, session)
+
         return {
+            "session_id": session_id,
             "ats_score": ats_score,
             "keywords": keywords
         }
 
+    except Exception as e:
+        raise HTTPException(
+            status_code=500,
+            detail=f"Error creating score session: {str(e)}"
+        )
+
+
+@router.post("/score/sessions/{session_id}", tags=["Resume"])
+async def update_score_session(
+    session_id: str,
+    latex_body: str | None = Form(None),
+    edits_json: str | None = Form(None)
+):
+    """Score the full new text, or a list of {start, end, text} edits."""
+    session = score_session_service.get_session(session_id)
+    if session is None:
+        raise HTTPException(status_code=404, detail="Score session not found or expired.")
+    if latex_body is None and edits_json is None:
+        raise HTTPException(status_code=400, detail="Send latex_body or edits_json.")
+
+    try:
+        if latex_body is not None:
+            ats_score = await asyncio.to_thread(session.update, latex_body)
+        else:
+            try:
+                ats_score = await asyncio.to_thread(session.apply_edits, json.loads(edits_json))
+            except ValueError as e:   # bad JSON or an edit outside the text
+                raise HTTPException(status_code=400, detail=f"Invalid edits_json: {e}")
+        score_session_service.save_session(session_id, session)
+
+        return {
+            "ats_score": ats_score,
+            "keywords": session.keywords
+        }
+
+    except HTTPException:
+        raise
     except Exception as e:
         raise HTTPException(
             status_code=500,
             detail=f"Error calculating ATS score: {str(e)}"
         )
-    
+
+
+@router.delete("/score/sessions/{session_id}", tags=["Resume"])
+async def delete_score_session(session_id: str):
+    score_session_service.delete_session(session_id)
+    return {"status": "deleted"}
+
+
 @router.get("/debug/models")
 def list_models():
+    genai = model_registry.gemini.get()
     genai.configure(api_key=os.environ["GEMINI_API_KEY"])
     out = []
     for m in genai.list_models():
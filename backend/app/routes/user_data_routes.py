@@ -1,27 +1,19 @@
 from fastapi import APIRouter, Form, Depends, HTTPException
 from app.utils.auth import get_current_user
-from app.config import Config
-import requests
+from app.services.supabase_service import SupabaseClient, get_supabase
+from app.services import profile_service
 import json
 
 router = APIRouter()
 
-SUPABASE_URL = Config.SUPABASE_URL
-SUPABASE_KEY = Config.SUPABASE_SERVICE_ROLE_KEY  # backend-only key
-
-headers = {
-    "apikey": SUPABASE_KEY,
-    "Authorization": f"Bearer {SUPABASE_KEY}",
-    "Content-Type": "application/json"
-}
-
 # -------------------- SAVE RESUME --------------------
 
 @router.post("/save-resume")
 async def save_resume(
     title: str = Form(...),
     latex: str = Form(...),
-    user = Depends(get_current_user)
+    user = Depends(get_current_user),
+    supabase: SupabaseClient = Depends(get_supabase)
 ):
     user_id = user["sub"]
 
@@ -31,11 +23,7 @@ async def save_resume(
         "latex": latex
     }
 
-    response = requests.post(
-        f"{SUPABASE_URL}/rest/v1/resumes",
-        headers=headers,
-        data=json.dumps(payload)
-    )
+    response = await supabase.insert("resumes", payload)
 
     if response.status_code not in (200, 201):
         raise HTTPException(500, f"Supabase insert failed: {response.text}")
@@ -45,12 +33,15 @@ async def save_resume(
 # -------------------- GET USER RESUMES --------------------
 
 @router.get("/resumes")
-async def get_resumes(user = Depends(get_current_user)):
+async def get_resumes(
+    user = Depends(get_current_user),
+    supabase: SupabaseClient = Depends(get_supabase)
+):
     user_id = user["sub"]
 
-    response = requests.get(
-        f"{SUPABASE_URL}/rest/v1/resumes?user_id=eq.{user_id}&order=updated_at.desc",
-        headers=headers
+    response = await supabase.select(
+        "resumes",
+        {"user_id": f"eq.{user_id}", "order": "updated_at.desc"}
     )
 
     if response.status_code != 200:
@@ -61,12 +52,16 @@ async def get_resumes(user = Depends(get_current_user)):
 # -------------------- DELETE RESUME --------------------
 
 @router.post("/resumes/{resume_id}/delete")
-async def delete_resume(resume_id: str, user = Depends(get_current_user)):
+async def delete_resume(
+    resume_id: str,
+    user = Depends(get_current_user),
+    supabase: SupabaseClient = Depends(get_supabase)
+):
     user_id = user["sub"]
 
-    response = requests.delete(
-        f"{SUPABASE_URL}/rest/v1/resumes?id=eq.{resume_id}&user_id=eq.{user_id}",
-        headers=headers
+    response = await supabase.delete(
+        "resumes",
+        {"id": f"eq.{resume_id}", "user_id": f"eq.{user_id}"}
     )
 
     if response.status_code not in (200, 204):
@@ -80,16 +75,17 @@ async def delete_resume(resume_id: str, user = Depends(get_current_user)):
 async def rename_resume(
     resume_id: str,
     new_title: str = Form(...),
-    user = Depends(get_current_user)
+    user = Depends(get_current_user),
+    supabase: SupabaseClient = Depends(get_supabase)
 ):
     user_id = user["sub"]
 
     payload = {"title": new_title}
 
-    response = requests.patch(
-        f"{SUPABASE_URL}/rest/v1/resumes?id=eq.{resume_id}&user_id=eq.{user_id}",
-        headers=headers,
-        data=json.dumps(payload)
+    response = await supabase.update(
+        "resumes",
+        {"id": f"eq.{resume_id}", "user_id": f"eq.{user_id}"},
+        payload
     )
 
     if response.status_code not in (200, 204):
@@ -106,7 +102,8 @@ async def add_experience(
     start_date: str = Form(None),
     end_date: str = Form(None),
     bullets_json: str = Form(...),
-    user = Depends(get_current_user)
+    user = Depends(get_current_user),
+    supabase: SupabaseClient = Depends(get_supabase)
 ):
     user_id = user["sub"]
     bullets = json.loads(bullets_json)
@@ -120,31 +117,33 @@ async def add_experience(
         "bullets": bullets
     }
 
-    response = requests.post(
-        f"{SUPABASE_URL}/rest/v1/experiences",
-        headers=headers,
-        data=json.dumps(payload)
-    )
+    response = await supabase.insert("experiences", payload)
 
     if response.status_code not in (200, 201):
         raise HTTPException(500, f"Insert failed: {response.text}")
 
+    profile_service.invalidate(user_id, "experiences")
     return {"status": "success"}
 
 # -------------------- DELETE EXPERIENCE --------------------
 
 @router.post("/experiences/{exp_id}/delete")
-async def delete_experience(exp_id: str, user = Depends(get_current_user)):
+async def delete_experience(
+    exp_id: str,
+    user = Depends(get_current_user),
+    supabase: SupabaseClient = Depends(get_supabase)
+):
     user_id = user["sub"]
 
-    response = requests.delete(
-        f"{SUPABASE_URL}/rest/v1/experiences?id=eq.{exp_id}&user_id=eq.{user_id}",
-        headers=headers
+    response = await supabase.delete(
+        "experiences",
+        {"id": f"eq.{exp_id}", "user_id": f"eq.{user_id}"}
     )
 
     if response.status_code not in (200, 204):
         raise HTTPException(500, "Failed to delete experience")
 
+    profile_service.invalidate(user_id, "experiences")
     return {"status": "deleted"}
 
 # -------------------- ADD PROJECT --------------------
@@ -156,7 +155,8 @@ async def add_project(
     start_date: str = Form(None),
     end_date: str = Form(None),
     bullets_json: str = Form(...),
-    user = Depends(get_current_user)
+    user = Depends(get_current_user),
+    supabase: SupabaseClient = Depends(get_supabase)
 ):
     user_id = user["sub"]
     tech_stack = json.loads(tech_stack_json)
@@ -171,43 +171,45 @@ async def add_project(
         "bullets": bullets
     }
 
-    response = requests.post(
-        f"{SUPABASE_URL}/rest/v1/projects",
-        headers=headers,
-        data=json.dumps(payload)
-    )
+    response = await supabase.insert("projects", payload)
 
     if response.status_code not in (200, 201):
         raise HTTPException(500, f"Insert failed: {response.text}")
 
+    profile_service.invalidate(user_id, "projects")
     return {"status": "success"}
 
 # -------------------- DELETE PROJECT --------------------
 
 @router.post("/projects/{project_id}/delete")
-async def delete_project(project_id: str, user = Depends(get_current_user)):
+async def delete_project(
+    project_id: str,
+    user = Depends(get_current_user),
+    supabase: SupabaseClient = Depends(get_supabase)
+):
     user_id = user["sub"]
 
-    response = requests.delete(
-        f"{SUPABASE_URL}/rest/v1/projects?id=eq.{project_id}&user_id=eq.{user_id}",
-        headers=headers
+    response = await supabase.delete(
+        "projects",
+        {"id": f"eq.{project_id}", "user_id": f"eq.{user_id}"}
     )
 
     if response.status_code not in (200, 204):
         raise HTTPException(500, "Failed to delete project")
 
+    profile_service.invalidate(user_id, "projects")
     return {"status": "deleted"}
 
 # -------------------- GET USER EXPERIENCES --------------------
 
 @router.get("/experiences")
-async def get_experiences(user = Depends(get_current_user)):
+async def get_experiences(
+    user = Depends(get_current_user),
+    supabase: SupabaseClient = Depends(get_supabase)
+):
     user_id = user["sub"]
 
-    response = requests.get(
-        f"{SUPABASE_URL}/rest/v1/experiences?user_id=eq.{user_id}",
-        headers=headers
-    )
+    response = await supabase.select("experiences", {"user_id": f"eq.{user_id}"})
 
     if response.status_code != 200:
         raise HTTPException(500, f"Failed to fetch experiences: {response.text}")
@@ -217,13 +219,13 @@ async def get_experiences(user = Depends(get_current_user)):
 # -------------------- GET USER PROJECTS --------------------
 
 @router.get("/projects")
-async def get_projects(user = Depends(get_current_user)):
+async def get_projects(
+    user = Depends(get_current_user),
+    supabase: SupabaseClient = Depends(get_supabase)
+):
     user_id = user["sub"]
 
-    response = requests.get(
-        f"{SUPABASE_URL}/rest/v1/projects?user_id=eq.{user_id}",
-        headers=headers
-    )
+    response = await supabase.select("projects", {"user_id": f"eq.{user_id}"})
 
     if response.status_code != 200:
         raise HTTPException(500, f"Failed to fetch projects: {response.text}")
@@ -236,7 +238,8 @@ async def get_projects(user = Depends(get_current_user)):
 async def save_template(
     title: str = Form(...),
     latex: str = Form(...),
-    user = Depends(get_current_user)
+    user = Depends(get_current_user),
+    supabase: SupabaseClient = Depends(get_supabase)
 ):
     user_id = user["sub"]
 
@@ -246,11 +249,7 @@ async def save_template(
         "latex": latex
     }
 
-    response = requests.post(
-        f"{SUPABASE_URL}/rest/v1/resume_templates",
-        headers=headers,
-        data=json.dumps(payload)
-    )
+    response = await supabase.insert("resume_templates", payload)
 
     if response.status_code not in (200, 201):
         raise HTTPException(500, f"Supabase insert failed: {response.text}")
@@ -260,12 +259,15 @@ async def save_template(
 # -------------------- GET TEMPLATES --------------------
 
 @router.get("/templates")
-async def get_templates(user = Depends(get_current_user)):
+async def get_templates(
+    user = Depends(get_current_user),
+    supabase: SupabaseClient = Depends(get_supabase)
+):
     user_id = user["sub"]
 
-    response = requests.get(
-        f"{SUPABASE_URL}/rest/v1/resume_templates?user_id=eq.{user_id}&order=updated_at.desc",
-        headers=headers
+    response = await supabase.select(
+        "resume_templates",
+        {"user_id": f"eq.{user_id}", "order": "updated_at.desc"}
     )
 
     if response.status_code != 200:
@@ -276,17 +278,22 @@ async def get_templates(user = Depends(get_current_user)):
 # -------------------- DELETE TEMPLATE --------------------
 
 @router.post("/templates/{template_id}/delete")
-async def delete_template(template_id: str, user = Depends(get_current_user)):
+async def delete_template(
+    template_id: str,
+    user = Depends(get_current_user),
+    supabase: SupabaseClient = Depends(get_supabase)
+):
     user_id = user["sub"]
 
-    response = requests.delete(
-        f"{SUPABASE_URL}/rest/v1/resume_templates?id=eq.{template_id}&user_id=eq.{user_id}",
-        headers=headers
+    response = await supabase.delete(
+        "resume_templates",
+        {"id": f"eq.{template_id}", "user_id": f"eq.{user_id}"}
     )
 
     if response.status_code not in (200, 204):
         raise HTTPException(500, f"Failed to delete template: {response.text}")
 
+    profile_service.invalidate(user_id, "resume_templates", template_id)
     return {"status": "deleted"}
 
 # -------------------- RENAME TEMPLATE --------------------
@@ -295,20 +302,22 @@ async def delete_template(template_id: str, user = Depends(get_current_user)):
 async def rename_template(
     template_id: str,
     new_title: str = Form(...),
-    user = Depends(get_current_user)
+    user = Depends(get_current_user),
+    supabase: SupabaseClient = Depends(get_supabase)
 ):
     user_id = user["sub"]
 
     payload = {"title": new_title}
 
-    response = requests.patch(
-        f"{SUPABASE_URL}/rest/v1/resume_templates?id=eq.{template_id}&user_id=eq.{user_id}",
-        headers=headers,
-        data=json.dumps(payload)
+    response = await supabase.update(
+        "resume_templates",
+        {"id": f"eq.{template_id}", "user_id": f"eq.{user_id}"},
+        payload
     )
 
     if response.status_code not in (200, 204):
         raise HTTPException(500, f"Failed to rename template: {response.text}")
 
+    profile_service.invalidate(user_id, "resume_templates", template_id)
     return {"status": "renamed"}
 
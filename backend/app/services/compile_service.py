@@ -0,0 +1,208 @@
+import asyncio
+import hashlib
+import os
+import shutil
+import tempfile
+import httpx
+from app.config import Config
+from app.services import latex_service
+from app.utils.cache import TTLCache
+
+
+class CompileError(Exception):
+    """LaTeX could not be compiled; message carries the compiler/API output."""
+
+
+class CompileTimeout(CompileError):
+    pass
+
+
+def normalize_latex(latex_content: str) -> str:
+    """Strip Markdown fences, CRLFs and trailing whitespace so equivalent sources hash the same."""
+    latex_content = latex_service.strip_code_fences(latex_content)
+    lines = latex_content.replace("\r\n", "\n").split("\n")
+    return "\n".join(line.rstrip() for line in lines)
+
+
+# -------------------- BACKENDS --------------------
+
+class CompileBackend:
+    """Turns a LaTeX document into PDF bytes."""
+
+    name = "base"
+
+    async def compile(self, latex_content: str) -> bytes:
+        raise NotImplementedError
+
+    async def aclose(self):
+        pass
+
+
+class RemoteCompileBackend(CompileBackend):
+    """latexonline.cc (document sent in the query string, so long resumes can hit URL limits)."""
+
+    name = "remote"
+
+    def __init__(self, url: str = "https://latexonline.cc/compile", timeout: float = 90):
+        self.url = url
+        self.timeout = timeout
+        self._client = None
+
+    async def compile(self, latex_content: str) -> bytes:
+        latex_content = latex_content.replace(
+            "\\input{glyphtounicode}",
+            "% Removed glyphtounicode for remote compilation"
+        )
+        if self._client is None:
+            self._client = httpx.AsyncClient(timeout=self.timeout)
+        try:
+            response = await self._client.get(self.url, params={"text": latex_content})
+        except httpx.TimeoutException:
+            raise CompileTimeout("Remote LaTeX API timed out.")
+
+        if response.status_code != 200:
+            raise CompileError(f"LaTeX API returned {response.status_code}: {response.text[:500]}")
+        return response.content
+
+    async def aclose(self):
+        if self._client is not None:
+            await self._client.aclose()
+            self._client = None
+
+
+# Environment the compiler sees: nothing from ours (API keys, service-role
+# tokens) except what's needed to find the binaries and the TeX trees.
+COMPILER_ENV_ALLOW = ("PATH", "LANG", "LC_ALL", "SOURCE_DATE_EPOCH")
+COMPILER_ENV_PREFIXES = ("TEXMF", "TEXINPUTS", "TECTONIC_")
+
+
+def compiler_env(job_dir: str) -> dict:
+    """
+    Minimal environment for a compile in `job_dir`. openin_any/openout_any
+    = p (kpathsea "paranoid") stop TeX from reading or writing absolute
+    paths, `..` and dotfiles, so a document can't \\input the server's .env.
+    """
+    env = {
+        key: value for key, value in os.environ.items()
+        if key in COMPILER_ENV_ALLOW or key.startswith(COMPILER_ENV_PREFIXES)
+    }
+    env.update(HOME=job_dir, TMPDIR=job_dir, openin_any="p", openout_any="p")
+    return env
+
+
+class LocalCompileBackend(CompileBackend):
+    """
+    Runs pdflatex or tectonic as a subprocess. Each job gets its own
+    throwaway sandbox directory and a minimal environment (compiler_env);
+    a semaphore caps concurrent compiler processes and runaway jobs are
+    killed after `timeout` seconds.
+    """
+
+    name = "local"
+
+    def __init__(self, command: str = "pdflatex", concurrency: int = 2, timeout: float = 30):
+        self.command = command
+        self.timeout = timeout
+        self._slots = asyncio.Semaphore(concurrency)
+
+    def _argv(self) -> list:
+        if os.path.basename(self.command).startswith("tectonic"):
+            # tectonic doesn't read kpathsea's openin_any; --untrusted turns
+            # off shell escape and its other known-insecure features.
+            return [self.command, "--untrusted", "--chatter", "minimal", "resume.tex"]
+        return [
+            self.command,
+            "-interaction=nonstopmode",
+            "-halt-on-error",
+            "-no-shell-escape",
+            "resume.tex",
+        ]
+
+    async def compile(self, latex_content: str) -> bytes:
+        async with self._slots:
+            with tempfile.TemporaryDirectory(prefix="latex-job-") as job_dir:
+                with open(os.path.join(job_dir, "resume.tex"), "w", encoding="utf-8") as f:
+                    f.write(latex_content)
+
+                proc = await asyncio.create_subprocess_exec(
+                    *self._argv(),
+                    cwd=job_dir,
+                    env=compiler_env(job_dir),
+                    stdin=asyncio.subprocess.DEVNULL,
+                    stdout=asyncio.subprocess.PIPE,
+                    stderr=asyncio.subprocess.STDOUT,
+                )
+                try:
+                    output, _ = await asyncio.wait_for(proc.communicate(), self.timeout)
+                except asyncio.TimeoutError:
+                    proc.kill()
+                    await proc.wait()
+                    raise CompileTimeout(f"LaTeX compile exceeded {self.timeout:g}s.")
+
+                pdf_path = os.path.join(job_dir, "resume.pdf")
+                if proc.returncode != 0 or not os.path.exists(pdf_path):
+                    log = output.decode("utf-8", "replace")
+                    raise CompileError(f"{self.name} compiler exited with {proc.returncode}: {log[-500:]}")
+
+                with open(pdf_path, "rb") as f:
+                    return f.read()
+
+
+def create_backend(kind: str | None = None) -> CompileBackend:
+    kind = (kind or Config.COMPILE_BACKEND).lower()
+    if kind == "auto":
+        kind = "local" if shutil.which(Config.LATEX_COMPILER) else "remote"
+    if kind == "local":
+        return LocalCompileBackend(
+            Config.LATEX_COMPILER,
+            concurrency=Config.COMPILE_CONCURRENCY,
+            timeout=Config.COMPILE_TIMEOUT,
+        )
+    return RemoteCompileBackend(timeout=Config.COMPILE_TIMEOUT_REMOTE)
+
+
+# -------------------- CACHED ENTRY POINT --------------------
+
+# Compiled PDFs keyed by source hash, bounded by total bytes
+pdf_cache = TTLCache(
+    max_entries=Config.COMPILE_CACHE_SIZE,
+    ttl=Config.COMPILE_CACHE_TTL,
+    max_weight=Config.COMPILE_CACHE_MB * 1024 * 1024,
+    weigher=len,
+)
+
+_backend: CompileBackend | None = None
+
+
+def get_backend() -> CompileBackend:
+    global _backend
+    if _backend is None:
+        _backend = create_backend()
+    return _backend
+
+
+def set_backend(backend: CompileBackend):
+    global _backend
+    _backend = backend
+
+
+async def shutdown():
+    global _backend
+    if _backend is not None:
+        await _backend.aclose()
+        _backend = None
+
+
+async def compile_pdf(latex_content: str) -> tuple[bytes, bool]:
+    """Compile LaTeX to PDF through the configured backend. Returns (pdf, cache_hit)."""
+    source = normalize_latex(latex_content)
+    backend = get_backend()
+    key = hashlib.sha256(f"{backend.name}\n{source}".encode("utf-8")).hexdigest()
+
+    pdf = pdf_cache.get(key)
+    if pdf is not None:
+        return pdf, True
+
+    pdf = await backend.compile(source)
+    pdf_cache.set(key, pdf)
+    return pdf, False
@@ -0,0 +1,205 @@
+import asyncio
+import multiprocessing
+import os
+import threading
+import time
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from app.config import Config
+from app.services import model_registry
+
+# Models the workers need for keyword fallback and ATS scoring (not Gemini)
+WORKER_PRELOAD = ("sklearn", "tfidf_analyzer", "stemmer", "spacy", "skill_matcher")
+
+
+class CPUTaskTimeout(TimeoutError):
+    """A CPU-bound task did not finish within its timeout."""
+
+
+def _init_worker(names):
+    # Each worker process loads its models once, then serves many tasks
+    # (an empty preload loads nothing; warmup() would take it as "all")
+    if names:
+        model_registry.warmup(names)
+
+
+class CPUPool:
+    """
+    Process pool for CPU-bound NLP and scoring work (spaCy, TF-IDF, stemming).
+
+    Threads serialize this work behind the GIL; separate processes run it on
+    every core. Workers preload the models once via model_registry. Tasks
+    are submitted from the event loop with a per-task timeout, and the pool
+    tracks queue depth so saturation is visible on /api/health/pool.
+
+    A task that times out while running can't be interrupted: it keeps its
+    worker until it finishes. Such tasks are counted as `stuck`; once every
+    worker is stuck the pool is recycled (workers terminated, a fresh pool
+    started), which also fails whatever else was running on the old one.
+    """
+
+    def __init__(self, workers: int, preload=WORKER_PRELOAD, timeout: float = 30.0):
+        self.workers = workers
+        self.preload = tuple(preload)
+        self.timeout = timeout
+        self.executor = None
+        self._lock = threading.Lock()   # executor swaps; stuck counts (updated from executor threads)
+        self._stuck = 0
+
+        self.submitted = 0
+        self.completed = 0
+        self.failed = 0
+        self.timeouts = 0
+        self.restarts = 0
+        self.recycles = 0
+        self.in_flight = 0
+        self.max_in_flight = 0
+        self.busy_seconds = 0.0
+
+    def start(self):
+        # spawn: forking a process that already runs threads (warmup, asyncio) isn't safe
+        self.executor = ProcessPoolExecutor(
+            max_workers=self.workers,
+            mp_context=multiprocessing.get_context("spawn"),
+            initializer=_init_worker,
+            initargs=(self.preload,),
+        )
+        # Workers are spawned on demand; start them all now so model loading
+        # happens at startup rather than inside the first requests
+        for _ in range(self.workers):
+            self.executor.submit(os.getpid)
+
+    def shutdown(self):
+        if self.executor is not None:
+            self.executor.shutdown(wait=False, cancel_futures=True)
+            self.executor = None
+
+    def _replace(self, broken: ProcessPoolExecutor, terminate: bool = False) -> bool:
+        """
+        Swap in a fresh pool if `broken` is still the current one. Every task
+        on a dead pool fails at once; only the first of them restarts it, so
+        later ones don't tear down the replacement and its new work.
+        """
+        with self._lock:
+            if self.executor is not broken:
+                return False
+            if terminate:
+                for process in list(getattr(broken, "_processes", {}).values()):
+                    process.terminate()
+            self.shutdown()
+            self._stuck = 0
+            self.start()
+            return True
+
+    def _unstick(self, executor):
+        with self._lock:
+            if self.executor is executor and self._stuck > 0:
+                self._stuck -= 1
+
+    async def run(self, fn, *args, timeout: float | None = None):
+        """
+        Run fn(*args) in a worker process and await the result.
+
+        fn and args must be picklable (module-level functions, plain data).
+        On timeout, CPUTaskTimeout is raised; a queued task is cancelled, a
+        running one finishes in its worker (counted as stuck until then) and
+        its result is dropped.
+        """
+        timeout = self.timeout if timeout is None else timeout
+
+        self.submitted += 1
+        self.in_flight += 1
+        self.max_in_flight = max(self.max_in_flight, self.in_flight)
+        start = time.perf_counter()
+        executor = self.executor
+        try:
+            future = executor.submit(fn, *args)
+            result = await asyncio.wait_for(asyncio.wrap_future(future), timeout)
+            self.completed += 1
+            return result
+        except asyncio.TimeoutError:
+            self.timeouts += 1
+            if not future.done():
+                # Still running: it holds a worker until it returns
+                with self._lock:
+                    self._stuck += 1
+                    all_stuck = self.executor is executor and self._stuck >= self.workers
+                future.add_done_callback(lambda _: self._unstick(executor))
+                if all_stuck and self._replace(executor, terminate=True):
+                    self.recycles += 1
+            raise CPUTaskTimeout(f"{getattr(fn, '__name__', 'task')} timed out after {timeout}s")
+        except BrokenProcessPool:
+            # A worker died (OOM, segfault); replace the pool so later tasks can run
+            self.failed += 1
+            if self._replace(executor):
+                self.restarts += 1
+            raise
+        except Exception:
+            self.failed += 1
+            raise
+        finally:
+            self.in_flight -= 1
+            self.busy_seconds += time.perf_counter() - start
+
+    def stats(self) -> dict:
+        return {
+            "workers": self.workers,
+            "in_flight": self.in_flight,
+            "queued": max(0, self.in_flight - self.workers),
+            "max_in_flight": self.max_in_flight,
+            "submitted": self.submitted,
+            "completed": self.completed,
+            "failed": self.failed,
+            "timeouts": self.timeouts,
+            "restarts": self.restarts,
+            "stuck": self._stuck,
+            "recycles": self.recycles,
+            "busy_seconds": round(self.busy_seconds, 3),
+        }
+
+
+# -------------------- APP-WIDE POOL --------------------
+
+_pool: CPUPool | None = None
+
+
+def startup():
+    """Start the shared pool (called from the app lifespan). CPU_POOL_WORKERS=0 disables it."""
+    global _pool
+    workers = Config.CPU_POOL_WORKERS
+    if workers < 0:
+        workers = os.cpu_count() or 1
+    if workers == 0:
+        return
+    _pool = CPUPool(workers, timeout=Config.CPU_TASK_TIMEOUT)
+    _pool.start()
+    print(f"CPU pool started with {workers} workers")
+
+
+def shutdown():
+    global _pool
+    if _pool is not None:
+        _pool.shutdown()
+        _pool = None
+
+
+def get_pool() -> CPUPool | None:
+    return _pool
+
+
+async def run(fn, *args, timeout: float | None = None):
+    """
+    Run a CPU-bound function off the event loop: in the process pool when it
+    is running, otherwise in a worker thread (tests, CPU_POOL_WORKERS=0).
+    """
+    if _pool is None:
+        timeout = Config.CPU_TASK_TIMEOUT if timeout is None else timeout
+        try:
+            return await asyncio.wait_for(asyncio.to_thread(fn, *args), timeout)
+        except asyncio.TimeoutError:
+            raise CPUTaskTimeout(f"{getattr(fn, '__name__', 'task')} timed out after {timeout}s")
+    return await _pool.run(fn, *args, timeout=timeout)
+
+
+def stats() -> dict:
+    return _pool.stats() if _pool is not None else {"workers": 0}
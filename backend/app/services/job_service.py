@@ -0,0 +1,176 @@
+import asyncio
+import time
+import uuid
+from app.config import Config
+from app.utils.cache import TTLCache
+from app.utils.metrics import recording
+
+
+class QueueFull(RuntimeError):
+    """The job queue is at capacity; the client should retry later."""
+
+
+class Job:
+    """One queued unit of work and everything a client can poll about it."""
+
+    def __init__(self, kind: str, owner: str | None = None):
+        self.id = uuid.uuid4().hex
+        self.kind = kind
+        self.owner = owner            # user id (None = guest; the unguessable id is the credential)
+        self.status = "queued"        # queued -> running -> done | failed
+        self.stage = "queued"
+        self.timings = []             # (stage, seconds) from timed() blocks inside the job
+        self.result = None
+        self.error = None             # {"status_code", "detail"}
+        self.created_at = time.time()
+        self.started_at = None
+        self.finished_at = None
+
+    @property
+    def finished(self) -> bool:
+        return self.status in ("done", "failed")
+
+    def set_stage(self, stage: str):
+        self.stage = stage
+
+    def to_dict(self) -> dict:
+        return {
+            "job_id": self.id,
+            "kind": self.kind,
+            "status": self.status,
+            "stage": self.stage,
+            "stages": [{"stage": stage, "ms": round(seconds * 1000, 1)} for stage, seconds in self.timings],
+            "created_at": self.created_at,
+            "started_at": self.started_at,
+            "finished_at": self.finished_at,
+            "error": self.error,
+        }
+
+
+class JobQueue:
+    """
+    In-process job queue: a bounded asyncio.Queue drained by a fixed number
+    of worker tasks on the event loop. No broker is needed; jobs live only
+    in this process, so they are lost on restart.
+
+    submit() raises QueueFull instead of waiting when `max_queue` jobs are
+    already queued (backpressure). Finished jobs are kept in a TTLCache for
+    `result_ttl` seconds so clients can fetch the result.
+    """
+
+    def __init__(self, workers: int, max_queue: int, timeout: float, result_ttl: float, max_results: int):
+        self.workers = workers
+        self.max_queue = max_queue
+        self.timeout = timeout
+        self.finished = TTLCache(max_entries=max_results, ttl=result_ttl)
+        self._active = {}      # job id -> Job (queued or running)
+        self._queue = None
+        self._tasks = []
+        self._loop = None
+
+        self.submitted = 0
+        self.rejected = 0
+        self.completed = 0
+        self.failed = 0
+        self.running = 0
+
+    def _ensure_started(self):
+        # Workers belong to the running loop; a new loop (tests) gets new ones
+        loop = asyncio.get_running_loop()
+        if self._loop is loop:
+            return
+        self._loop = loop
+        self._queue = asyncio.Queue(maxsize=self.max_queue)
+        self._tasks = [asyncio.ensure_future(self._worker()) for _ in range(self.workers)]
+
+    async def shutdown(self):
+        """Stop the workers; queued and running jobs are abandoned."""
+        for task in self._tasks:
+            task.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        self._tasks = []
+        self._loop = None
+        self._active.clear()
+
+    def submit(self, kind: str, fn, owner: str | None = None) -> Job:
+        """Queue `await fn(job)`; its return value becomes the job result."""
+        self._ensure_started()
+        job = Job(kind, owner)
+        try:
+            self._queue.put_nowait((job, fn))
+        except asyncio.QueueFull:
+            self.rejected += 1
+            raise QueueFull(f"Job queue is full ({self.max_queue} waiting); retry later.")
+        self.submitted += 1
+        self._active[job.id] = job
+        return job
+
+    def get(self, job_id: str) -> Job | None:
+        return self._active.get(job_id) or self.finished.get(job_id)
+
+    def queue_position(self, job: Job) -> int | None:
+        """Jobs ahead of this one in the queue (None once it has started)."""
+        if job.status != "queued":
+            return None
+        return sum(1 for other in self._active.values() if other.status == "queued" and other.created_at < job.created_at)
+
+    async def _worker(self):
+        while True:
+            job, fn = await self._queue.get()
+            try:
+                await self._run(job, fn)
+            finally:
+                self._queue.task_done()
+
+    async def _run(self, job: Job, fn):
+        job.status = "running"
+        job.started_at = time.time()
+        self.running += 1
+        try:
+            with recording(job.timings):
+                job.result = await asyncio.wait_for(fn(job), self.timeout)
+            job.status = "done"
+            self.completed += 1
+        except asyncio.CancelledError:
+            raise
+        except asyncio.TimeoutError:
+            job.status = "failed"
+            job.error = {"status_code": 504, "detail": f"Job timed out after {self.timeout:g}s."}
+            self.failed += 1
+        except Exception as e:
+            # HTTPException-like errors keep their status; anything else is a 500
+            job.status = "failed"
+            job.error = {
+                "status_code": getattr(e, "status_code", 500),
+                "detail": getattr(e, "detail", None) or str(e),
+            }
+            self.failed += 1
+        finally:
+            self.running -= 1
+            job.stage = job.status
+            job.finished_at = time.time()
+            self._active.pop(job.id, None)
+            if job.finished:
+                self.finished.set(job.id, job)
+
+    def stats(self) -> dict:
+        return {
+            "workers": self.workers,
+            "queued": self._queue.qsize() if self._queue is not None else 0,
+            "max_queue": self.max_queue,
+            "running": self.running,
+            "submitted": self.submitted,
+            "rejected": self.rejected,
+            "completed": self.completed,
+            "failed": self.failed,
+            "results": self.finished.stats(),
+        }
+
+
+jobs = JobQueue(
+    workers=Config.JOB_WORKERS,
+    max_queue=Config.JOB_QUEUE_SIZE,
+    timeout=Config.JOB_TIMEOUT,
+    result_ttl=Config.JOB_RESULT_TTL,
+    max_results=Config.JOB_RESULT_MAX,
+)
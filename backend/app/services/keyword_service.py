@@ -1,21 +1,11 @@
-from sklearn.feature_extraction.text import TfidfVectorizer
-import spacy
+import asyncio
 import re
-import google.generativeai as genai
+import hashlib
 from app.config import Config
-
-nlp = spacy.load("en_core_web_sm")
-
-# Priority technical terms (hard skills)
-TECH_TERMS = {
-    "python", "java", "javascript", "typescript", "react", "node", "express",
-    "fastapi", "flask", "django", "sql", "postgresql", "mysql", "mongodb",
-    "nosql", "aws", "azure", "gcp", "docker", "kubernetes", "ci/cd", "git",
-    "api", "rest", "graphql", "linux", "tensorflow", "pytorch",
-    "machine learning", "deep learning", "nlp", "data analysis",
-    "computer vision", "backend", "frontend", "devops", "cloud",
-    "bash", "shell", "pipelines", "spark", "hadoop", "kafka", "airflow"
-}
+from app.services import model_registry, cpu_pool, llm_client
+from app.services.skill_taxonomy import tokenize
+from app.utils.cache import TTLCache, SQLiteCache, TieredCache
+from app.utils.metrics import keyword_fallbacks
 
 # Words to exclude (generic nouns, soft skills, HR fluff)
 BLACKLIST = {
@@ -26,6 +16,40 @@ BLACKLIST = {
     "experience", "background", "responsibilities", "requirements"
 }
 
+# Content-addressed cache: same JD + settings + model -> same keywords.
+keyword_cache = TieredCache(
+    TTLCache(max_entries=Config.KEYWORD_CACHE_SIZE, ttl=Config.KEYWORD_CACHE_TTL),
+    SQLiteCache(Config.KEYWORD_CACHE_DB, table="keywords") if Config.KEYWORD_CACHE_DB else None
+)
+
+
+class FallbackKeywords(list):
+    """Keywords from the local extractor; callers keep anything derived from them short-lived."""
+
+
+def is_fallback(keywords) -> bool:
+    return isinstance(keywords, FallbackKeywords)
+
+
+def _cached_keywords(key: str):
+    cached = keyword_cache.get(key)
+    if isinstance(cached, dict):   # fallback entry: {"fallback": [...]}
+        return FallbackKeywords(cached["fallback"])
+    return list(cached) if cached is not None else None
+
+
+def _cache_fallback(key: str, keywords):
+    keyword_cache.set(key, {"fallback": list(keywords)}, ttl=Config.KEYWORD_FALLBACK_TTL)
+    return FallbackKeywords(keywords)
+
+
+def keyword_cache_key(job_description: str, max_features: int) -> str:
+    """Hash of the normalized JD text, max_features and model name."""
+    normalized = " ".join(job_description.lower().split())
+    raw = f"{Config.GEMINI_MODEL}\n{max_features}\n{normalized}"
+    return hashlib.sha256(raw.encode("utf-8")).hexdigest()
+
+
 def extract_relevant_sections(job_text: str) -> str:
     """Focus keyword extraction on relevant JD sections."""
     text = job_text.replace("\n", " ").strip()
@@ -34,9 +58,9 @@ def extract_relevant_sections(job_text: str) -> str:
     return text[matches[0].start():] if matches else text
 
 
-def extract_skills_with_gemini(job_description: str):
-    """Use Gemini to extract only hard skills/tools."""
-    prompt = f"""
+def build_skills_prompt(job_description: str) -> str:
+    """Prompt asking Gemini for hard skills only."""
+    return f"""
     Extract ONLY technical hard skills, tools, frameworks, and technologies 
     from the following job description.
 
@@ -53,64 +77,223 @@ def extract_skills_with_gemini(job_description: str):
     {job_description}
     """
 
-    model = genai.GenerativeModel(Config.GEMINI_MODEL)
-    response = model.generate_content(prompt)
-    text = response.text.strip()
 
-    # Convert Gemini output to Python list
-    return [skill.strip() for skill in text.split(",") if len(skill.strip()) > 1]
+def parse_skills(text: str):
+    """Convert Gemini's comma-separated output to a Python list."""
+    return [skill.strip() for skill in text.strip().split(",") if len(skill.strip()) > 1]
 
 
-def extract_keywords(job_description: str, max_features: int = 25):
+async def extract_skills_with_gemini_async(job_description: str):
     """
-    Hybrid keyword extraction:
-      1. Try Gemini (best results)
-      2. Fall back to TF-IDF + spaCy if Gemini fails
+    Use Gemini to extract only hard skills/tools. Goes through the shared
+    LLM client: rate limited, circuit-broken, and concurrent calls for the
+    same JD share one Gemini request.
     """
+    prompt = build_skills_prompt(job_description)
+    text = await llm_client.gemini.generate(prompt, timeout=Config.KEYWORD_LLM_TIMEOUT)
+    return parse_skills(text)
+
 
-    # -------------------- GEMINI EXTRACTION --------------------
+def clean_gemini_skills(skills, max_features: int = 25):
+    """Basic sanity filter; returns None when Gemini gave too little to trust."""
+    clean_skills = [
+        kw for kw in skills
+        if kw.lower() not in BLACKLIST and len(kw) > 1
+    ]
+    if len(clean_skills) >= 3:
+        return clean_skills[:max_features]
+    return None
+
+
+class FallbackBatch:
+    """
+    Local keyword extraction shared by a known set of JDs (a /rewrite/batch
+    request). The first JD that needs the fallback starts one
+    extract_keywords_fallback_batch call in the CPU pool for every JD that
+    had no cached keywords when the batch was created, so spaCy tags them
+    all in one nlp.pipe instead of one pool task and nlp() call per JD.
+    """
+
+    def __init__(self, job_descriptions, max_features: int = 25):
+        self.max_features = max_features
+        self.job_descriptions = list(dict.fromkeys(
+            jd for jd in job_descriptions
+            if _cached_keywords(keyword_cache_key(jd, max_features)) is None
+        ))
+        self._task = None
+
+    async def get(self, job_description: str):
+        if job_description not in self.job_descriptions:
+            return await cpu_pool.run(extract_keywords_fallback, job_description, self.max_features)
+        if self._task is None:
+            # n_process=1: pool workers can't start processes of their own
+            self._task = asyncio.ensure_future(cpu_pool.run(
+                extract_keywords_fallback_batch, self.job_descriptions, self.max_features, None, 1
+            ))
+            self._task.add_done_callback(lambda t: t.cancelled() or t.exception())
+        # Shielded: one JD giving up (Gemini won the race) mustn't cancel the others'
+        results = await asyncio.shield(self._task)
+        return results[self.job_descriptions.index(job_description)]
+
+
+# Gemini calls that lost the race to the local extractor; they finish in the
+# background and cache their result for the next request with this JD.
+_background = set()
+
+
+async def _gemini_keywords(job_description: str, max_features: int, key: str):
+    """Cleaned Gemini keywords (cached), or None if Gemini failed or gave too little."""
     try:
-        skills = extract_skills_with_gemini(job_description)
-        # basic sanity filter
-        clean_skills = [
-            kw for kw in skills
-            if kw.lower() not in BLACKLIST and len(kw) > 1
-        ]
-        if len(clean_skills) >= 3:
-            return clean_skills[:max_features]
+        skills = await extract_skills_with_gemini_async(job_description)
     except Exception as e:
         print("Gemini skill extraction failed:", e)
+        return None
+    clean_skills = clean_gemini_skills(skills, max_features)
+    if clean_skills:
+        keyword_cache.set(key, clean_skills)
+    return clean_skills
 
-    # -------------------- FALLBACK: TF-IDF + spaCy --------------------
-    print("Using fallback TF-IDF extraction...")
 
-    focused = extract_relevant_sections(job_description)
+def _good_result(task):
+    return task.result() if task.done() and not task.cancelled() else None
 
-    tfidf = TfidfVectorizer(stop_words="english", max_features=max_features)
-    tfidf.fit([focused])
-    tfidf_keywords = set(tfidf.get_feature_names_out())
 
-    doc = nlp(focused)
-    spacy_keywords = {
+async def extract_keywords_async(job_description: str, max_features: int = 25, fallback_batch: FallbackBatch | None = None):
+    """
+    Hybrid keyword extraction: Gemini first (best results), the local
+    TF-IDF + spaCy extractor as the fallback, hedged against slow Gemini
+    calls. Results are cached; fallback results get a shorter TTL and come
+    back as FallbackKeywords.
+
+    Gemini gets KEYWORD_HEDGE_DEADLINE seconds. If it hasn't answered by
+    then, the local TF-IDF + spaCy extractor starts in the CPU pool and
+    whichever usable result arrives first wins. Failures (including an open
+    circuit) go straight to the local extractor, so latency stays bounded
+    by the deadline plus the local extraction time. With a `fallback_batch`
+    the local extraction is shared with the other JDs in it.
+    """
+    key = keyword_cache_key(job_description, max_features)
+    cached = _cached_keywords(key)
+    if cached is not None:
+        return cached
+
+    gemini_task = asyncio.ensure_future(_gemini_keywords(job_description, max_features, key))
+    await asyncio.wait({gemini_task}, timeout=Config.KEYWORD_HEDGE_DEADLINE)
+    if _good_result(gemini_task):
+        return list(gemini_task.result())
+
+    fallback_task = asyncio.ensure_future(
+        fallback_batch.get(job_description) if fallback_batch is not None
+        else cpu_pool.run(extract_keywords_fallback, job_description, max_features)
+    )
+    if not gemini_task.done():
+        print("Gemini keyword extraction is slow; racing the local extractor...")
+        await asyncio.wait({gemini_task, fallback_task}, return_when=asyncio.FIRST_COMPLETED)
+        if _good_result(gemini_task):
+            fallback_task.add_done_callback(lambda t: t.cancelled() or t.exception())
+            return list(gemini_task.result())
+
+    keywords = await fallback_task
+    if _good_result(gemini_task):
+        return list(gemini_task.result())
+    if not gemini_task.done():
+        keyword_fallbacks.inc("gemini_slow")
+        _background.add(gemini_task)
+        gemini_task.add_done_callback(_background.discard)
+    else:
+        keyword_fallbacks.inc("gemini_failed")
+    return _cache_fallback(key, keywords)
+
+
+def _taxonomy_skills(focused: str, max_features: int):
+    """Taxonomy skills in the text, most mentioned first, and the matches behind them."""
+    # One linear pass; canonical names, so "k8s" and "Kubernetes" count together
+    matches = model_registry.skill_matcher.get().find(focused)
+    counts = {}
+    for match in matches:
+        counts[match.name] = counts.get(match.name, 0) + 1
+    skills = sorted(counts, key=counts.get, reverse=True)   # stable: ties keep first-mention order
+    return skills[:max_features], matches
+
+
+def spacy_text(focused: str) -> str:
+    """The part of a JD spaCy sees; capped at SPACY_MAX_CHARS to bound tagging time."""
+    return focused[:Config.SPACY_MAX_CHARS]
+
+
+def _noun_terms(doc) -> set:
+    return {
         token.text.lower()
         for token in doc
         if token.pos_ in {"NOUN", "PROPN"} and len(token.text) > 2
     }
 
+
+def _fill_general_terms(focused: str, skills: list, matches: list, spacy_keywords: set, max_features: int):
+    """Skills followed by TF-IDF + spaCy terms for the remaining slots."""
+    # Words already covered by a matched skill ("learning" in "machine learning")
+    covered = {token.lower() for match in matches for token in tokenize(focused[match.start:match.end])}
+
+    tfidf = model_registry.sklearn.get().TfidfVectorizer(stop_words="english", max_features=max_features)
+    tfidf.fit([focused])
+    tfidf_keywords = set(tfidf.get_feature_names_out())
+
     combined = tfidf_keywords.union(spacy_keywords)
 
-    # Remove junk and blacklist
-    filtered = {
+    # Remove junk, blacklist and words the skills already cover
+    general_terms = {
         kw for kw in combined
         if kw.lower() not in BLACKLIST
+        and kw.lower() not in covered
         and not kw.isdigit()
         and len(kw) > 2
     }
 
-    # Prioritize tech terms
-    tech_related = [kw for kw in filtered if kw.lower() in TECH_TERMS]
-    general_terms = [kw for kw in filtered if kw.lower() not in TECH_TERMS]
+    return skills + sorted(general_terms)[:max_features - len(skills)]
+
+
+def extract_keywords_fallback(job_description: str, max_features: int = 25):
+    """
+    Local keyword extraction (no network, CPU only): known skills from the
+    taxonomy first, most mentioned first, then TF-IDF + spaCy terms to fill
+    the remaining slots.
+    """
+
+    # -------------------- FALLBACK: taxonomy, then TF-IDF + spaCy --------------------
+    print("Using fallback taxonomy + TF-IDF extraction...")
 
-    final_keywords = tech_related + general_terms
+    focused = extract_relevant_sections(job_description)
+    skills, matches = _taxonomy_skills(focused, max_features)
+    if len(skills) >= max_features:
+        return skills
+
+    doc = model_registry.spacy_nlp.get()(spacy_text(focused))
+    return _fill_general_terms(focused, skills, matches, _noun_terms(doc), max_features)
+
+
+def extract_keywords_fallback_batch(
+    job_descriptions: list, max_features: int = 25, batch_size: int | None = None, n_process: int | None = None
+):
+    """
+    extract_keywords_fallback for many JDs at once; same result per JD.
+
+    JDs that still need general terms go through one nlp.pipe call
+    (SPACY_BATCH_SIZE docs per batch, SPACY_PROCESSES processes) instead
+    of one nlp() call each. Keep n_process at 1 inside the CPU pool: its
+    workers can't start processes of their own.
+    """
+    focused = [extract_relevant_sections(jd) for jd in job_descriptions]
+    taxonomy = [_taxonomy_skills(text, max_features) for text in focused]
+    pending = [i for i, (skills, _) in enumerate(taxonomy) if len(skills) < max_features]
 
-    return sorted(set(final_keywords))[:max_features]
+    results = [skills for skills, _ in taxonomy]
+    if pending:
+        docs = model_registry.spacy_nlp.get().pipe(
+            (spacy_text(focused[i]) for i in pending),
+            batch_size=batch_size or Config.SPACY_BATCH_SIZE,
+            n_process=n_process or Config.SPACY_PROCESSES,
+        )
+        for i, doc in zip(pending, docs):
+            skills, matches = taxonomy[i]
+            results[i] = _fill_general_terms(focused[i], skills, matches, _noun_terms(doc), max_features)
+    return results
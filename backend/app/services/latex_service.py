@@ -1,91 +1,37 @@
+import hashlib
 import re
 from textwrap import dedent
-
-SECTION_HEADERS = [
-    "Education", "Experience", "Projects",
-    "Technical Skills", "Skills", "Awards",
-    "Certifications", "Research", "Leadership"
-]
+from app.config import Config
+from app.services.resume_parser import ResumeDocument, Section, parse_resume
+from app.utils.cache import TTLCache
 
 # ---------- helpers
 
-def latex_escape(s: str) -> str:
-    if not s:
-        return ""
-    # Minimal escaping (enough for emails/links/parentheses)
-    s = s.replace("\\", r"\\").replace("&", r"\&").replace("%", r"\%")
-    s = s.replace("$", r"\$").replace("#", r"\#").replace("_", r"\_")
-    s = s.replace("{", r"\{").replace("}", r"\}").replace("~", r"\textasciitilde{}")
-    s = s.replace("^", r"\textasciicircum{}")
-    return s
-
-EMAIL_RE = re.compile(r"[A-Za-z0-9._%+-]+@[A-Za-z0-9.-]+\.[A-Za-z]{2,}")
-PHONE_RE = re.compile(r"(\+?\d[\d \-\(\)]{7,}\d)")
-URL_RE   = re.compile(r"(https?://[^\s]+)")
-LINKEDIN_RE = re.compile(r"(https?://(www\.)?linkedin\.com/in/[^\s]+)", re.I)
-GITHUB_RE   = re.compile(r"(https?://(www\.)?github\.com/[^\s]+)", re.I)
-
-def extract_contact_info(text: str) -> dict:
-    lines = [l.strip() for l in text.splitlines() if l.strip()]
-    # Heuristic: first non-empty line with letters as the name
-    name = next((l for l in lines[:5] if re.search(r"[A-Za-z]{2,}", l)), "Candidate Name")
-
-    email = EMAIL_RE.search(text)
-    phone = PHONE_RE.search(text)
-    linkedin = LINKEDIN_RE.search(text)
-    github = GITHUB_RE.search(text)
+_LATEX_ESCAPES = str.maketrans({
+    "\\": r"\\", "&": r"\&", "%": r"\%", "$": r"\$", "#": r"\#", "_": r"\_",
+    "{": r"\{", "}": r"\}", "~": r"\textasciitilde{}", "^": r"\textasciicircum{}",
+})
 
-    return {
-        "name": latex_escape(name),
-        "email": latex_escape(email.group(0)) if email else "",
-        "phone": latex_escape(phone.group(0)) if phone else "",
-        "linkedin": latex_escape(linkedin.group(0)) if linkedin else "",
-        "github": latex_escape(github.group(0)) if github else ""
-    }
+def latex_escape(s: str) -> str:
+    # Minimal escaping (enough for emails/links/parentheses), in one pass
+    return s.translate(_LATEX_ESCAPES) if s else ""
 
-def to_resume_items(block: str) -> str:
-    """
-    Turn lines that look like bullets into Jake-styled bullet list.
-    Recognizes lines starting with -, •, or *.
-    Non-bullet paragraphs pass through unchanged.
+def render_section(section: Section | None) -> str:
+    r"""
+    Render a parsed section Jake-style: entry titles as plain lines, their
+    bullets as a \resumeItem list.
     """
-    lines = [l.strip() for l in block.splitlines()]
-    bullet_lines, out, open_list = [], [], False
-
-    def flush_list():
-        nonlocal bullet_lines, out, open_list
-        if bullet_lines:
+    if section is None:
+        return ""
+    out = []
+    for entry in section.entries:
+        if entry.title:
+            out.append(latex_escape(entry.title))
+        if entry.bullets:
             out.append(r"\resumeItemListStart")
-            for b in bullet_lines:
-                out.append(rf"\resumeItem{{{latex_escape(b)}}}")
+            out.extend(rf"\resumeItem{{{latex_escape(b)}}}" for b in entry.bullets)
             out.append(r"\resumeItemListEnd")
-            bullet_lines = []
-        open_list = False
-
-    for l in lines:
-        if re.match(r"^(\-|\*|•)\s+", l):
-            bullet_lines.append(re.sub(r"^(\-|\*|•)\s+", "", l))
-            open_list = True
-        elif l:
-            if open_list:
-                flush_list()
-            out.append(latex_escape(l))
-    if open_list:
-        flush_list()
-
-    return "\n".join(out) if out else latex_escape(block.strip())
-
-def extract_sections(text: str) -> dict:
-    """
-    Detect common resume sections, return {Section: content}.
-    """
-    sections = {}
-    pattern = rf"({'|'.join(SECTION_HEADERS)})(.*?)(?=(?:{'|'.join(SECTION_HEADERS)}|$))"
-    for m in re.finditer(pattern, text, re.I | re.S):
-        header = m.group(1).strip().title()
-        content = re.sub(r"\n{2,}", "\n", m.group(2)).strip()
-        sections[header] = content
-    return sections
+    return "\n".join(out)
 
 # ---------- template
 
@@ -138,34 +84,103 @@ JAKE_BASE = dedent(r"""
 \end{document}
 """)
 
-def fill_jake_template_from_text(text: str) -> str:
-    meta = extract_contact_info(text)
-    sections = extract_sections(text)
+# ---------- compiled templates
+
+PLACEHOLDERS = ("NAME", "CONTACT_LINE", "EDU", "EXP", "PROJ", "SKILLS")
+PLACEHOLDER_RE = re.compile(r"\{(" + "|".join(PLACEHOLDERS) + r")\}")
+
+
+class CompiledTemplate:
+    """
+    A template parsed once into literal chunks and placeholder slots.
 
-    edu = to_resume_items(sections.get("Education", ""))
-    exp = to_resume_items(sections.get("Experience", ""))
-    proj = to_resume_items(sections.get("Projects", ""))
-    skills = to_resume_items(sections.get("Technical Skills", sections.get("Skills", "")))
+    Rendering fills the slots and does a single join, so the cost is one
+    pass over the output instead of one full-template scan per placeholder.
+    Values are inserted verbatim: a value that itself contains "{EDU}" is
+    not expanded again.
+    """
 
-    contact_bits = [meta["phone"], meta["email"]]
-    if meta["linkedin"]: contact_bits.append(meta["linkedin"])
-    if meta["github"]:   contact_bits.append(meta["github"])
+    def __init__(self, source: str):
+        self.source = source
+        self._parts = []   # literal strings, with None where a slot goes
+        self._slots = []   # (index into _parts, placeholder name)
+        pos = 0
+        for m in PLACEHOLDER_RE.finditer(source):
+            self._parts.append(source[pos:m.start()])
+            self._slots.append((len(self._parts), m.group(1)))
+            self._parts.append(None)
+            pos = m.end()
+        self._parts.append(source[pos:])
+        self.placeholders = frozenset(name for _, name in self._slots)
+
+    @property
+    def missing(self) -> frozenset:
+        """Standard placeholders the template never uses (their content is dropped)."""
+        return frozenset(PLACEHOLDERS) - self.placeholders
+
+    def render(self, values: dict) -> str:
+        parts = list(self._parts)
+        for index, name in self._slots:
+            parts[index] = values[name]
+        return "".join(parts)
+
+
+# User templates, keyed by (template_id, sha256 of the LaTeX) so an edited
+# template never renders from a stale parse.
+template_cache = TTLCache(max_entries=Config.TEMPLATE_CACHE_SIZE, ttl=Config.TEMPLATE_CACHE_TTL)
+
+
+def compile_template(template_latex: str, template_id: str | None = None) -> CompiledTemplate:
+    """Parse a template, reusing an earlier parse of the same content."""
+    source = (template_latex or "").strip()
+    key = (template_id, hashlib.sha256(source.encode("utf-8")).hexdigest())
+    compiled = template_cache.get(key)
+    if compiled is None:
+        compiled = CompiledTemplate(source)
+        template_cache.set(key, compiled)
+    return compiled
+
+
+JAKE_TEMPLATE = CompiledTemplate(JAKE_BASE)
+
+
+def template_values(resume: str | ResumeDocument) -> dict:
+    """Placeholder values for a plain-text resume or its parsed document."""
+    doc = resume if isinstance(resume, ResumeDocument) else parse_resume(resume)
+    contact = doc.contact
+
+    contact_bits = [contact["phone"], contact["email"]]
+    if contact["linkedin"]: contact_bits.append(contact["linkedin"])
+    if contact["github"]:   contact_bits.append(contact["github"])
     contact_line = " | ".join(filter(None, contact_bits)) or "Contact Info Here"
 
-    return (JAKE_BASE
-            .replace("{NAME}", meta["name"] or "Candidate Name")
-            .replace("{CONTACT_LINE}", latex_escape(contact_line))
-            .replace("{EDU}", edu or "")
-            .replace("{EXP}", exp or "")
-            .replace("{PROJ}", proj or "")
-            .replace("{SKILLS}", skills or "")
-            ).strip()
+    return {
+        "NAME": latex_escape(contact["name"]),
+        "CONTACT_LINE": latex_escape(contact_line),
+        "EDU": render_section(doc.section("Education")),
+        "EXP": render_section(doc.section("Experience")),
+        "PROJ": render_section(doc.section("Projects")),
+        "SKILLS": render_section(doc.section("Technical Skills", "Skills")),
+    }
+
+
+def fill_jake_template_from_text(resume: str | ResumeDocument) -> str:
+    return JAKE_TEMPLATE.render(template_values(resume)).strip()
 
 # ---------- public API
 
-def wrap_in_jake_template(text: str) -> str:
+def wrap_in_jake_template(resume: str | ResumeDocument) -> str:
     """Build a Jake-style LaTeX resume from plain text (PDF/DOCX extraction)."""
-    return fill_jake_template_from_text(text)
+    return fill_jake_template_from_text(resume)
+
+def strip_code_fences(latex_code: str) -> str:
+    """Remove Markdown ``` fences that Gemini sometimes wraps around LaTeX."""
+    return re.sub(
+        r"^```[a-zA-Z]*|```$",
+        "",
+        (latex_code or "").strip(),
+        flags=re.MULTILINE
+    ).strip()
 
 def clean_and_validate_latex(latex_code: str) -> str:
     """If the input isn’t LaTeX, wrap it; otherwise sanitize."""
@@ -175,33 +190,10 @@ def clean_and_validate_latex(latex_code: str) -> str:
     latex_code = re.sub(r"[\x00-\x08\x0B\x0C\x0E-\x1F]", "", latex_code)
     return latex_code.strip()
 
-def wrap_in_template(text: str, template_latex: str) -> str:
+def wrap_in_template(resume: str | ResumeDocument, template_latex: str, template_id: str | None = None) -> str:
     """
     Fill a user-provided LaTeX template using standard placeholders:
     {NAME}, {CONTACT_LINE}, {EDU}, {EXP}, {PROJ}, {SKILLS}
     """
-    meta = extract_contact_info(text)
-    sections = extract_sections(text)
-
-    edu = to_resume_items(sections.get("Education", ""))
-    exp = to_resume_items(sections.get("Experience", ""))
-    proj = to_resume_items(sections.get("Projects", ""))
-    skills = to_resume_items(sections.get("Technical Skills", sections.get("Skills", "")))
-
-    contact_bits = [meta["phone"], meta["email"]]
-    if meta["linkedin"]: contact_bits.append(meta["linkedin"])
-    if meta["github"]:   contact_bits.append(meta["github"])
-    contact_line = " | ".join(filter(None, contact_bits)) or "Contact Info Here"
-
-    out = (template_latex or "").strip()
-
-    # Replace placeholders if present; otherwise no-op
-    out = out.replace("{NAME}", meta["name"] or "Candidate Name")
-    out = out.replace("{CONTACT_LINE}", latex_escape(contact_line))
-    out = out.replace("{EDU}", edu or "")
-    out = out.replace("{EXP}", exp or "")
-    out = out.replace("{PROJ}", proj or "")
-    out = out.replace("{SKILLS}", skills or "")
-
-    return out.strip()
-
+    template = compile_template(template_latex, template_id)
+    return template.render(template_values(resume)).strip()
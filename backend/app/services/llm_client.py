@@ -0,0 +1,265 @@
+import asyncio
+import time
+from app.config import Config
+from app.services import model_registry
+from app.utils.singleflight import gemini_flights, flight_key
+
+
+class LLMUnavailable(RuntimeError):
+    """The LLM could not produce a result (outage, open circuit, timeout)."""
+
+
+class CircuitOpenError(LLMUnavailable):
+    """Calls are short-circuited after repeated upstream failures."""
+
+
+class LLMTimeout(LLMUnavailable, TimeoutError):
+    """An LLM call (including time spent waiting for a rate-limit slot) ran past its timeout."""
+
+
+class TokenBucket:
+    """Async token-bucket rate limiter: `rate` calls per second, bursts up to `burst`."""
+
+    def __init__(self, rate: float, burst: int):
+        self.rate = rate
+        self.burst = burst
+        self._tokens = float(burst)
+        self._updated = time.monotonic()
+        self.waits = 0
+
+    def _refill(self):
+        now = time.monotonic()
+        self._tokens = min(self.burst, self._tokens + (now - self._updated) * self.rate)
+        self._updated = now
+
+    async def acquire(self):
+        # Single-threaded event loop: no lock needed between refill and take
+        while True:
+            self._refill()
+            if self._tokens >= 1:
+                self._tokens -= 1
+                return
+            self.waits += 1
+            await asyncio.sleep((1 - self._tokens) / self.rate)
+
+    def stats(self) -> dict:
+        self._refill()
+        return {"rate": self.rate, "burst": self.burst, "tokens": round(self._tokens, 2), "waits": self.waits}
+
+
+class CircuitBreaker:
+    """
+    Opens after `failure_threshold` consecutive failures and rejects calls
+    for `reset_timeout` seconds. Then one trial call is let through
+    (half-open): success closes the circuit, failure opens it again.
+    """
+
+    def __init__(self, failure_threshold: int, reset_timeout: float):
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.failures = 0
+        self.opened_at = None
+        self._trial_running = False
+        self.trips = 0
+        self.rejected = 0
+
+    @property
+    def state(self) -> str:
+        if self.opened_at is None:
+            return "closed"
+        if time.monotonic() - self.opened_at >= self.reset_timeout:
+            return "half_open"
+        return "open"
+
+    def allow(self) -> bool:
+        state = self.state
+        if state == "closed":
+            return True
+        if state == "half_open" and not self._trial_running:
+            self._trial_running = True
+            return True
+        self.rejected += 1
+        return False
+
+    def record_success(self):
+        self.failures = 0
+        self.opened_at = None
+        self._trial_running = False
+
+    def record_failure(self):
+        self.failures += 1
+        if self._trial_running or (self.opened_at is None and self.failures >= self.failure_threshold):
+            self.trips += 1
+            self.opened_at = time.monotonic()
+        self._trial_running = False
+
+    def release(self):
+        """A call ended without an outcome (cancelled): free the half-open trial slot."""
+        self._trial_running = False
+
+    def stats(self) -> dict:
+        return {"state": self.state, "consecutive_failures": self.failures, "trips": self.trips, "rejected": self.rejected}
+
+
+# -------------------- BACKENDS --------------------
+
+class LLMBackend:
+    """Produces text for a prompt, whole or as a stream of chunks."""
+
+    model_name = "base"
+
+    async def generate(self, prompt: str) -> str:
+        raise NotImplementedError
+
+    async def stream(self, prompt: str):
+        raise NotImplementedError
+        yield  # pragma: no cover - makes this an async generator
+
+
+class GeminiBackend(LLMBackend):
+    """google.generativeai, with one GenerativeModel reused across calls."""
+
+    def __init__(self, model_name: str):
+        self.model_name = model_name
+        self._genai = None
+        self._model = None
+
+    def model(self):
+        genai = model_registry.gemini.get()
+        if genai is not self._genai:   # loaded (or swapped out in tests) since last call
+            self._model = genai.GenerativeModel(self.model_name)
+            self._genai = genai
+        return self._model
+
+    async def generate(self, prompt: str) -> str:
+        response = await self.model().generate_content_async(prompt)
+        return response.text
+
+    async def stream(self, prompt: str):
+        response = await self.model().generate_content_async(prompt, stream=True)
+        async for chunk in response:
+            try:
+                text = chunk.text
+            except ValueError:
+                continue  # chunk without text parts (e.g. a safety/finish marker)
+            if text:
+                yield text
+
+
+# -------------------- CLIENT --------------------
+
+class LLMClient:
+    """
+    Guarded access to an LLM backend: token-bucket rate limit, bounded
+    concurrency, a per-call timeout and a circuit breaker. Identical
+    concurrent prompts are coalesced into one upstream call.
+
+    `backend` is an LLMBackend; tests plug in fakes.
+    """
+
+    def __init__(self, backend, rate: float, burst: int, concurrency: int, timeout: float,
+                 breaker: CircuitBreaker, flights=gemini_flights):
+        self.backend = backend
+        self.limiter = TokenBucket(rate, burst)
+        self.concurrency = concurrency
+        self._slots = asyncio.Semaphore(concurrency)
+        self.timeout = timeout
+        self.breaker = breaker
+        self.flights = flights
+        self.calls = 0
+        self.failures = 0
+        self.timeouts = 0
+        self.in_flight = 0
+
+    async def generate(self, prompt: str, timeout: float | None = None) -> str:
+        """Text for `prompt`; raises LLMUnavailable subclasses on outage/timeout."""
+        key = flight_key(self.backend.model_name, prompt)
+        return await self.flights.do(key, self._generate, prompt, timeout)
+
+    async def _generate(self, prompt: str, timeout: float | None) -> str:
+        if not self.breaker.allow():
+            raise CircuitOpenError("LLM circuit is open after repeated failures.")
+        timeout = self.timeout if timeout is None else timeout
+        self.calls += 1
+        try:
+            text = await asyncio.wait_for(self._call(prompt), timeout)
+        except asyncio.TimeoutError:
+            self.timeouts += 1
+            self.failures += 1
+            self.breaker.record_failure()
+            raise LLMTimeout(f"LLM call timed out after {timeout:g}s.")
+        except asyncio.CancelledError:
+            self.breaker.release()
+            raise
+        except Exception:
+            self.failures += 1
+            self.breaker.record_failure()
+            raise
+        self.breaker.record_success()
+        return text
+
+    async def _call(self, prompt: str) -> str:
+        await self.limiter.acquire()
+        async with self._slots:
+            self.in_flight += 1
+            try:
+                return await self.backend.generate(prompt)
+            finally:
+                self.in_flight -= 1
+
+    async def stream(self, prompt: str):
+        """
+        Async generator of text chunks under the same limits (not coalesced).
+        The timeout applies to the wait for a slot and to each gap between chunks.
+        """
+        if not self.breaker.allow():
+            raise CircuitOpenError("LLM circuit is open after repeated failures.")
+        self.calls += 1
+        try:
+            await asyncio.wait_for(self.limiter.acquire(), self.timeout)
+            async with self._slots:
+                self.in_flight += 1
+                try:
+                    chunks = self.backend.stream(prompt).__aiter__()
+                    while True:
+                        try:
+                            chunk = await asyncio.wait_for(chunks.__anext__(), self.timeout)
+                        except StopAsyncIteration:
+                            break
+                        yield chunk
+                finally:
+                    self.in_flight -= 1
+        except asyncio.TimeoutError:
+            self.timeouts += 1
+            self.failures += 1
+            self.breaker.record_failure()
+            raise LLMTimeout(f"LLM stream stalled for {self.timeout:g}s.")
+        except (GeneratorExit, asyncio.CancelledError):
+            self.breaker.release()   # consumer went away
+            raise
+        except Exception:
+            self.failures += 1
+            self.breaker.record_failure()
+            raise
+        self.breaker.record_success()
+
+    def stats(self) -> dict:
+        return {
+            "calls": self.calls,
+            "failures": self.failures,
+            "timeouts": self.timeouts,
+            "in_flight": self.in_flight,
+            "max_concurrency": self.concurrency,
+            "rate_limit": self.limiter.stats(),
+            "circuit": self.breaker.stats(),
+        }
+
+
+gemini = LLMClient(
+    GeminiBackend(Config.GEMINI_MODEL),
+    rate=Config.LLM_RATE_PER_SEC,
+    burst=Config.LLM_BURST,
+    concurrency=Config.LLM_MAX_CONCURRENCY,
+    timeout=Config.LLM_TIMEOUT,
+    breaker=CircuitBreaker(Config.LLM_BREAKER_FAILURES, Config.LLM_BREAKER_RESET),
+)
@@ -0,0 +1,123 @@
+import threading
+import time
+from types import SimpleNamespace
+from app.config import Config
+
+_resources = {}
+
+
+class LazyResource:
+    """
+    A heavy dependency (model, big library) loaded once on first use.
+
+    Loading is thread-safe; `warmup()` can load everything ahead of time in
+    a background thread so the first request doesn't pay for it, while the
+    app itself imports and serves /api/health immediately.
+    """
+
+    def __init__(self, name: str, loader):
+        self.name = name
+        self._loader = loader
+        self._value = None
+        self._loaded = False
+        self._lock = threading.Lock()
+        self.load_seconds = None
+        self.error = None
+        _resources[name] = self
+
+    @property
+    def loaded(self) -> bool:
+        return self._loaded
+
+    def get(self):
+        if self._loaded:
+            return self._value
+        with self._lock:
+            if not self._loaded:
+                start = time.perf_counter()
+                try:
+                    self._value = self._loader()
+                except Exception as e:
+                    self.error = str(e)
+                    raise
+                self.load_seconds = round(time.perf_counter() - start, 3)
+                self.error = None
+                self._loaded = True
+        return self._value
+
+    def status(self) -> dict:
+        return {"loaded": self._loaded, "load_seconds": self.load_seconds, "error": self.error}
+
+
+# -------------------- LOADERS --------------------
+
+def _load_sklearn():
+    from sklearn.feature_extraction.text import TfidfVectorizer
+    from sklearn.metrics.pairwise import cosine_similarity
+    return SimpleNamespace(TfidfVectorizer=TfidfVectorizer, cosine_similarity=cosine_similarity)
+
+
+def _load_tfidf_analyzer():
+    # Same tokenizer and stop words as score_service.semantic_similarity
+    return sklearn.get().TfidfVectorizer(stop_words="english").build_analyzer()
+
+
+def _load_stemmer():
+    from nltk.stem.snowball import SnowballStemmer
+    return SnowballStemmer("english")
+
+
+# Keyword extraction only reads token.pos_ (tok2vec -> tagger -> attribute_ruler);
+# excluded components are never loaded, which saves memory and time per doc.
+SPACY_EXCLUDE = ("parser", "senter", "ner", "lemmatizer")
+
+
+def _load_spacy():
+    import spacy
+    nlp = spacy.load(Config.SPACY_MODEL, exclude=list(SPACY_EXCLUDE))
+    nlp.max_length = max(nlp.max_length, Config.SPACY_MAX_CHARS)
+    return nlp
+
+
+def _load_skill_matcher():
+    from app.services.skill_taxonomy import build_matcher
+    return build_matcher(Config.SKILL_TAXONOMY_PATH or None)
+
+
+def _load_gemini():
+    import google.generativeai as genai
+    genai.configure(api_key=Config.GEMINI_API_KEY)
+    return genai
+
+
+sklearn = LazyResource("sklearn", _load_sklearn)
+tfidf_analyzer = LazyResource("tfidf_analyzer", _load_tfidf_analyzer)
+stemmer = LazyResource("stemmer", _load_stemmer)
+spacy_nlp = LazyResource("spacy", _load_spacy)
+skill_matcher = LazyResource("skill_matcher", _load_skill_matcher)
+gemini = LazyResource("gemini", _load_gemini)
+
+
+# -------------------- WARMUP / READINESS --------------------
+
+def warmup(names=None):
+    """Load resources now; failures are recorded in status() instead of raised."""
+    for name in names or list(_resources):
+        try:
+            _resources[name].get()
+        except Exception as e:
+            print(f"Warmup failed for {name}:", e)
+
+
+def start_warmup(names=None) -> threading.Thread:
+    thread = threading.Thread(target=warmup, args=(names,), name="model-warmup", daemon=True)
+    thread.start()
+    return thread
+
+
+def readiness() -> dict:
+    models = {name: res.status() for name, res in _resources.items()}
+    return {
+        "ready": all(m["loaded"] for m in models.values()),
+        "models": models,
+    }
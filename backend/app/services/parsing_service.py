@@ -1,24 +1,31 @@
-import io
-import tempfile
 from pdfminer.high_level import extract_text
 import docx2txt
+from app.config import Config
+
+
+class UploadTooLargeError(ValueError):
+    """Upload exceeded the configured maximum size."""
+
 
 def extract_text_from_resume(file):
     """Extract plain text from uploaded resume (PDF or DOCX)."""
-    filename = file.filename.lower()
+    filename = (file.filename or "").lower()
+    if not filename.endswith((".pdf", ".docx")):
+        raise ValueError("Unsupported file type. Upload PDF or DOCX.")
+
+    # The whole request is capped by BodyLimitMiddleware before it is
+    # parsed; this is the tighter per-file limit
+    size = getattr(file, "size", None)
+    if size is not None and size > Config.MAX_UPLOAD_BYTES:
+        raise UploadTooLargeError(f"Upload exceeds the {Config.MAX_UPLOAD_BYTES // (1024 * 1024)} MB limit.")
 
+    # Starlette has already spooled the upload (memory, then a temp file): read it in place
+    buffer = file.file
+    buffer.seek(0)
     if filename.endswith(".pdf"):
-        # Read PDF bytes into BytesIO for pdfminer
-        file_bytes = file.file.read()
-        with io.BytesIO(file_bytes) as pdf_buffer:
-            text = extract_text(pdf_buffer)
-    elif filename.endswith(".docx"):
-        # Save to temp file so docx2txt can process it
-        with tempfile.NamedTemporaryFile(delete=False, suffix=".docx") as tmp:
-            tmp.write(file.file.read())
-            tmp.flush()
-            text = docx2txt.process(tmp.name)
+        text = extract_text(buffer)
     else:
-        raise ValueError("Unsupported file type. Upload PDF or DOCX.")
+        # docx2txt opens the document with zipfile, which accepts file objects
+        text = docx2txt.process(buffer)
 
     return text.strip()
@@ -0,0 +1,101 @@
+import itertools
+import json
+import time
+from app.config import Config
+from app.services.supabase_service import SupabaseClient
+from app.utils.cache import TTLCache, SQLiteCache
+
+# Per-user profile data used by /rewrite: experiences, projects and templates.
+# Keys are (user_id, table) or (user_id, "resume_templates", template_id);
+# entries are (value, weight, fetched_at).
+profile_cache = TTLCache(
+    max_entries=Config.PROFILE_CACHE_SIZE,
+    ttl=Config.PROFILE_CACHE_TTL,
+    max_weight=Config.PROFILE_CACHE_MB * 1024 * 1024,
+    weigher=lambda entry: entry[1],
+)
+
+# Versioning: every fetch and every invalidation draws from one counter. A
+# fetch that started before a write finished must not store its (stale) rows.
+# Invalidation stamps only need to outlive the slowest in-flight fetch.
+_versions = itertools.count(1)
+_invalidated = TTLCache(max_entries=Config.PROFILE_CACHE_SIZE * 4, ttl=300)
+
+# The cache above is per process. Writes also record their wall-clock time
+# in PROFILE_STAMP_DB, which every worker process on the host shares; an
+# entry fetched before the latest write to its key is a miss, so a write
+# handled by one worker isn't hidden by another worker's cache (or by
+# tailored results keyed on the stale profile). Stamps outlive any entry
+# that could predate them. With PROFILE_STAMP_DB="" only the worker that
+# handled the write sees it; the others catch up within PROFILE_CACHE_TTL.
+_stamps = SQLiteCache(Config.PROFILE_STAMP_DB, table="profile_stamps") if Config.PROFILE_STAMP_DB else None
+
+
+def _stamp_key(key) -> str:
+    return "\x1f".join(key)
+
+
+def _written_since(key, fetched_at: float) -> bool:
+    """True if any worker wrote `key` at or after `fetched_at`."""
+    if _stamps is None:
+        return False
+    stamp = _stamps.get(_stamp_key(key))
+    return stamp is not None and stamp >= fetched_at
+
+
+def _cached(key):
+    cached = profile_cache.get(key)
+    if cached is None or _written_since(key, cached[2]):
+        return None
+    return cached[0]
+
+
+def _store(key, version: int, fetched_at: float, value):
+    if _invalidated.get(key, 0) > version or _written_since(key, fetched_at):
+        return
+    weight = len(json.dumps(value, default=str))
+    profile_cache.set(key, (value, weight, fetched_at))
+
+
+def invalidate(user_id: str, table: str, row_id: str | None = None):
+    """Drop cached rows after a successful write (called by user_data_routes)."""
+    key = (user_id, table) if row_id is None else (user_id, table, row_id)
+    _invalidated.set(key, next(_versions))
+    if _stamps is not None:
+        _stamps.set(_stamp_key(key), time.time(), ttl=Config.PROFILE_CACHE_TTL + 300)
+    profile_cache.pop(key)
+
+
+async def get_user_rows(supabase: SupabaseClient, user_id: str, table: str) -> list:
+    """A user's experiences or projects; empty list (not cached) on failure."""
+    key = (user_id, table)
+    cached = _cached(key)
+    if cached is not None:
+        return list(cached)
+
+    version, fetched_at = next(_versions), time.time()
+    res = await supabase.select(table, {"user_id": f"eq.{user_id}"})
+    if res.status_code != 200:
+        return []
+    rows = res.json()
+    _store(key, version, fetched_at, rows)
+    return list(rows)
+
+
+async def get_template_latex(supabase: SupabaseClient, user_id: str, template_id: str) -> str | None:
+    """LaTeX for one of the user's saved templates, None if it doesn't exist."""
+    key = (user_id, "resume_templates", template_id)
+    cached = _cached(key)
+    if cached is not None:
+        return cached
+
+    version, fetched_at = next(_versions), time.time()
+    res = await supabase.select(
+        "resume_templates",
+        {"id": f"eq.{template_id}", "user_id": f"eq.{user_id}", "select": "latex"}
+    )
+    if res.status_code != 200 or not res.json():
+        return None
+    latex = res.json()[0]["latex"]
+    _store(key, version, fetched_at, latex)
+    return latex
@@ -0,0 +1,53 @@
+import asyncio
+import json
+import sqlite3
+from app.config import Config
+from app.services import llm_client
+from app.services.rewrite_service import PROMPT_VERSION
+from app.utils.cache import TTLCache, SQLiteCache, TieredCache
+from app.utils.singleflight import flight_key
+
+# Finished rewrites (tailored LaTeX, keywords, score), keyed by everything
+# that shapes them. Memory tier per process; the SQLite tier (on by default,
+# RESULT_STORE_DB="" turns it off) survives restarts and is shared by every
+# worker process on the host.
+results = TieredCache(
+    TTLCache(max_entries=Config.RESULT_CACHE_SIZE, ttl=Config.RESULT_STORE_TTL),
+    SQLiteCache(
+        Config.RESULT_STORE_DB, table="tailored_results", max_bytes=Config.RESULT_STORE_MB * 1024 * 1024
+    ) if Config.RESULT_STORE_DB else None,
+)
+
+
+def result_key(latex_resume: str, job_description: str, rewrite_mode: str, experiences, projects) -> str:
+    """
+    Content hash of a rewrite's inputs. `latex_resume` is the rendered
+    document, so it covers both the uploaded resume and the template; the
+    model name and PROMPT_VERSION retire results when either changes.
+    """
+    profile = json.dumps([experiences or [], projects or []], sort_keys=True, default=str)
+    return flight_key(
+        "rewrite", PROMPT_VERSION, llm_client.gemini.backend.model_name,
+        rewrite_mode, latex_resume, job_description, profile,
+    )
+
+
+async def get(key: str) -> dict | None:
+    """Stored result, or None. Runs off the event loop; a store error is a miss."""
+    try:
+        return await asyncio.to_thread(results.get, key)
+    except (sqlite3.Error, OSError) as e:
+        print("Result store read failed:", e)
+        return None
+
+
+async def put(key: str, result: dict, ttl: float | None = None):
+    """Store a result off the event loop; errors are logged, never raised (the rewrite already succeeded)."""
+    try:
+        await asyncio.to_thread(results.set, key, result, ttl)
+    except (sqlite3.Error, OSError) as e:
+        print("Result store write failed:", e)
+
+
+def stats() -> dict:
+    return results.stats()
@@ -0,0 +1,128 @@
+import re
+
+SECTION_HEADERS = [
+    "Education", "Experience", "Projects",
+    "Technical Skills", "Skills", "Awards",
+    "Certifications", "Research", "Leadership"
+]
+
+# A header is a line holding only a section name, optionally "Name: content"
+HEADER_RE = re.compile(
+    rf"({'|'.join(SECTION_HEADERS)})\s*(?::\s*(.*))?$", re.I
+)
+BULLET_RE = re.compile(r"(?:-|\*|•)\s+")
+
+EMAIL_RE = re.compile(r"[A-Za-z0-9._%+-]+@[A-Za-z0-9.-]+\.[A-Za-z]{2,}")
+PHONE_RE = re.compile(r"(\+?\d[\d \-\(\)]{7,}\d)")
+LINKEDIN_RE = re.compile(r"(https?://(www\.)?linkedin\.com/in/[^\s]+)", re.I)
+GITHUB_RE   = re.compile(r"(https?://(www\.)?github\.com/[^\s]+)", re.I)
+NAME_RE = re.compile(r"[A-Za-z]{2,}")
+
+
+class Entry:
+    """One item in a section: an optional title line and the bullets under it."""
+
+    __slots__ = ("title", "bullets")
+
+    def __init__(self, title: str = "", bullets=None):
+        self.title = title
+        self.bullets = bullets if bullets is not None else []
+
+    def __eq__(self, other):
+        return isinstance(other, Entry) and (self.title, self.bullets) == (other.title, other.bullets)
+
+    def __repr__(self):
+        return f"Entry({self.title!r}, {self.bullets!r})"
+
+
+class Section:
+    __slots__ = ("name", "entries")
+
+    def __init__(self, name: str):
+        self.name = name
+        self.entries = []
+
+    def __repr__(self):
+        return f"Section({self.name!r}, {self.entries!r})"
+
+
+class ResumeDocument:
+    """
+    Plain-text resume (PDF/DOCX extraction) parsed into contact details and
+    sections of entries and bullets. Text is kept raw; escaping is the
+    renderer's job. `text` is the source, for scoring.
+    """
+
+    __slots__ = ("text", "contact", "sections", "match_index")
+
+    def __init__(self, text: str, contact: dict, sections: dict):
+        self.text = text
+        self.contact = contact
+        self.sections = sections     # title-cased name -> Section, in document order
+        self.match_index = None      # KeywordMatchIndex, built by score_service on first use
+
+    def section(self, *names) -> Section | None:
+        """First of `names` present in the document."""
+        for name in names:
+            if name in self.sections:
+                return self.sections[name]
+        return None
+
+
+def extract_contact(text: str, lines) -> dict:
+    name = next((l for l in lines[:5] if NAME_RE.search(l)), "Candidate Name")
+
+    email = EMAIL_RE.search(text)
+    phone = PHONE_RE.search(text)
+    linkedin = LINKEDIN_RE.search(text)
+    github = GITHUB_RE.search(text)
+
+    return {
+        "name": name,
+        "email": email.group(0) if email else "",
+        "phone": phone.group(0) if phone else "",
+        "linkedin": linkedin.group(0) if linkedin else "",
+        "github": github.group(0) if github else ""
+    }
+
+
+def parse_resume(text: str) -> ResumeDocument:
+    """
+    Tokenize resume text line by line in a single pass.
+
+    Header lines open (or reopen) a section; lines starting with -, * or •
+    are bullets of the current entry; any other line starts a new entry.
+    Lines before the first header only feed the contact details.
+    """
+    text = text or ""
+    lines = [l for l in (raw.strip() for raw in text.splitlines()) if l]
+
+    sections = {}
+    current = None   # Section
+    entry = None     # Entry receiving bullets
+
+    for line in lines:
+        header = HEADER_RE.match(line)
+        if header:
+            name = header.group(1).title()
+            current = sections.get(name)
+            if current is None:
+                current = sections[name] = Section(name)
+            entry = None
+            line = header.group(2)
+            if not line:
+                continue
+        if current is None:
+            continue
+
+        bullet = BULLET_RE.match(line)
+        if bullet:
+            if entry is None:
+                entry = Entry()
+                current.entries.append(entry)
+            entry.bullets.append(line[bullet.end():])
+        else:
+            entry = Entry(line)
+            current.entries.append(entry)
+
+    return ResumeDocument(text, extract_contact(text, lines), sections)
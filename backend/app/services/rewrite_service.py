@@ -1,42 +1,55 @@
-import google.generativeai as genai
+import asyncio
+import re
 from app.config import Config
+from app.services import llm_client
+from app.services.keyword_service import extract_relevant_sections
+from app.services.latex_service import strip_code_fences
+from app.services.score_service import normalize
 
-genai.configure(api_key=Config.GEMINI_API_KEY)
+# Bump whenever the rewrite prompts or their post-processing change:
+# it is part of the tailored-result store key, so old results stop matching.
+PROMPT_VERSION = "2"
 
-def rewrite_resume_with_gemini(
-    latex_resume,
-    job_description,
-    keywords,
-    experiences=None,
-    projects=None
-):
-    """
-    Rewrite a LaTeX resume to align with a job description.
-    Uses saved experiences and projects for personalization when provided.
-    """
-    
-    # Ensure lists are never None
-    experiences = experiences or []
-    projects = projects or []
+BEGIN_DOCUMENT = "\\begin{document}"
+END_DOCUMENT = "\\end{document}"
+SECTION_RE = re.compile(r"^[ \t]*\\section\*?\{([^}]*)\}", re.M)
 
-    # Format experiences for prompt
-    formatted_experiences = "\n".join(
+
+def format_experience(exp: dict) -> str:
+    return (
         f"- {exp.get('role', '')} at {exp.get('company', '')} "
         f"({exp.get('start_date', '')} → {exp.get('end_date', 'Present')}): "
         + "; ".join(exp.get('bullets', []))
-        for exp in experiences
-    ) or "None provided"
+    )
+
 
-    # Format projects for prompt
-    formatted_projects = "\n".join(
+def format_project(proj: dict) -> str:
+    return (
         f"- {proj.get('name', '')} "
         f"({proj.get('start_date', '')} → {proj.get('end_date', 'Present')}), "
         f"Tech: {', '.join(proj.get('tech_stack', []))}. "
         f"Bullets: {'; '.join(proj.get('bullets', []))}"
-        for proj in projects
-    ) or "None provided"
+    )
+
+
+def format_saved_entries(experiences=None, projects=None):
+    """Saved experiences and projects as prompt bullet lists."""
+    formatted_experiences = "\n".join(map(format_experience, experiences or [])) or "None provided"
+    formatted_projects = "\n".join(map(format_project, projects or [])) or "None provided"
+    return formatted_experiences, formatted_projects
+
 
-    prompt = f"""
+def build_rewrite_prompt(
+    latex_resume,
+    job_description,
+    keywords,
+    experiences=None,
+    projects=None
+):
+    """Build the Gemini prompt for rewriting a LaTeX resume."""
+    formatted_experiences, formatted_projects = format_saved_entries(experiences, projects)
+
+    return f"""
 You are an expert LaTeX resume editor. You will rewrite the content of a LaTeX resume while ensuring that the final output compiles successfully on latexonline.cc.
 
 IMPORTANT — STRICT LATEX RULES (follow EXACTLY):
@@ -77,6 +90,284 @@ Original LaTeX Resume:
 \"\"\"{latex_resume}\"\"\"
 """
 
-    model = genai.GenerativeModel(Config.GEMINI_MODEL)
-    response = model.generate_content(prompt)
-    return response.text.strip()
+
+# -------------------- PROMPT BUDGET --------------------
+
+def estimate_tokens(text: str) -> int:
+    """Rough token count (Gemini averages about four characters per token)."""
+    return -(-len(text) // Config.PROMPT_CHARS_PER_TOKEN)
+
+
+def entry_relevance(entry: dict, keywords) -> float:
+    """Fraction of the JD keywords that appear in a saved experience/project."""
+    if not keywords:
+        return 0.0
+    fields = [
+        entry.get("role", ""), entry.get("company", ""), entry.get("name", ""),
+        *entry.get("tech_stack", []), *entry.get("bullets", []),
+    ]
+    text = f" {normalize(' '.join(filter(None, fields)))} "
+    hits = sum(1 for kw in keywords if f" {normalize(kw).strip()} " in text)
+    return hits / len(keywords)
+
+
+def resume_titles(resume_doc) -> list:
+    """Normalized entry titles of the resume's Experience and Projects sections."""
+    if resume_doc is None:
+        return []
+    return [
+        f" {normalize(entry.title)} "
+        for name in ("Experience", "Projects")
+        if name in resume_doc.sections
+        for entry in resume_doc.sections[name].entries
+        if entry.title
+    ]
+
+
+def on_resume(entry: dict, titles) -> bool:
+    """
+    A saved entry the resume already lists: one entry title names both the
+    experience's role and company, or the project's name. A company alone
+    isn't enough; another role there is a different entry.
+    """
+    if entry.get("company"):
+        parts = [entry["company"], entry.get("role") or ""]
+    else:
+        parts = [entry.get("name") or ""]
+    parts = [normalize(part).strip() for part in parts]
+    if not all(parts):
+        return False
+    return any(all(f" {part} " in title for part in parts) for title in titles)
+
+
+class PromptPlan:
+    """
+    Inputs for a rewrite prompt that fits the token budget, plus a report.
+
+    The resume is never cut. When the prompt is over budget the JD is first
+    narrowed to its relevant sections (keyword_service.extract_relevant_sections).
+    Saved experiences and projects are ranked by keyword relevance, and only
+    the top ones that still fit are kept (at most PROMPT_MAX_SAVED_ENTRIES).
+    With the parsed resume (ResumeDocument), saved entries it already lists
+    are left out.
+    """
+
+    def __init__(self, job_description, experiences, projects, stats: dict):
+        self.job_description = job_description
+        self.experiences = experiences
+        self.projects = projects
+        self.stats = stats
+
+
+def plan_rewrite_prompt(
+    latex_resume,
+    job_description,
+    keywords,
+    experiences=None,
+    projects=None,
+    budget: int | None = None,
+    resume_doc=None,
+) -> PromptPlan:
+    budget = budget or Config.PROMPT_TOKEN_BUDGET
+    experiences = experiences or []
+    projects = projects or []
+    titles = resume_titles(resume_doc)
+
+    jd_trimmed = False
+    base_tokens = estimate_tokens(build_rewrite_prompt(latex_resume, job_description, keywords))
+    if base_tokens > budget:
+        focused = extract_relevant_sections(job_description)
+        if len(focused) < len(job_description):
+            job_description, jd_trimmed = focused, True
+            base_tokens = estimate_tokens(build_rewrite_prompt(latex_resume, job_description, keywords))
+
+    candidates = [("experience", i, e, format_experience(e)) for i, e in enumerate(experiences)]
+    candidates += [("project", i, p, format_project(p)) for i, p in enumerate(projects)]
+    fresh = [item for item in candidates if not on_resume(item[2], titles)]
+    ranked = sorted(fresh, key=lambda item: -entry_relevance(item[2], keywords))   # stable: ties keep saved order
+
+    used = base_tokens
+    kept = {"experience": [], "project": []}
+    relevance = []
+    for kind, i, entry, line in ranked[:Config.PROMPT_MAX_SAVED_ENTRIES]:
+        cost = estimate_tokens(line + "\n")
+        if used + cost > budget:
+            continue
+        used += cost
+        kept[kind].append((i, entry))
+        relevance.append({"type": kind, "index": i, "relevance": round(entry_relevance(entry, keywords), 3)})
+
+    # Original saved order within each list
+    kept_experiences = [e for _, e in sorted(kept["experience"], key=lambda item: item[0])]
+    kept_projects = [p for _, p in sorted(kept["project"], key=lambda item: item[0])]
+
+    prompt_tokens = estimate_tokens(build_rewrite_prompt(
+        latex_resume, job_description, keywords, kept_experiences, kept_projects
+    ))
+    return PromptPlan(job_description, kept_experiences, kept_projects, {
+        "prompt_tokens": prompt_tokens,
+        "budget": budget,
+        "over_budget": prompt_tokens > budget,
+        "jd_trimmed": jd_trimmed,
+        "experiences": f"{len(kept_experiences)}/{len(experiences)}",
+        "projects": f"{len(kept_projects)}/{len(projects)}",
+        "already_on_resume": len(candidates) - len(fresh),
+        "included": relevance,
+    })
+
+
+async def rewrite_resume_with_gemini_async(
+    latex_resume,
+    job_description,
+    keywords,
+    experiences=None,
+    projects=None
+):
+    """
+    Rewrite a LaTeX resume to align with a job description, using saved
+    experiences and projects for personalization when provided. Goes
+    through the shared LLM client; identical concurrent rewrites (double
+    clicks, retries) share one Gemini call.
+    """
+    prompt = build_rewrite_prompt(latex_resume, job_description, keywords, experiences, projects)
+    text = await llm_client.gemini.generate(prompt)
+    return text.strip()
+
+
+async def stream_rewrite_with_gemini(
+    latex_resume,
+    job_description,
+    keywords,
+    experiences=None,
+    projects=None
+):
+    """Async generator yielding LaTeX text chunks as Gemini generates them."""
+    prompt = build_rewrite_prompt(latex_resume, job_description, keywords, experiences, projects)
+    async for text in llm_client.gemini.stream(prompt):
+        yield text
+
+
+# -------------------- SECTION-PARALLEL MODE --------------------
+
+def split_latex_sections(latex_resume: str):
+    """
+    Split a LaTeX document into (head, sections, tail).
+
+    head is the preamble plus everything in the body before the first
+    \\section (header/contact block), tail is \\end{document} onwards, and
+    sections is a list of (title, latex) chunks, each starting at its
+    \\section. Returns None when there is no document body or no sections.
+    """
+    start = latex_resume.find(BEGIN_DOCUMENT)
+    end = latex_resume.rfind(END_DOCUMENT)
+    if start == -1 or end == -1 or end < start:
+        return None
+
+    body_start = start + len(BEGIN_DOCUMENT)
+    matches = list(SECTION_RE.finditer(latex_resume, body_start, end))
+    if not matches:
+        return None
+
+    bounds = [m.start() for m in matches] + [end]
+    sections = [
+        (m.group(1).strip(), latex_resume[bounds[i]:bounds[i + 1]])
+        for i, m in enumerate(matches)
+    ]
+    return latex_resume[:matches[0].start()], sections, latex_resume[end:]
+
+
+def build_section_prompt(
+    section_latex,
+    job_description,
+    keywords,
+    experiences=None,
+    projects=None
+):
+    """Gemini prompt for rewriting a single \\section of a LaTeX resume."""
+    saved = ""
+    if experiences or projects:
+        formatted_experiences, formatted_projects = format_saved_entries(experiences, projects)
+        saved = f"""
+USER'S SAVED EXPERIENCES:
+{formatted_experiences}
+
+USER'S SAVED PROJECTS:
+{formatted_projects}
+"""
+
+    return f"""
+You are an expert LaTeX resume editor. You will rewrite ONE section of a LaTeX resume. The section is spliced back into the full document unchanged, so the result must compile on latexonline.cc.
+
+IMPORTANT — STRICT LATEX RULES (follow EXACTLY):
+
+1. Return ONLY the rewritten section, starting with the same \\section line. No preamble, no \\begin{{document}} or \\end{{document}}.
+2. You MUST NOT rename the section or add other sections.
+3. You MUST preserve ALL existing LaTeX commands and macros exactly as they are, and use ONLY commands that already appear in this section.
+4. You MUST NOT introduce any new LaTeX commands, new macros, or new environments.
+5. You MUST NOT use Markdown formatting (NO backticks, NO ```).
+6. Keep every environment that is opened in the section closed in the section.
+
+YOUR TASK:
+- Rewrite only the *content* of this section so it strongly aligns with the provided job description.
+- Keep the structure and roughly the same length (the full resume must stay one page).
+- Naturally integrate these keywords only when relevant:
+  {", ".join(keywords)}
+- DO NOT invent new experiences or projects.
+{saved}
+BEGIN NOW.
+
+Job Description:
+\"\"\"{job_description}\"\"\"
+
+Original LaTeX Section:
+\"\"\"{section_latex}\"\"\"
+"""
+
+
+def saved_entries_for_section(title: str, experiences=None, projects=None):
+    """Only the Experience/Projects sections get the matching saved entries."""
+    title = title.lower()
+    return (
+        experiences if "experience" in title else None,
+        projects if "project" in title else None,
+    )
+
+
+async def rewrite_resume_sectioned_async(
+    latex_resume,
+    job_description,
+    keywords,
+    experiences=None,
+    projects=None,
+    concurrency: int | None = None
+):
+    """
+    Rewrite each \\section in its own concurrent Gemini call and splice the
+    results back between the untouched preamble/header and \\end{document}.
+
+    Wall-clock time is roughly that of the slowest section rather than of
+    the whole document. At most `concurrency` calls run at once. Documents
+    without sections fall back to a whole-document rewrite.
+    """
+    parts = split_latex_sections(latex_resume)
+    if parts is None:
+        return await rewrite_resume_with_gemini_async(
+            latex_resume, job_description, keywords, experiences, projects
+        )
+    head, sections, tail = parts
+
+    limit = asyncio.Semaphore(concurrency or Config.REWRITE_SECTION_CONCURRENCY)
+
+    async def rewrite_section(title, section_latex):
+        prompt = build_section_prompt(
+            section_latex, job_description, keywords,
+            *saved_entries_for_section(title, experiences, projects)
+        )
+        async with limit:
+            text = await llm_client.gemini.generate(prompt)
+        rewritten = strip_code_fences(text)
+        # A reply that lost its \\section line would drop the heading; keep the original
+        return rewritten if SECTION_RE.match(rewritten) else section_latex.strip()
+
+    rewritten = await asyncio.gather(*(rewrite_section(t, l) for t, l in sections))
+    return (head + "\n\n".join(rewritten) + "\n\n" + tail).strip()
@@ -1,17 +1,17 @@
-from sklearn.feature_extraction.text import TfidfVectorizer
-from sklearn.metrics.pairwise import cosine_similarity
 from difflib import SequenceMatcher
+from collections import Counter, defaultdict
+from functools import lru_cache
 import re
-from nltk.stem.snowball import SnowballStemmer
-
-stemmer = SnowballStemmer("english")
+from app.services import model_registry
+from app.services.resume_parser import ResumeDocument
 
 # ---------------------------
 # HELPERS
 # ---------------------------
 
+@lru_cache(maxsize=65536)
 def stem(word):
-    return stemmer.stem(word)
+    return model_registry.stemmer.get().stem(word)
 
 def normalize(text: str):
     """Lowercase + remove punctuation for safer matching."""
@@ -23,43 +23,158 @@ def fuzzy_match(a: str, b: str, threshold=0.75):
     return SequenceMatcher(None, a.lower(), b.lower()).ratio() >= threshold
 
 
-def keyword_match_score(keywords, resume_text):
-    resume_norm = normalize(resume_text)
-    resume_tokens = set(resume_norm.split())
-
-    hits = 0
-
-    for kw in keywords:
-        kw_norm = normalize(kw)
+def _bigrams(word: str) -> set:
+    """Character bigrams of `word` padded with ^/$ so first/last letters count."""
+    padded = f"^{word}$"
+    return {padded[i:i + 2] for i in range(len(padded) - 1)}
+
+
+class KeywordMatchIndex:
+    """
+    Prebuilt per-resume index for keyword matching.
+
+    Holds the normalized text (substring checks), the token set (exact
+    matches), the set of token stems and a bigram -> stems map so fuzzy
+    lookups only compare against stems sharing at least one padded bigram.
+    Taxonomy skills mentioned in the resume are found on first use, so a
+    keyword also matches through any alias ("Kubernetes" <-> "k8s").
+
+    That filter is lossless for thresholds above 2/3: with no shared padded
+    bigram every matching block has length 1 and needs an unmatched
+    character on either side, so SequenceMatcher.ratio() stays below 2/3.
+    """
+
+    def __init__(self, resume_text: str = "", threshold: float = 0.75, skill_aliases: bool = True):
+        self.threshold = threshold
+        self.skill_aliases = skill_aliases
+        self.resume_text = resume_text
+        self.resume_norm = normalize(resume_text)
+        self._skills = None          # canonical skills in the resume, found lazily
+        self.tokens = Counter()      # token -> occurrences (refcounts allow incremental updates)
+        self.stems = Counter()       # stem -> number of distinct tokens with that stem
+        self.grams = defaultdict(set)
+        self.comparisons = 0  # SequenceMatcher.ratio() calls, for profiling
+        self.add_tokens(self.resume_norm.split())
+
+    # -------------------- incremental maintenance --------------------
+
+    def add_tokens(self, tokens):
+        for token in tokens:
+            self.tokens[token] += 1
+            if self.tokens[token] == 1:
+                s = stem(token)
+                self.stems[s] += 1
+                if self.stems[s] == 1:
+                    for gram in _bigrams(s):
+                        self.grams[gram].add(s)
+
+    def remove_tokens(self, tokens):
+        for token in tokens:
+            self.tokens[token] -= 1
+            if self.tokens[token] == 0:
+                del self.tokens[token]
+                s = stem(token)
+                self.stems[s] -= 1
+                if self.stems[s] == 0:
+                    del self.stems[s]
+                    for gram in _bigrams(s):
+                        self.grams[gram].discard(s)
+                        if not self.grams[gram]:
+                            del self.grams[gram]
+
+    def set_text(self, resume_norm: str, resume_text: str | None = None, skills: set | None = None):
+        """
+        Swap the text used for substring and skill checks (tokens are updated
+        separately). Callers that track skills themselves pass `skills` so
+        the text isn't rescanned.
+        """
+        self.resume_norm = resume_norm
+        self.resume_text = resume_norm if resume_text is None else resume_text
+        self._skills = skills
+
+    # -------------------- lookups --------------------
+
+    def _candidates(self, kw_stem: str):
+        if self.threshold <= 2 / 3:
+            return self.stems
+        shared = defaultdict(int)
+        for gram in _bigrams(kw_stem):
+            for s in self.grams.get(gram, ()):
+                shared[s] += 1
+        # Most-overlapping first so hits exit early
+        return sorted(shared, key=shared.get, reverse=True)
+
+    def fuzzy_contains(self, kw_stem: str) -> bool:
+        """True if any token stem is at least `threshold` similar to kw_stem."""
+        if kw_stem in self.stems:
+            return True
+        matcher = SequenceMatcher(None)
+        matcher.set_seq1(kw_stem)
+        la = len(kw_stem)
+        for candidate in self._candidates(kw_stem):
+            lb = len(candidate)
+            # ratio() <= 2*min(la, lb)/(la + lb): cheap length bound first
+            if 2.0 * min(la, lb) / (la + lb) < self.threshold:
+                continue
+            matcher.set_seq2(candidate)
+            if matcher.quick_ratio() < self.threshold:
+                continue
+            self.comparisons += 1
+            if matcher.ratio() >= self.threshold:
+                return True
+        return False
+
+    def skills(self) -> set:
+        """Canonical taxonomy skills mentioned in the resume (one linear scan, then cached)."""
+        if self._skills is None:
+            self._skills = set(model_registry.skill_matcher.get().count_skills(self.resume_text))
+        return self._skills
+
+    def contains(self, keyword: str) -> bool:
+        kw_norm = normalize(keyword)
 
         # 1. Direct substring match
-        if kw_norm in resume_norm:
-            hits += 1
-            continue
+        if kw_norm in self.resume_norm:
+            return True
 
         # 2. Exact token match
-        for token in resume_tokens:
-            if kw_norm == token:
-                hits += 1
-                break
-
-        # 3. Fuzzy match
-        else:
-            for token in resume_tokens:
-                if fuzzy_match(stem(kw_norm), stem(token)):
-                    hits += 1
-                    break
+        if kw_norm in self.tokens:
+            return True
+
+        # 3. Same taxonomy skill under another name
+        if self.skill_aliases:
+            skill = model_registry.skill_matcher.get().canonical(keyword)
+            if skill is not None and skill in self.skills():
+                return True
+
+        # 4. Fuzzy match on stems
+        return self.fuzzy_contains(stem(kw_norm))
+
 
+def build_match_index(resume: str | ResumeDocument) -> KeywordMatchIndex:
+    """Index for a resume; a parsed ResumeDocument keeps its index for reuse."""
+    if isinstance(resume, ResumeDocument):
+        if resume.match_index is None:
+            resume.match_index = KeywordMatchIndex(resume.text)
+        return resume.match_index
+    return KeywordMatchIndex(resume)
+
+
+def keyword_match_score(keywords, resume_text, index: KeywordMatchIndex | None = None):
     if len(keywords) == 0:
         return 0.0
 
+    index = index or build_match_index(resume_text)
+    hits = sum(1 for kw in keywords if index.contains(kw))
+
     return hits / len(keywords)
 
 
 def semantic_similarity(job_description, resume_text):
-    vect = TfidfVectorizer(stop_words="english")
+    sklearn = model_registry.sklearn.get()
+    vect = sklearn.TfidfVectorizer(stop_words="english")
     tfidf = vect.fit_transform([job_description, resume_text])
-    score = cosine_similarity(tfidf[0:1], tfidf[1:2])[0][0]
+    score = sklearn.cosine_similarity(tfidf[0:1], tfidf[1:2])[0][0]
     return score
 
 
@@ -68,11 +183,20 @@ def semantic_similarity(job_description, resume_text):
 # ---------------------------
 
 def compute_ats_score(job_description, resume_text, keywords):
+    """resume_text may be raw text or a parsed ResumeDocument (its index is reused)."""
     # Keyword score (primary)
     kw_score = keyword_match_score(keywords, resume_text)
 
-    # Semantic relevance (TF-IDF boosted to give more impact)
+    # Semantic relevance
+    if isinstance(resume_text, ResumeDocument):
+        resume_text = resume_text.text
     semantic = semantic_similarity(job_description, resume_text)
+    return combine_scores(kw_score, semantic)
+
+
+def combine_scores(kw_score, semantic):
+    """Blend keyword coverage and semantic similarity into a 0–100 ATS score."""
+    # TF-IDF similarity boosted to give more impact
     semantic_boosted = min(semantic * 1.8, 1.0)   # <-- UPDATE #1
 
     # Weighted final score (keywords more important)
@@ -0,0 +1,201 @@
+import math
+import threading
+import uuid
+from collections import Counter
+from app.config import Config
+from app.services import latex_service, model_registry
+from app.services.score_service import KeywordMatchIndex, normalize, keyword_match_score, combine_scores
+from app.utils.cache import TTLCache
+
+# semantic_similarity fits TF-IDF on exactly two documents, so sklearn's smoothed
+# idf is ln(3 / (1 + df)) + 1: 1.0 for shared terms, this for one-sided terms.
+_IDF_ONE_DOC = math.log(1.5) + 1.0
+
+
+class ScoringSession:
+    """
+    Server-side scoring state for one JD + keyword set while a resume is edited.
+
+    The JD term counts are computed once. The resume is tracked per line:
+    only lines that were added since the last update are tokenized,
+    normalized and scanned for taxonomy skills, and the TF-IDF term counts,
+    skill counts and KeywordMatchIndex are patched incrementally. Produces
+    the same score as score_service.compute_ats_score, except that a
+    multi-word skill broken across two lines isn't recognized as that skill.
+    """
+
+    def __init__(self, job_description: str, keywords):
+        self.keywords = list(keywords)
+        self.analyze = model_registry.tfidf_analyzer.get()
+        self.jd_terms = Counter(self.analyze(job_description))
+        self.jd_sq_total = sum(c * c for c in self.jd_terms.values())
+
+        self.text = ""
+        self.lines = Counter()        # line -> occurrences in current text
+        self.line_tokens = {}         # line -> (tfidf terms, normalized tokens, normalized line, skills)
+        self.terms = Counter()        # resume TF-IDF term counts
+        self.skills = Counter()       # canonical skill -> mentions in current text
+        self.res_sq_total = 0
+        self.index = KeywordMatchIndex()
+
+        self.lock = threading.Lock()
+        self.lines_tokenized = 0
+        self.weight = self.approx_bytes()  # refreshed under self.lock by _update
+
+    # -------------------- incremental updates --------------------
+
+    def _tokenize(self, line: str):
+        tokens = self.line_tokens.get(line)
+        if tokens is None:
+            norm = normalize(line)
+            skills = model_registry.skill_matcher.get().count_skills(line)
+            tokens = (Counter(self.analyze(line)), norm.split(), norm.strip(), skills)
+            self.line_tokens[line] = tokens
+            self.lines_tokenized += 1
+        return tokens
+
+    def _apply_line(self, line: str, times: int):
+        """Add (times > 0) or remove (times < 0) occurrences of a line."""
+        terms, tokens, _, skills = self._tokenize(line)
+        for term, count in terms.items():
+            old = self.terms[term]
+            new = old + count * times
+            self.res_sq_total += new * new - old * old
+            if new:
+                self.terms[term] = new
+            else:
+                del self.terms[term]
+        for skill, count in skills.items():
+            self.skills[skill] += count * times
+            if not self.skills[skill]:
+                del self.skills[skill]
+        if times > 0:
+            self.index.add_tokens(tokens * times)
+        else:
+            self.index.remove_tokens(tokens * -times)
+
+    def _normalized(self, text: str, lines) -> str:
+        """normalize(text), stitched together from the cached per-line forms."""
+        body = " ".join(norm for norm in (self.line_tokens[line][2] for line in lines) if norm)
+        if not body:
+            return " " if text else ""
+        # A leading/trailing run of punctuation collapses to one space, as in normalize()
+        lead = " " if normalize(text[0]) == " " else ""
+        trail = " " if normalize(text[-1]) == " " else ""
+        return lead + body + trail
+
+    def _update(self, text: str) -> float:
+        """Caller holds self.lock."""
+        ordered = text.split("\n")
+        new_lines = Counter(ordered)
+
+        for line, n in (new_lines - self.lines).items():
+            self._apply_line(line, n)
+        for line, n in (self.lines - new_lines).items():
+            self._apply_line(line, -n)
+            if line not in new_lines:
+                self.line_tokens.pop(line, None)
+
+        self.lines = new_lines
+        self.text = text
+        self.index.set_text(self._normalized(text, ordered), text, skills=set(self.skills))
+        self.weight = self.approx_bytes()
+        return self._score()
+
+    def update(self, latex_body: str) -> float:
+        """Replace the resume text and return the new ATS score."""
+        with self.lock:
+            return self._update(latex_service.strip_code_fences(latex_body))
+
+    def apply_edits(self, edits) -> float:
+        """
+        Apply [{"start", "end", "text"}] splices to the current text, in
+        order, then rescore. Raises ValueError for a malformed edit or one
+        whose range falls outside the text it applies to; nothing is changed
+        in that case.
+        """
+        if not isinstance(edits, list):
+            raise ValueError("edits must be a list of {start, end, text} objects.")
+        with self.lock:
+            text = self.text
+            for i, edit in enumerate(edits):
+                if not isinstance(edit, dict):
+                    raise ValueError(f"edit {i} must be an object.")
+                start, end, insert = edit.get("start"), edit.get("end"), edit.get("text", "")
+                if type(start) is not int or type(end) is not int:
+                    raise ValueError(f"edit {i}: start and end must be integers.")
+                if not isinstance(insert, str):
+                    raise ValueError(f"edit {i}: text must be a string.")
+                if not 0 <= start <= end <= len(text):
+                    raise ValueError(f"edit {i}: range {start}..{end} is outside the text (length {len(text)}).")
+                text = text[:start] + insert + text[end:]
+            return self._update(text)
+
+    # -------------------- scoring --------------------
+
+    def _semantic(self) -> float:
+        dot = jd_sq_shared = res_sq_shared = 0
+        for term, jd_count in self.jd_terms.items():
+            res_count = self.terms.get(term)
+            if res_count:
+                dot += jd_count * res_count
+                jd_sq_shared += jd_count * jd_count
+                res_sq_shared += res_count * res_count
+        if not dot:
+            return 0.0
+
+        k2 = _IDF_ONE_DOC * _IDF_ONE_DOC
+        jd_norm = math.sqrt(jd_sq_shared + k2 * (self.jd_sq_total - jd_sq_shared))
+        res_norm = math.sqrt(res_sq_shared + k2 * (self.res_sq_total - res_sq_shared))
+        return dot / (jd_norm * res_norm)
+
+    def _score(self) -> float:
+        kw_score = keyword_match_score(self.keywords, self.text, index=self.index)
+        return combine_scores(kw_score, self._semantic())
+
+    def approx_bytes(self) -> int:
+        """
+        Rough memory footprint used to enforce the session store's cap.
+        Walks line_tokens, so callers hold self.lock; the store reads the
+        `weight` snapshot instead.
+        """
+        per_line = sum(
+            # line key (in self.lines too) + normalized copy, then Counter/list/set entries
+            200 + 6 * len(line) + 120 * (len(terms) + len(tokens) + len(skills))
+            for line, (terms, tokens, _, skills) in self.line_tokens.items()
+        )
+        return (4 * len(self.text) + per_line
+                + 120 * (len(self.terms) + len(self.skills) + len(self.index.tokens) + len(self.jd_terms)))
+
+
+# -------------------- session store --------------------
+
+sessions = TTLCache(
+    max_entries=Config.SCORE_SESSION_MAX,
+    ttl=Config.SCORE_SESSION_TTL,
+    max_weight=Config.SCORE_SESSION_MAX_MB * 1024 * 1024,
+    weigher=lambda session: session.weight,
+)
+
+
+def create_session(job_description: str, keywords) -> tuple[str, ScoringSession]:
+    session_id = uuid.uuid4().hex
+    session = ScoringSession(job_description, keywords)
+    sessions.set(session_id, session)
+    return session_id, session
+
+
+def get_session(session_id: str) -> ScoringSession | None:
+    return sessions.get(session_id)
+
+
+def save_session(session_id: str, session: ScoringSession):
+    """
+    Re-store after an update: refreshes the TTL and re-weighs memory use
+    from the weight the update recorded, without taking the session's lock.
+    """
+    sessions.set(session_id, session)
+
+
+def delete_session(session_id: str):
+    sessions.pop(session_id)
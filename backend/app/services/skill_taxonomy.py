@@ -0,0 +1,170 @@
+import json
+import os
+import re
+from collections import deque
+
+DEFAULT_TAXONOMY_PATH = os.path.join(os.path.dirname(os.path.dirname(__file__)), "data", "skill_taxonomy.json")
+
+# Skill-sized tokens: keeps c++ / c# whole, splits node.js, ci/cd, a/b, hyper-v
+TOKEN_RE = re.compile(r"[A-Za-z0-9+#]+")
+
+
+def tokenize(text: str) -> list:
+    return TOKEN_RE.findall(text)
+
+
+def load_taxonomy(path: str | None = None) -> list:
+    """
+    Taxonomy entries from a JSON file: a list of
+    {"name", "category", "aliases": [...], "exact": [...]}.
+    `name` and `aliases` match case-insensitively; terms in `exact` match
+    only with that capitalization (for skills that are also plain words,
+    e.g. "Swift", "Excel"). A name listed in `exact` is only matched exactly.
+    """
+    with open(path or DEFAULT_TAXONOMY_PATH, encoding="utf-8") as f:
+        entries = json.load(f)
+    for entry in entries:
+        if not entry.get("name"):
+            raise ValueError(f"Taxonomy entry without a name: {entry!r}")
+    return entries
+
+
+class SkillMatch:
+    """One skill mention: canonical name, category and character span in the text."""
+
+    def __init__(self, name: str, category: str, start: int, end: int):
+        self.name = name
+        self.category = category
+        self.start = start
+        self.end = end
+
+    def __repr__(self):
+        return f"SkillMatch({self.name!r}, {self.start}, {self.end})"
+
+
+class SkillMatcher:
+    """
+    Aho-Corasick automaton over token sequences for every skill name and
+    alias in a taxonomy.
+
+    A text is tokenized once and scanned in a single pass, so the cost is
+    linear in the text length and independent of how many skills the
+    taxonomy holds. Multi-word skills ("machine learning") match as one
+    unit. Overlapping mentions resolve leftmost-longest, so "spring boot"
+    is one skill, not "Spring" plus noise.
+    """
+
+    def __init__(self, entries):
+        self._goto = [{}]          # state -> {lowercase token: next state}
+        self._fail = [0]
+        self._out = [[]]           # state -> pattern ids ending here (incl. via fail links)
+        self._patterns = []        # id -> (canonical name, token count, exact tokens or None)
+        self._terms = {}           # lowercase token tuple -> canonical (case-insensitive terms)
+        self._exact_terms = {}     # token tuple -> canonical (exact-case terms)
+        self.categories = {}       # canonical -> category
+
+        for entry in entries:
+            name = entry["name"]
+            self.categories[name] = entry.get("category", "")
+            exact = entry.get("exact", [])
+            for term in [name, *entry.get("aliases", [])]:
+                if term not in exact:
+                    self._add(term, name, exact=False)
+            for term in exact:
+                self._add(term, name, exact=True)
+        self._build_fail_links()
+
+    def __len__(self):
+        return len(self._patterns)
+
+    def _add(self, term: str, name: str, exact: bool):
+        tokens = tuple(tokenize(term))
+        if not tokens:
+            return
+        lowered = tuple(t.lower() for t in tokens)
+        index = self._exact_terms if exact else self._terms
+        key = tokens if exact else lowered
+        if key in index:
+            return  # first entry to claim a term keeps it
+        index[key] = name
+
+        state = 0
+        for token in lowered:
+            nxt = self._goto[state].get(token)
+            if nxt is None:
+                nxt = len(self._goto)
+                self._goto[state][token] = nxt
+                self._goto.append({})
+                self._fail.append(0)
+                self._out.append([])
+            state = nxt
+        self._out[state].append(len(self._patterns))
+        self._patterns.append((name, len(tokens), tokens if exact else None))
+
+    def _build_fail_links(self):
+        queue = deque(self._goto[0].values())
+        while queue:
+            state = queue.popleft()
+            for token, nxt in self._goto[state].items():
+                queue.append(nxt)
+                fail = self._fail[state]
+                while fail and token not in self._goto[fail]:
+                    fail = self._fail[fail]
+                target = self._goto[fail].get(token, 0)
+                self._fail[nxt] = target if target != nxt else 0
+                self._out[nxt] = self._out[nxt] + self._out[self._fail[nxt]]
+
+    # -------------------- scanning --------------------
+
+    def find(self, text: str) -> list:
+        """Non-overlapping skill mentions in text order (leftmost-longest)."""
+        spans = [(m.start(), m.end(), m.group()) for m in TOKEN_RE.finditer(text)]
+        longest = {}   # start token -> (end token, pattern id)
+        state = 0
+        goto, fail, out, patterns = self._goto, self._fail, self._out, self._patterns
+
+        for i, (_, _, token) in enumerate(spans):
+            token = token.lower()
+            while state and token not in goto[state]:
+                state = fail[state]
+            state = goto[state].get(token, 0)
+            for pid in out[state]:
+                _, length, exact = patterns[pid]
+                start = i - length + 1
+                if exact is not None and tuple(s[2] for s in spans[start:i + 1]) != exact:
+                    continue
+                best = longest.get(start)
+                if best is None or best[0] < i:
+                    longest[start] = (i, pid)
+
+        matches = []
+        i = 0
+        while i < len(spans):
+            hit = longest.get(i)
+            if hit is None:
+                i += 1
+                continue
+            end, pid = hit
+            name = patterns[pid][0]
+            matches.append(SkillMatch(name, self.categories[name], spans[i][0], spans[end][1]))
+            i = end + 1
+        return matches
+
+    def count_skills(self, text: str) -> dict:
+        """canonical name -> mentions, in order of first mention."""
+        counts = {}
+        for match in self.find(text):
+            counts[match.name] = counts.get(match.name, 0) + 1
+        return counts
+
+    def canonical(self, term: str) -> str | None:
+        """Canonical skill name for a term (name or alias), or None if it isn't a known skill."""
+        tokens = tuple(tokenize(term))
+        return self._exact_terms.get(tokens) or self._terms.get(tuple(t.lower() for t in tokens))
+
+    def stats(self) -> dict:
+        return {"skills": len(self.categories), "patterns": len(self._patterns), "states": len(self._goto)}
+
+
+def build_matcher(path: str | None = None) -> SkillMatcher:
+    return SkillMatcher(load_taxonomy(path))
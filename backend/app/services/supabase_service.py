@@ -0,0 +1,174 @@
+import asyncio
+import httpx
+from app.config import Config
+
+# Statuses worth retrying: rate limiting and transient upstream failures
+RETRY_STATUSES = {429, 500, 502, 503, 504}
+
+
+class SupabaseClient:
+    """
+    Shared PostgREST client for Supabase tables (resumes, experiences,
+    projects, resume_templates).
+
+    One pooled keep-alive httpx.AsyncClient is reused by every request.
+    Idempotent calls are retried with exponential backoff on 5xx/429 and
+    transport errors; inserts are only retried when the server certainly
+    did not process them (429, 503, connection failures).
+    """
+
+    def __init__(
+        self,
+        base_url: str,
+        api_key: str,
+        pool_size: int = 20,
+        keepalive: int = 10,
+        timeout: float = 10.0,
+        connect_timeout: float = 5.0,
+        max_retries: int = 3,
+        backoff: float = 0.25,
+        transport: httpx.AsyncBaseTransport | None = None,
+    ):
+        self.pool_size = pool_size
+        self.keepalive = keepalive
+        self.max_retries = max_retries
+        self.backoff = backoff
+        self._client = httpx.AsyncClient(
+            base_url=f"{(base_url or '').rstrip('/')}/rest/v1",
+            headers={
+                "apikey": api_key or "",
+                "Authorization": f"Bearer {api_key or ''}",
+                "Content-Type": "application/json",
+            },
+            limits=httpx.Limits(max_connections=pool_size, max_keepalive_connections=keepalive),
+            timeout=httpx.Timeout(timeout, connect=connect_timeout),
+            transport=transport,
+        )
+        self._stats = {
+            "requests": 0,
+            "retries": 0,
+            "failures": 0,
+            "in_flight": 0,
+            "peak_in_flight": 0,
+        }
+
+    # -------------------- core request --------------------
+
+    async def request(self, method: str, table: str, params=None, json=None, prefer=None) -> httpx.Response:
+        headers = {"Prefer": prefer} if prefer else None
+        idempotent = method != "POST"
+        attempt = 0
+
+        self._stats["requests"] += 1
+        self._stats["in_flight"] += 1
+        self._stats["peak_in_flight"] = max(self._stats["peak_in_flight"], self._stats["in_flight"])
+        try:
+            while True:
+                try:
+                    response = await self._client.request(
+                        method, f"/{table}", params=params, json=json, headers=headers
+                    )
+                except httpx.TransportError as e:
+                    retryable = idempotent or isinstance(e, httpx.ConnectError)
+                    if not retryable or attempt >= self.max_retries:
+                        self._stats["failures"] += 1
+                        raise
+                    delay = self.backoff * (2 ** attempt)
+                else:
+                    retryable = response.status_code in RETRY_STATUSES and (
+                        idempotent or response.status_code in (429, 503)
+                    )
+                    if not retryable or attempt >= self.max_retries:
+                        if response.status_code >= 400:
+                            self._stats["failures"] += 1
+                        return response
+                    delay = _retry_after(response) or self.backoff * (2 ** attempt)
+
+                attempt += 1
+                self._stats["retries"] += 1
+                await asyncio.sleep(delay)
+        finally:
+            self._stats["in_flight"] -= 1
+
+    # -------------------- table helpers --------------------
+
+    async def select(self, table: str, params=None) -> httpx.Response:
+        return await self.request("GET", table, params=params)
+
+    async def insert(self, table: str, payload: dict) -> httpx.Response:
+        return await self.request("POST", table, json=payload)
+
+    async def update(self, table: str, params, payload: dict) -> httpx.Response:
+        return await self.request("PATCH", table, params=params, json=payload)
+
+    async def delete(self, table: str, params) -> httpx.Response:
+        return await self.request("DELETE", table, params=params)
+
+    async def fetch_user_rows(self, table: str, user_id: str) -> list:
+        """Fetch a user's rows from a table; empty list on failure."""
+        res = await self.select(table, {"user_id": f"eq.{user_id}"})
+        if res.status_code == 200:
+            return res.json()
+        return []
+
+    # -------------------- lifecycle / stats --------------------
+
+    def stats(self) -> dict:
+        return {
+            **self._stats,
+            "pool_size": self.pool_size,
+            "keepalive": self.keepalive,
+        }
+
+    async def aclose(self):
+        await self._client.aclose()
+
+
+def _retry_after(response: httpx.Response):
+    value = response.headers.get("retry-after")
+    try:
+        return min(float(value), 10.0) if value else None
+    except ValueError:
+        return None
+
+
+# -------------------- app-wide instance --------------------
+
+_client: SupabaseClient | None = None
+
+
+def create_client(transport: httpx.AsyncBaseTransport | None = None) -> SupabaseClient:
+    return SupabaseClient(
+        Config.SUPABASE_URL,
+        Config.SUPABASE_SERVICE_ROLE_KEY,  # backend-only key
+        pool_size=Config.SUPABASE_POOL_SIZE,
+        keepalive=Config.SUPABASE_KEEPALIVE,
+        timeout=Config.SUPABASE_TIMEOUT,
+        connect_timeout=Config.SUPABASE_CONNECT_TIMEOUT,
+        max_retries=Config.SUPABASE_MAX_RETRIES,
+        backoff=Config.SUPABASE_RETRY_BACKOFF,
+        transport=transport,
+    )
+
+
+async def startup():
+    """Open the shared client (called from the app lifespan)."""
+    global _client
+    if _client is None:
+        _client = create_client()
+
+
+async def shutdown():
+    """Close pooled connections (called from the app lifespan)."""
+    global _client
+    if _client is not None:
+        await _client.aclose()
+        _client = None
+
+
+def get_supabase() -> SupabaseClient:
+    """FastAPI dependency returning the shared client."""
+    global _client
+    if _client is None:
+        _client = create_client()
+    return _client
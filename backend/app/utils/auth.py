@@ -1,12 +1,31 @@
+import hashlib
+import time
 from jose import jwt
-from fastapi import HTTPException, Depends
+from fastapi import HTTPException, Depends, Request
 from fastapi.security import HTTPBearer
 from app.config import Config
+from app.utils.cache import TTLCache
 
 auth_scheme = HTTPBearer()
 
+# Verified claims keyed by token digest. Valid tokens expire from the cache at
+# their `exp`; invalid ones are remembered briefly so retries don't re-decode.
+jwt_cache = TTLCache(max_entries=Config.JWT_CACHE_SIZE, ttl=Config.JWT_CACHE_MAX_TTL)
+
+_INVALID = object()
+
+
+def token_digest(token: str) -> str:
+    return hashlib.sha256(token.encode("utf-8")).hexdigest()
+
+
 def verify_jwt(token: str):
-    print("DEBUG: Using LEGACY Supabase HS256 JWT verification")
+    key = token_digest(token)
+    cached = jwt_cache.get(key)
+    if cached is _INVALID:
+        raise HTTPException(status_code=401, detail="Invalid or expired JWT")
+    if cached is not None:
+        return dict(cached)
 
     try:
         payload = jwt.decode(
@@ -18,17 +37,51 @@ def verify_jwt(token: str):
             }
         )
 
-        return payload
-
     except Exception as e:
         print("JWT DECODE ERROR:", e)
+        jwt_cache.set(key, _INVALID, ttl=Config.JWT_NEGATIVE_TTL)
         raise HTTPException(
             status_code=401,
             detail="Invalid or expired JWT"
         )
 
+    ttl = Config.JWT_CACHE_MAX_TTL
+    if isinstance(payload.get("exp"), (int, float)):
+        ttl = min(ttl, payload["exp"] - time.time())
+    if ttl > 0:
+        jwt_cache.set(key, payload, ttl=ttl)
+    return dict(payload)
+
+
+def bearer_token(request: Request) -> str | None:
+    """Token from an `Authorization: Bearer ...` header, None if absent."""
+    auth_header = request.headers.get("authorization")
+    if auth_header and auth_header.lower().startswith("bearer "):
+        return auth_header.split(" ", 1)[1].strip()
+    return None
+
 
 async def get_current_user(token=Depends(auth_scheme)):
     credentials = token.credentials
     payload = verify_jwt(credentials)
     return payload
+
+
+async def get_optional_user(request: Request):
+    """
+    Optional auth: verified claims for the request's bearer token, None for
+    guests and invalid tokens. Decoded once per request (memoized on
+    request.state), so route helpers can call it again for free.
+    """
+    if hasattr(request.state, "auth_claims"):
+        return request.state.auth_claims
+
+    claims = None
+    token = bearer_token(request)
+    if token:
+        try:
+            claims = verify_jwt(token)
+        except HTTPException:
+            print("JWT invalid or failed to verify, treating as guest.")
+    request.state.auth_claims = claims
+    return claims
@@ -0,0 +1,73 @@
+import json
+
+
+class BodyTooLarge(Exception):
+    pass
+
+
+class BodyLimitMiddleware:
+    """
+    ASGI middleware that caps request bodies before any route (or the
+    multipart parser) reads them. A Content-Length over `max_bytes` is
+    answered with 413 without reading the body; otherwise the body is
+    counted as it streams in and the request is cut off with 413 as soon
+    as it passes `max_bytes`, so chunked uploads can't get around it.
+    """
+
+    def __init__(self, app, max_bytes: int):
+        self.app = app
+        self.max_bytes = max_bytes
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            return await self.app(scope, receive, send)
+
+        declared = dict(scope.get("headers", [])).get(b"content-length")
+        if declared is not None and declared.isdigit() and int(declared) > self.max_bytes:
+            return await self.reject(send)
+
+        received = 0
+        exceeded = False
+        started = False
+
+        async def receive_limited():
+            nonlocal received, exceeded
+            message = await receive()
+            if message["type"] == "http.request":
+                received += len(message.get("body", b""))
+                if received > self.max_bytes:
+                    exceeded = True
+                    raise BodyTooLarge()
+            return message
+
+        async def send_checked(message):
+            # Whatever the app made of the aborted body (FastAPI answers
+            # 400 for a form it couldn't parse), the client gets the 413
+            nonlocal started
+            if message["type"] == "http.response.start":
+                started = True
+                if exceeded:
+                    return await self.reject(send)
+            elif exceeded:
+                return
+            await send(message)
+
+        try:
+            await self.app(scope, receive_limited, send_checked)
+        except BodyTooLarge:
+            if not started:
+                await self.reject(send)
+
+    async def reject(self, send):
+        limit_mb = self.max_bytes / (1024 * 1024)
+        body = json.dumps({"detail": f"Request body exceeds the {limit_mb:g} MB limit."}).encode()
+        await send({
+            "type": "http.response.start",
+            "status": 413,
+            "headers": [
+                (b"content-type", b"application/json"),
+                (b"content-length", str(len(body)).encode()),
+                (b"connection", b"close"),
+            ],
+        })
+        await send({"type": "http.response.body", "body": body})
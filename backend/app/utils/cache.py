@@ -0,0 +1,282 @@
+import json
+import os
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+
+
+class TTLCache:
+    """
+    Thread-safe in-process LRU cache with a per-entry TTL.
+
+    Bounded by entry count and, optionally, by total weight (e.g. bytes)
+    computed with `weigher(value)`. Keeps hit/miss/eviction counters.
+    """
+
+    def __init__(self, max_entries: int = 1024, ttl: float = 3600, max_weight: int | None = None, weigher=None):
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self.max_weight = max_weight
+        self.weigher = weigher or (lambda value: 1)
+        self._data = OrderedDict()  # key -> (expires_at, weight, value)
+        self._weight = 0
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+
+    def get(self, key, default=None):
+        with self._lock:
+            entry = self._data.get(key)
+            if entry is None:
+                self.misses += 1
+                return default
+            expires_at, _, value = entry
+            if expires_at <= time.monotonic():
+                self._remove(key)
+                self.expirations += 1
+                self.misses += 1
+                return default
+            self._data.move_to_end(key)
+            self.hits += 1
+            return value
+
+    def set(self, key, value, ttl: float | None = None):
+        ttl = self.ttl if ttl is None else ttl
+        weight = self.weigher(value)
+        with self._lock:
+            if key in self._data:
+                self._remove(key)
+            if self.max_weight is not None and weight > self.max_weight:
+                return  # would evict everything else; don't cache it
+            self._data[key] = (time.monotonic() + ttl, weight, value)
+            self._weight += weight
+            while len(self._data) > self.max_entries or (
+                self.max_weight is not None and self._weight > self.max_weight
+            ):
+                oldest = next(iter(self._data))
+                self._remove(oldest)
+                self.evictions += 1
+
+    def ttl_remaining(self, key) -> float:
+        with self._lock:
+            entry = self._data.get(key)
+            return max(0.0, entry[0] - time.monotonic()) if entry else 0.0
+
+    def pop(self, key, default=None):
+        with self._lock:
+            entry = self._data.get(key)
+            if entry is None:
+                return default
+            self._remove(key)
+            return entry[2]
+
+    def clear(self):
+        with self._lock:
+            self._data.clear()
+            self._weight = 0
+
+    def _remove(self, key):
+        _, weight, _ = self._data.pop(key)
+        self._weight -= weight
+
+    def __len__(self):
+        return len(self._data)
+
+    def stats(self) -> dict:
+        return {
+            "entries": len(self._data),
+            "weight": self._weight,
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "expirations": self.expirations,
+        }
+
+
+class SQLiteCache:
+    """
+    Persistent key/value tier on local disk. Values are stored as JSON.
+
+    With `max_bytes`, the stored JSON is kept under that size by evicting
+    the least recently read entries first (LRU on `accessed_at`).
+    """
+
+    def __init__(self, path: str, table: str = "cache", max_bytes: int | None = None):
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        self.path = path
+        self.table = table
+        self.max_bytes = max_bytes
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        with self._lock, self._conn:
+            self._conn.execute(
+                f"CREATE TABLE IF NOT EXISTS {table} "
+                "(key TEXT PRIMARY KEY, value TEXT, expires_at REAL, size INTEGER DEFAULT 0, accessed_at REAL DEFAULT 0)"
+            )
+            # Tables created before size/accessed_at existed
+            columns = {row[1] for row in self._conn.execute(f"PRAGMA table_info({table})")}
+            for column, ddl in (("size", "INTEGER DEFAULT 0"), ("accessed_at", "REAL DEFAULT 0")):
+                if column not in columns:
+                    self._conn.execute(f"ALTER TABLE {table} ADD COLUMN {column} {ddl}")
+            self._conn.execute(f"CREATE INDEX IF NOT EXISTS {table}_accessed ON {table} (accessed_at)")
+            self._conn.execute(f"CREATE INDEX IF NOT EXISTS {table}_expires ON {table} (expires_at)")
+            # Running byte total kept by triggers: every process sharing the
+            # file sees the same figure, and eviction needn't re-sum the table
+            self._conn.execute(
+                f"CREATE TABLE IF NOT EXISTS {table}_size (id INTEGER PRIMARY KEY CHECK (id = 0), total INTEGER NOT NULL)"
+            )
+            self._conn.execute(
+                f"INSERT OR IGNORE INTO {table}_size VALUES (0, (SELECT COALESCE(SUM(size), 0) FROM {table}))"
+            )
+            for name, event, delta in (
+                ("insert", "INSERT", "NEW.size"),
+                ("delete", "DELETE", "-OLD.size"),
+                ("resize", "UPDATE OF size", "NEW.size - OLD.size"),
+            ):
+                self._conn.execute(
+                    f"CREATE TRIGGER IF NOT EXISTS {table}_size_{name} AFTER {event} ON {table} "
+                    f"BEGIN UPDATE {table}_size SET total = total + {delta} WHERE id = 0; END"
+                )
+        self.hits = 0
+        self.misses = 0
+        self.expirations = 0
+        self.evictions = 0
+
+    def get(self, key, default=None):
+        with self._lock:
+            row = self._conn.execute(
+                f"SELECT value, expires_at FROM {self.table} WHERE key = ?", (key,)
+            ).fetchone()
+            if row is None:
+                self.misses += 1
+                return default
+            value, expires_at = row
+            now = time.time()
+            if expires_at <= now:
+                with self._conn:
+                    self._conn.execute(f"DELETE FROM {self.table} WHERE key = ?", (key,))
+                self.expirations += 1
+                self.misses += 1
+                return default
+            if self.max_bytes is not None:
+                with self._conn:
+                    self._conn.execute(f"UPDATE {self.table} SET accessed_at = ? WHERE key = ?", (now, key))
+            self.hits += 1
+            return json.loads(value)
+
+    def ttl_remaining(self, key) -> float:
+        with self._lock:
+            row = self._conn.execute(
+                f"SELECT expires_at FROM {self.table} WHERE key = ?", (key,)
+            ).fetchone()
+        return max(0.0, row[0] - time.time()) if row else 0.0
+
+    def set(self, key, value, ttl: float):
+        data = json.dumps(value)
+        size = len(data.encode("utf-8"))
+        if self.max_bytes is not None and size > self.max_bytes:
+            return  # would evict everything else; don't store it
+        now = time.time()
+        with self._lock, self._conn:
+            # An upsert, not INSERT OR REPLACE: REPLACE's implicit delete skips the size triggers
+            self._conn.execute(
+                f"INSERT INTO {self.table} (key, value, expires_at, size, accessed_at) VALUES (?, ?, ?, ?, ?) "
+                "ON CONFLICT(key) DO UPDATE SET value = excluded.value, expires_at = excluded.expires_at, "
+                "size = excluded.size, accessed_at = excluded.accessed_at",
+                (key, data, now + ttl, size, now),
+            )
+            if self.max_bytes is not None:
+                self._evict(now)
+
+    def _total(self) -> int:
+        return self._conn.execute(f"SELECT total FROM {self.table}_size WHERE id = 0").fetchone()[0]
+
+    def _evict(self, now: float):
+        # Caller holds the lock and an open transaction
+        if self._total() <= self.max_bytes:
+            return
+        self._conn.execute(f"DELETE FROM {self.table} WHERE expires_at <= ?", (now,))
+        total = self._total()
+        if total <= self.max_bytes:
+            return
+        doomed = []
+        for key, size in self._conn.execute(f"SELECT key, size FROM {self.table} ORDER BY accessed_at"):
+            if total <= self.max_bytes:
+                break
+            doomed.append((key,))
+            total -= size
+        self._conn.executemany(f"DELETE FROM {self.table} WHERE key = ?", doomed)
+        self.evictions += len(doomed)
+
+    def pop(self, key):
+        with self._lock, self._conn:
+            self._conn.execute(f"DELETE FROM {self.table} WHERE key = ?", (key,))
+
+    def clear(self):
+        with self._lock, self._conn:
+            self._conn.execute(f"DELETE FROM {self.table}")
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
+
+    def stats(self) -> dict:
+        with self._lock:
+            (entries,) = self._conn.execute(f"SELECT COUNT(*) FROM {self.table}").fetchone()
+            size = self._total()
+        return {
+            "entries": entries,
+            "bytes": size,
+            "max_bytes": self.max_bytes,
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "expirations": self.expirations,
+        }
+
+
+class TieredCache:
+    """In-process TTLCache in front of an optional persistent SQLiteCache."""
+
+    def __init__(self, memory: TTLCache, persistent: SQLiteCache | None = None):
+        self.memory = memory
+        self.persistent = persistent
+
+    def get(self, key, default=None):
+        value = self.memory.get(key)
+        if value is not None:
+            return value
+        if self.persistent is not None:
+            value = self.persistent.get(key)
+            if value is not None:
+                # Promote to memory for whatever lifetime it has left
+                self.memory.set(key, value, ttl=self.persistent.ttl_remaining(key))
+                return value
+        return default
+
+    def set(self, key, value, ttl: float | None = None):
+        ttl = self.memory.ttl if ttl is None else ttl
+        self.memory.set(key, value, ttl=ttl)
+        if self.persistent is not None:
+            self.persistent.set(key, value, ttl=ttl)
+
+    def pop(self, key):
+        self.memory.pop(key)
+        if self.persistent is not None:
+            self.persistent.pop(key)
+
+    def clear(self):
+        self.memory.clear()
+        if self.persistent is not None:
+            self.persistent.clear()
+
+    def stats(self) -> dict:
+        out = {"memory": self.memory.stats()}
+        if self.persistent is not None:
+            out["persistent"] = self.persistent.stats()
+        return out
@@ -0,0 +1,171 @@
+import threading
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+
+# Seconds; rewrites and Gemini calls need the long tail
+DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30, 60, 120)
+
+
+def _escape(value) -> str:
+    return str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+class Histogram:
+    """Cumulative-bucket histogram with one label, rendered in Prometheus text format."""
+
+    def __init__(self, name: str, help: str, label: str, buckets=DEFAULT_BUCKETS):
+        self.name = name
+        self.help = help
+        self.label = label
+        self.buckets = tuple(buckets)
+        self._series = {}   # label value -> [bucket counts..., count, sum]
+        self._lock = threading.Lock()
+
+    def observe(self, label_value: str, seconds: float):
+        with self._lock:
+            series = self._series.get(label_value)
+            if series is None:
+                series = self._series[label_value] = [0] * len(self.buckets) + [0, 0.0]
+            for i, bound in enumerate(self.buckets):
+                if seconds <= bound:
+                    series[i] += 1
+            series[-2] += 1
+            series[-1] += seconds
+
+    def snapshot(self) -> dict:
+        """label value -> {"count", "sum"} (for tests and JSON views)."""
+        with self._lock:
+            return {k: {"count": s[-2], "sum": s[-1]} for k, s in self._series.items()}
+
+    def render(self) -> list:
+        lines = [f"# HELP {self.name} {self.help}", f"# TYPE {self.name} histogram"]
+        with self._lock:
+            for value, series in sorted(self._series.items()):
+                label = f'{self.label}="{_escape(value)}"'
+                for bound, count in zip(self.buckets, series):
+                    lines.append(f'{self.name}_bucket{{{label},le="{bound:g}"}} {count}')
+                lines.append(f'{self.name}_bucket{{{label},le="+Inf"}} {series[-2]}')
+                lines.append(f"{self.name}_sum{{{label}}} {series[-1]:.6f}")
+                lines.append(f"{self.name}_count{{{label}}} {series[-2]}")
+        return lines
+
+
+class Counter:
+    """Monotonic counter with one label."""
+
+    def __init__(self, name: str, help: str, label: str):
+        self.name = name
+        self.help = help
+        self.label = label
+        self._values = {}
+        self._lock = threading.Lock()
+
+    def inc(self, label_value: str, amount: float = 1):
+        with self._lock:
+            self._values[label_value] = self._values.get(label_value, 0) + amount
+
+    def get(self, label_value: str) -> float:
+        with self._lock:
+            return self._values.get(label_value, 0)
+
+    def render(self) -> list:
+        lines = [f"# HELP {self.name} {self.help}", f"# TYPE {self.name} counter"]
+        with self._lock:
+            for value, total in sorted(self._values.items()):
+                lines.append(f'{self.name}{{{self.label}="{_escape(value)}"}} {total:g}')
+        return lines
+
+
+def render_samples(name: str, help: str, kind: str, label: str, samples: dict) -> list:
+    """Text-format lines for values collected at scrape time (e.g. cache stats)."""
+    lines = [f"# HELP {name} {help}", f"# TYPE {name} {kind}"]
+    for value, sample in sorted(samples.items()):
+        lines.append(f'{name}{{{label}="{_escape(value)}"}} {sample:g}')
+    return lines
+
+
+stage_seconds = Histogram(
+    "resumatch_stage_seconds",
+    "Time spent in each request pipeline stage.",
+    "stage",
+)
+keyword_fallbacks = Counter(
+    "resumatch_keyword_fallbacks_total",
+    "Keyword extractions answered by the local TF-IDF/spaCy path instead of Gemini.",
+    "reason",
+)
+
+
+# -------------------- per-request timings --------------------
+
+# Stages recorded during the current request, for the Server-Timing header.
+# The list is shared by reference, so threads started with asyncio.to_thread
+# (which copy the context) append to the same request's list.
+_request_timings: ContextVar[list | None] = ContextVar("request_timings", default=None)
+
+
+@contextmanager
+def timed(stage: str):
+    """Record the duration of a block in the stage histogram and the current request."""
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        elapsed = time.perf_counter() - start
+        stage_seconds.observe(stage, elapsed)
+        timings = _request_timings.get()
+        if timings is not None:
+            timings.append((stage, elapsed))
+
+
+@contextmanager
+def recording(timings: list):
+    """Collect the `timed()` stages of the enclosed code (and tasks it starts) into `timings`."""
+    token = _request_timings.set(timings)
+    try:
+        yield timings
+    finally:
+        _request_timings.reset(token)
+
+
+def server_timing(timings, total: float | None = None) -> str:
+    """Server-Timing header value, e.g. `parse;dur=12.3, rewrite;dur=8021.0`."""
+    parts = [f"{stage};dur={seconds * 1000:.1f}" for stage, seconds in timings]
+    if total is not None:
+        parts.append(f"total;dur={total * 1000:.1f}")
+    return ", ".join(parts)
+
+
+class ServerTimingMiddleware:
+    """
+    ASGI middleware that collects `timed()` stages per request and sends
+    them in a Server-Timing header. Headers go out with the first byte of
+    the response, so a streamed response only reports stages finished
+    before streaming began.
+    """
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            return await self.app(scope, receive, send)
+
+        timings = []
+        start = time.perf_counter()
+
+        async def send_with_timing(message):
+            if message["type"] == "http.response.start":
+                header = server_timing(timings, total=time.perf_counter() - start)
+                message = {**message, "headers": [*message.get("headers", []), (b"server-timing", header.encode())]}
+            await send(message)
+
+        with recording(timings):
+            await self.app(scope, receive, send_with_timing)
+
+
+async def timed_await(stage: str, awaitable):
+    """`await awaitable` as a timed stage; lets concurrent stages be timed separately."""
+    with timed(stage):
+        return await awaitable
@@ -0,0 +1,66 @@
+import asyncio
+import hashlib
+
+
+def flight_key(*parts) -> str:
+    """sha256 over every input that shapes an upstream call (model, prompt, ...)."""
+    h = hashlib.sha256()
+    for part in parts:
+        h.update(str(part).encode("utf-8"))
+        h.update(b"\0")
+    return h.hexdigest()
+
+
+class SingleFlight:
+    """
+    Coalesces identical in-flight async calls.
+
+    The first caller for a key starts the upstream call as its own task;
+    callers arriving with the same key while it runs await that task and
+    get the same result (or exception). Nothing is kept once it finishes,
+    so this is not a cache. A caller that is cancelled (e.g. the client
+    disconnected) does not cancel the shared call for the others.
+    """
+
+    def __init__(self):
+        self._flights = {}   # key -> asyncio.Task
+        self.calls = 0
+        self.upstream_calls = 0
+        self.coalesced = 0
+        self.max_waiters = 0
+        self._waiters = {}   # key -> callers currently sharing the flight
+
+    async def do(self, key: str, fn, *args, **kwargs):
+        """Return `await fn(*args, **kwargs)`, sharing one call per key."""
+        self.calls += 1
+        task = self._flights.get(key)
+        if task is None:
+            self.upstream_calls += 1
+            task = asyncio.ensure_future(fn(*args, **kwargs))
+            self._flights[key] = task
+            self._waiters[key] = 0
+            task.add_done_callback(lambda task, key=key: self._finish(key, task))
+        else:
+            self.coalesced += 1
+        self._waiters[key] += 1
+        self.max_waiters = max(self.max_waiters, self._waiters[key])
+        return await asyncio.shield(task)
+
+    def _finish(self, key, task):
+        self._flights.pop(key, None)
+        self._waiters.pop(key, None)
+        if not task.cancelled():
+            task.exception()  # mark retrieved even if every caller went away
+
+    def stats(self) -> dict:
+        return {
+            "calls": self.calls,
+            "upstream_calls": self.upstream_calls,
+            "coalesced": self.coalesced,
+            "in_flight": len(self._flights),
+            "max_waiters": self.max_waiters,
+        }
+
+
+# Shared by every Gemini call site (keyword extraction, rewrites)
+gemini_flights = SingleFlight()
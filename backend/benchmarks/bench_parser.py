@@ -0,0 +1,114 @@
+"""
+Resume parsing + rendering throughput on large resumes.
+
+Compares the previous regex pipeline (alternation regex rebuilt per call
+with a lazy re.S scan, per-line re.match/re.sub, nine str.replace passes
+per escape) against resume_parser.parse_resume + latex_service rendering.
+
+Usage (from backend/):
+    python benchmarks/bench_parser.py
+    python benchmarks/bench_parser.py --entries 10 100 1000 --repeat 20
+"""
+import argparse
+import json
+import os
+import re
+import sys
+import timeit
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app.services import latex_service
+from app.services.resume_parser import SECTION_HEADERS, parse_resume
+
+# ---------- previous implementation, kept as the baseline
+
+
+def legacy_escape(s):
+    if not s:
+        return ""
+    s = s.replace("\\", r"\\").replace("&", r"\&").replace("%", r"\%")
+    s = s.replace("$", r"\$").replace("#", r"\#").replace("_", r"\_")
+    s = s.replace("{", r"\{").replace("}", r"\}").replace("~", r"\textasciitilde{}")
+    s = s.replace("^", r"\textasciicircum{}")
+    return s
+
+
+def legacy_items(block):
+    lines = [l.strip() for l in block.splitlines()]
+    bullets, out = [], []
+    for l in lines:
+        if re.match(r"^(\-|\*|•)\s+", l):
+            bullets.append(re.sub(r"^(\-|\*|•)\s+", "", l))
+        elif l:
+            if bullets:
+                out.append(r"\resumeItemListStart")
+                out.extend(rf"\resumeItem{{{legacy_escape(b)}}}" for b in bullets)
+                out.append(r"\resumeItemListEnd")
+                bullets = []
+            out.append(legacy_escape(l))
+    if bullets:
+        out.append(r"\resumeItemListStart")
+        out.extend(rf"\resumeItem{{{legacy_escape(b)}}}" for b in bullets)
+        out.append(r"\resumeItemListEnd")
+    return "\n".join(out) if out else legacy_escape(block.strip())
+
+
+def legacy_sections(text):
+    sections = {}
+    pattern = rf"({'|'.join(SECTION_HEADERS)})(.*?)(?=(?:{'|'.join(SECTION_HEADERS)}|$))"
+    for m in re.finditer(pattern, text, re.I | re.S):
+        sections[m.group(1).strip().title()] = re.sub(r"\n{2,}", "\n", m.group(2)).strip()
+    return sections
+
+
+def legacy_render(text):
+    sections = legacy_sections(text)
+    return [legacy_items(sections.get(name, "")) for name in ("Education", "Experience", "Projects")]
+
+
+def new_render(text):
+    doc = parse_resume(text)
+    return [latex_service.render_section(doc.section(name)) for name in ("Education", "Experience", "Projects")]
+
+
+# ---------- workload
+
+
+def make_resume(entries: int) -> str:
+    lines = ["Jordan Doe", "jordan@example.com | +1 555 000 1111", "Education", "BSc Computer Science, State U"]
+    lines.append("Experience")
+    for i in range(entries):
+        lines.append(f"Engineer {i}, Company {i} (2019 - 2023)")
+        lines += [f"- Built service {i}.{j} cutting p95 latency by {j * 7}% for 2M users" for j in range(4)]
+    lines.append("Projects")
+    for i in range(entries // 2):
+        lines.append(f"Tool {i} | Python, Docker")
+        lines += [f"* Shipped feature {i}.{j} with 100% test coverage" for j in range(3)]
+    return "\n".join(lines)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--entries", type=int, nargs="+", default=[10, 100, 1000])
+    parser.add_argument("--repeat", type=int, default=20)
+    args = parser.parse_args()
+
+    for entries in args.entries:
+        text = make_resume(entries)
+        assert new_render(text) == legacy_render(text)
+        legacy_s = timeit.timeit(lambda: legacy_render(text), number=args.repeat) / args.repeat
+        new_s = timeit.timeit(lambda: new_render(text), number=args.repeat) / args.repeat
+        print(json.dumps({
+            "entries": entries,
+            "resume_kb": round(len(text) / 1024, 1),
+            "legacy_ms": round(legacy_s * 1e3, 3),
+            "parser_ms": round(new_s * 1e3, 3),
+            "legacy_mb_s": round(len(text) / legacy_s / 1e6, 2),
+            "parser_mb_s": round(len(text) / new_s / 1e6, 2),
+            "speedup": round(legacy_s / new_s, 2),
+        }))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,275 @@
+"""
+Micro-benchmarks for the service layer, on the synthetic corpus in
+benchmarks/corpus.py. Gemini and Supabase are replaced by in-process fakes,
+so only our own code is timed.
+
+Usage (from backend/):
+    python benchmarks/bench_services.py                          # print results
+    python benchmarks/bench_services.py --save benchmarks/baseline.json
+    python benchmarks/bench_services.py --compare benchmarks/baseline.json --threshold 0.25
+    python benchmarks/bench_services.py --filter score. --repeat 50
+
+--compare exits with status 1 when any case's median is more than
+`threshold` (fractional) slower than the baseline and by more than
+--min-delta-ms, so it can gate CI. Cases whose dependencies are missing
+(e.g. the spaCy model) are reported as skipped, not failed.
+"""
+import argparse
+import asyncio
+import contextlib
+import io
+import json
+import os
+import platform
+import statistics
+import subprocess
+import sys
+import time
+from types import SimpleNamespace
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, BACKEND_DIR)
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+import httpx
+
+import corpus
+from app.services import (
+    cpu_pool, keyword_service, latex_service, llm_client, model_registry, parsing_service,
+    profile_service, resume_parser, rewrite_service, score_service,
+)
+from app.services.llm_client import CircuitBreaker, LLMBackend, LLMClient
+from app.services.supabase_service import SupabaseClient
+from app.utils.singleflight import SingleFlight
+
+USER_TEMPLATE = r"""\documentclass{article}
+\begin{document}
+{NAME} \\ {CONTACT_LINE}
+\section{Education}{EDU}
+\section{Experience}{EXP}
+\section{Projects}{PROJ}
+\section{Skills}{SKILLS}
+\end{document}"""
+
+
+# -------------------- fakes --------------------
+
+class FakeGeminiBackend(LLMBackend):
+    """Answers instantly with a fixed skill list."""
+
+    model_name = "bench-fake"
+
+    async def generate(self, prompt):
+        return "Python, FastAPI, Docker, Kubernetes, PostgreSQL, Kafka, AWS"
+
+    async def stream(self, prompt):
+        yield await self.generate(prompt)
+
+
+def fake_supabase(rows: int) -> SupabaseClient:
+    experiences, projects = corpus.make_saved_entries(rows)
+    tables = {"experiences": experiences, "projects": projects}
+
+    def handler(request):
+        table = request.url.path.rsplit("/", 1)[-1]
+        return httpx.Response(200, json=tables.get(table, []))
+
+    return SupabaseClient("http://supabase.bench", "key", transport=httpx.MockTransport(handler))
+
+
+# Keyword slots for the fallback cases. The default 25 is fewer than the
+# taxonomy skills in the large JD (33), and extract_keywords_fallback returns
+# before spaCy once the taxonomy fills every slot. With more slots than any
+# corpus JD has skills, every size times the full taxonomy + spaCy path.
+FALLBACK_MAX_FEATURES = 64
+
+
+def upload(filename: str, data: bytes):
+    return SimpleNamespace(filename=filename, file=io.BytesIO(data), size=len(data))
+
+
+# -------------------- cases --------------------
+
+def build_cases():
+    """name -> zero-argument callable (each call is one timed iteration)."""
+    cases = {}
+    loop = asyncio.new_event_loop()
+    fake_llm = LLMClient(
+        FakeGeminiBackend(), rate=1e9, burst=10**9, concurrency=64, timeout=30,
+        breaker=CircuitBreaker(10**9, 1), flights=SingleFlight(),
+    )
+    keywords = ["Python", "FastAPI", "Docker", "Kubernetes", "PostgreSQL", "Kafka", "AWS", "leadership"]
+
+    for size in corpus.SIZES:
+        text = corpus.make_resume_text(size)
+        latex = corpus.make_resume_latex(size)
+        jd = corpus.make_job_description(size)
+        doc = resume_parser.parse_resume(text)
+        pdf = corpus.make_pdf(text)
+        docx = corpus.make_docx(text)
+
+        cases[f"parser.parse_resume.{size}"] = lambda text=text: resume_parser.parse_resume(text)
+        cases[f"latex.wrap_jake.{size}"] = lambda text=text: latex_service.wrap_in_jake_template(text)
+        cases[f"latex.wrap_user_template.{size}"] = (
+            lambda text=text: latex_service.wrap_in_template(text, USER_TEMPLATE, "bench")
+        )
+        cases[f"latex.render_parsed.{size}"] = lambda doc=doc: latex_service.wrap_in_jake_template(doc)
+        cases[f"score.keyword_match.{size}"] = (
+            lambda latex=latex: score_service.keyword_match_score(keywords, latex)
+        )
+        cases[f"score.ats.{size}"] = (
+            lambda jd=jd, latex=latex: score_service.compute_ats_score(jd, latex, keywords)
+        )
+        cases[f"keywords.fallback.{size}"] = (
+            lambda jd=jd: keyword_service.extract_keywords_fallback(jd, FALLBACK_MAX_FEATURES)
+        )
+        cases[f"keywords.fallback_batch.{size}"] = (
+            lambda jd=jd: keyword_service.extract_keywords_fallback_batch([jd] * 8, FALLBACK_MAX_FEATURES)
+        )
+        cases[f"keywords.taxonomy_scan.{size}"] = (
+            lambda jd=jd: model_registry.skill_matcher.get().find(jd)
+        )
+        cases[f"parsing.pdf.{size}"] = lambda pdf=pdf: parsing_service.extract_text_from_resume(upload("r.pdf", pdf))
+        cases[f"parsing.docx.{size}"] = lambda docx=docx: parsing_service.extract_text_from_resume(upload("r.docx", docx))
+
+        def keywords_fake_gemini(jd=jd):
+            keyword_service.keyword_cache.clear()
+            return loop.run_until_complete(keyword_service.extract_keywords_async(jd))
+        cases[f"keywords.async_fake_gemini.{size}"] = keywords_fake_gemini
+
+    experiences, projects = corpus.make_saved_entries(40)
+    latex = corpus.make_resume_latex("medium")
+    jd = corpus.make_job_description("large")
+    cases["rewrite.plan_prompt.40_saved"] = lambda: rewrite_service.plan_rewrite_prompt(
+        latex, jd, keywords, experiences, projects, budget=4000
+    )
+
+    supabase = fake_supabase(40)
+
+    def profile_rows():
+        profile_service.profile_cache.clear()
+        return loop.run_until_complete(profile_service.get_user_rows(supabase, "bench-user", "experiences"))
+    cases["profile.get_user_rows.miss"] = profile_rows
+    cases["profile.get_user_rows.hit"] = lambda: loop.run_until_complete(
+        profile_service.get_user_rows(supabase, "bench-user", "experiences")
+    )
+
+    return cases, fake_llm
+
+
+def time_case(fn, repeat: int, warmup: int) -> dict:
+    for _ in range(warmup):
+        fn()
+    samples = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        samples.append((time.perf_counter() - start) * 1e3)
+    samples.sort()
+    return {
+        "median_ms": round(statistics.median(samples), 4),
+        "p95_ms": round(samples[min(len(samples) - 1, int(len(samples) * 0.95))], 4),
+        "min_ms": round(samples[0], 4),
+        "runs": repeat,
+    }
+
+
+def run(filter_text: str | None, repeat: int, warmup: int) -> dict:
+    cases, fake_llm = build_cases()
+    real_llm = llm_client.gemini
+    llm_client.gemini = fake_llm   # keyword extraction never leaves the process
+    cpu_pool._pool = None          # fallback runs in a thread: no worker startup in the timings
+    results = {}
+    try:
+        for name, fn in cases.items():
+            if filter_text and filter_text not in name:
+                continue
+            try:
+                results[name] = time_case(fn, repeat, warmup)
+            except Exception as e:   # e.g. spaCy model not installed
+                results[name] = {"skipped": f"{type(e).__name__}: {e}"[:200]}
+            print(f"{name:45s} {json.dumps(results[name])}", file=sys.stderr)
+    finally:
+        llm_client.gemini = real_llm
+    return results
+
+
+# -------------------- baseline / compare --------------------
+
+def git_commit() -> str:
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"], cwd=BACKEND_DIR,
+            capture_output=True, text=True, check=True
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return "unknown"
+
+
+def compare(current: dict, baseline: dict, threshold: float, min_delta_ms: float) -> list:
+    """Cases whose median regressed by more than threshold (and min_delta_ms)."""
+    regressions = []
+    for name, now in current.items():
+        before = baseline.get(name)
+        if not before or "median_ms" not in before or "median_ms" not in now:
+            continue
+        delta = now["median_ms"] - before["median_ms"]
+        ratio = now["median_ms"] / before["median_ms"] if before["median_ms"] else float("inf")
+        if ratio > 1 + threshold and delta > min_delta_ms:
+            regressions.append({
+                "case": name,
+                "baseline_ms": before["median_ms"],
+                "current_ms": now["median_ms"],
+                "change": f"+{(ratio - 1) * 100:.1f}%",
+            })
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--repeat", type=int, default=20)
+    parser.add_argument("--warmup", type=int, default=2)
+    parser.add_argument("--filter", help="only run cases whose name contains this text")
+    parser.add_argument("--save", help="write results as a JSON baseline to this path")
+    parser.add_argument("--compare", help="baseline JSON to compare against")
+    parser.add_argument("--threshold", type=float, default=0.25, help="allowed slowdown, e.g. 0.25 = 25%%")
+    parser.add_argument("--min-delta-ms", type=float, default=0.05, help="ignore smaller absolute slowdowns (noise)")
+    args = parser.parse_args()
+
+    # Services print diagnostics ("Using fallback taxonomy + TF-IDF ..."); keep
+    # them on stderr with the progress lines so stdout is only the JSON report
+    with contextlib.redirect_stdout(sys.stderr):
+        results = run(args.filter, args.repeat, args.warmup)
+
+    output = {
+        "meta": {
+            "commit": git_commit(),
+            "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S"),
+            "python": platform.python_version(),
+            "machine": platform.machine(),
+            "repeat": args.repeat,
+        },
+        "results": results,
+    }
+
+    if args.save:
+        with open(args.save, "w") as f:
+            json.dump(output, f, indent=2, sort_keys=True)
+
+    if args.compare:
+        with open(args.compare) as f:
+            baseline = json.load(f)
+        regressions = compare(output["results"], baseline["results"], args.threshold, args.min_delta_ms)
+        output["comparison"] = {
+            "baseline_commit": baseline.get("meta", {}).get("commit"),
+            "threshold": args.threshold,
+            "regressions": regressions,
+        }
+
+    print(json.dumps(output, indent=2, sort_keys=True))
+    if args.compare and output["comparison"]["regressions"]:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
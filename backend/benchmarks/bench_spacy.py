@@ -0,0 +1,106 @@
+"""
+spaCy cost for keyword extraction: the full pipeline vs the slim one.
+
+"full" is spacy.load(SPACY_MODEL) as before (parser, NER, lemmatizer
+included); "slim" excludes model_registry.SPACY_EXCLUDE, which is what the
+app loads now. Each pipeline is loaded in a fresh subprocess so model
+memory (peak RSS growth) and load time don't leak between them. Reports
+per-document latency (one nlp() call per JD) and batch throughput
+(nlp.pipe) on the corpus job descriptions. Exits cleanly with a note if
+the model isn't installed.
+
+Usage (from backend/):
+    python benchmarks/bench_spacy.py
+    python benchmarks/bench_spacy.py --docs 200 --batch-size 64 --processes 1 2
+"""
+import argparse
+import json
+import os
+import resource
+import subprocess
+import sys
+import time
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, BACKEND_DIR)
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+import corpus
+from app.config import Config
+from app.services.model_registry import SPACY_EXCLUDE
+
+
+def rss_mb() -> float:
+    # ru_maxrss is KiB on Linux, bytes on macOS
+    scale = 1024 * 1024 if sys.platform == "darwin" else 1024
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / scale
+
+
+def measure(variant: str, docs: int, batch_size: int, processes: list) -> dict:
+    import spacy
+
+    base = rss_mb()
+    start = time.perf_counter()
+    exclude = list(SPACY_EXCLUDE) if variant == "slim" else []
+    nlp = spacy.load(Config.SPACY_MODEL, exclude=exclude)
+    load_s = time.perf_counter() - start
+    model_mb = rss_mb() - base
+
+    sizes = list(corpus.SIZES)
+    texts = [corpus.make_job_description(sizes[i % len(sizes)], seed=i) for i in range(docs)]
+    nlp(texts[0])   # warm up
+
+    start = time.perf_counter()
+    for text in texts:
+        nlp(text)
+    per_doc_ms = (time.perf_counter() - start) / docs * 1e3
+
+    pipe = {}
+    for n_process in processes:
+        start = time.perf_counter()
+        for _ in nlp.pipe(texts, batch_size=batch_size, n_process=n_process):
+            pass
+        pipe[f"pipe_docs_s.{n_process}proc"] = round(docs / (time.perf_counter() - start), 1)
+
+    return {
+        "variant": variant,
+        "components": nlp.pipe_names,
+        "load_s": round(load_s, 3),
+        "model_mb": round(model_mb, 1),
+        "per_doc_ms": round(per_doc_ms, 3),
+        "serial_docs_s": round(1e3 / per_doc_ms, 1),
+        **pipe,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--docs", type=int, default=100)
+    parser.add_argument("--batch-size", type=int, default=Config.SPACY_BATCH_SIZE)
+    parser.add_argument("--processes", type=int, nargs="+", default=[1])
+    parser.add_argument("--variant", choices=["full", "slim"], help=argparse.SUPPRESS)   # child mode
+    args = parser.parse_args()
+
+    if args.variant:
+        print(json.dumps(measure(args.variant, args.docs, args.batch_size, args.processes)))
+        return
+
+    try:
+        import spacy
+    except ImportError:
+        print(json.dumps({"skipped": "spaCy not installed"}))
+        return
+    if not (spacy.util.is_package(Config.SPACY_MODEL) or os.path.isdir(Config.SPACY_MODEL)):
+        print(json.dumps({"skipped": f"spaCy model {Config.SPACY_MODEL} not installed"}))
+        return
+
+    for variant in ("full", "slim"):
+        subprocess.run([
+            sys.executable, os.path.abspath(__file__), "--variant", variant,
+            "--docs", str(args.docs), "--batch-size", str(args.batch_size),
+            "--processes", *map(str, args.processes),
+        ], check=True)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,100 @@
+"""
+Cold-start benchmark for the FastAPI app.
+
+Each run uses a fresh interpreter and measures:
+  - import_s:      `import app.main`
+  - first_health_s: import + app startup + first GET /api/health
+  - ready_s:       until /api/ready reports every model loaded (warmup done)
+
+Usage (from backend/):
+    python benchmarks/bench_startup.py --runs 5
+    python benchmarks/bench_startup.py --runs 5 --history benchmarks/startup_history.jsonl
+
+--history appends one JSON line per invocation tagged with the current git
+commit, so cold-start time can be tracked across commits.
+"""
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import time
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+PROBE = r"""
+import json, time, warnings
+warnings.filterwarnings("ignore")
+t0 = time.perf_counter()
+import app.main
+t_import = time.perf_counter() - t0
+from fastapi.testclient import TestClient
+with TestClient(app.main.app) as client:
+    client.get("/api/health")
+    t_health = time.perf_counter() - t0
+    t_ready = None
+    while time.perf_counter() - t0 < {ready_timeout}:
+        if client.get("/api/ready").status_code == 200:
+            t_ready = time.perf_counter() - t0
+            break
+        time.sleep(0.05)
+print(json.dumps({{"import_s": t_import, "first_health_s": t_health, "ready_s": t_ready}}))
+"""
+
+
+def run_once(ready_timeout: float) -> dict:
+    out = subprocess.run(
+        [sys.executable, "-c", PROBE.format(ready_timeout=ready_timeout)],
+        cwd=BACKEND_DIR,
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    return json.loads(out.stdout.strip().splitlines()[-1])
+
+
+def git_commit() -> str:
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"], cwd=BACKEND_DIR,
+            capture_output=True, text=True, check=True
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return "unknown"
+
+
+def summarize(runs: list) -> dict:
+    summary = {}
+    for key in ("import_s", "first_health_s", "ready_s"):
+        values = [r[key] for r in runs if r[key] is not None]
+        summary[key] = {
+            "median": round(statistics.median(values), 4) if values else None,
+            "min": round(min(values), 4) if values else None,
+        }
+    return summary
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--ready-timeout", type=float, default=60.0)
+    parser.add_argument("--history", help="append results to this JSONL file")
+    args = parser.parse_args()
+
+    runs = [run_once(args.ready_timeout) for _ in range(args.runs)]
+    result = {
+        "commit": git_commit(),
+        "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        "runs": args.runs,
+        **summarize(runs),
+    }
+    print(json.dumps(result, indent=2))
+
+    if args.history:
+        with open(args.history, "a") as f:
+            f.write(json.dumps(result) + "\n")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,98 @@
+"""
+Skill extraction cost vs taxonomy size.
+
+Scans the corpus job descriptions with the skill_taxonomy automaton and,
+for comparison, a naive scan that runs one word-boundary regex per skill
+name or alias (cost grows with the taxonomy) and the spaCy pass the
+fallback used to rely on (skipped if en_core_web_sm isn't installed).
+Larger taxonomies are the bundled one padded with synthetic skills.
+
+Usage (from backend/):
+    python benchmarks/bench_taxonomy.py
+    python benchmarks/bench_taxonomy.py --taxonomy-sizes 1000 5000 20000 --repeat 20
+"""
+import argparse
+import json
+import os
+import re
+import sys
+import time
+import timeit
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, BACKEND_DIR)
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+import corpus
+from app.services.skill_taxonomy import SkillMatcher, load_taxonomy
+
+
+def padded_taxonomy(size: int) -> list:
+    """The bundled taxonomy, truncated or padded with synthetic skills to `size` entries."""
+    entries = load_taxonomy()
+    for i in range(len(entries), size):
+        entries.append({"name": f"Synthskill {i}", "category": "synthetic", "aliases": [f"synth{i}"]})
+    return entries[:size]
+
+
+def naive_scanner(entries):
+    """One compiled regex per term, every term tried against the whole text."""
+    patterns = []
+    for entry in entries:
+        exact = entry.get("exact", [])
+        for term in [entry["name"], *entry.get("aliases", [])]:
+            flags = 0 if term in exact else re.IGNORECASE
+            patterns.append((entry["name"], re.compile(rf"(?<![\w+#]){re.escape(term)}(?![\w+#])", flags)))
+
+    def scan(text):
+        return {name for name, pattern in patterns if pattern.search(text)}
+    return scan
+
+
+def spacy_pass():
+    try:
+        import spacy
+        nlp = spacy.load("en_core_web_sm")
+    except (ImportError, OSError):
+        return None
+    return lambda text: [t.text for t in nlp(text) if t.pos_ in {"NOUN", "PROPN"}]
+
+
+def bench(fn, repeat: int) -> float:
+    fn()
+    return timeit.timeit(fn, number=repeat) / repeat * 1e3
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--taxonomy-sizes", type=int, nargs="+", default=[1000, 5000, 20000])
+    parser.add_argument("--repeat", type=int, default=20)
+    args = parser.parse_args()
+
+    nlp = spacy_pass()
+    for taxonomy_size in args.taxonomy_sizes:
+        entries = padded_taxonomy(taxonomy_size)
+        start = time.perf_counter()
+        matcher = SkillMatcher(entries)
+        build_ms = (time.perf_counter() - start) * 1e3
+        naive = naive_scanner(entries)
+
+        for size in corpus.SIZES:
+            jd = corpus.make_job_description(size)
+            matcher_ms = bench(lambda: matcher.find(jd), args.repeat)
+            naive_ms = bench(lambda: naive(jd), max(1, args.repeat // 4))
+            print(json.dumps({
+                "taxonomy": taxonomy_size,
+                "patterns": len(matcher),
+                "jd": size,
+                "jd_kb": round(len(jd) / 1024, 1),
+                "build_ms": round(build_ms, 1),
+                "matcher_ms": round(matcher_ms, 3),
+                "naive_regex_ms": round(naive_ms, 3),
+                "spacy_ms": round(bench(lambda: nlp(jd), args.repeat), 3) if nlp else "skipped",
+                "speedup_vs_naive": round(naive_ms / matcher_ms, 1),
+            }))
+
+
+if __name__ == "__main__":
+    main()
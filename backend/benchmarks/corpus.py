@@ -0,0 +1,264 @@
+"""
+Deterministic synthetic corpus for the benchmarks: job descriptions and
+resumes (plain text, LaTeX, PDF, DOCX) in several sizes.
+
+The same (size, seed) always produces byte-identical output, so timings
+from different commits are measured on the same inputs.
+
+Write a sample set to data/ (from backend/):
+    python benchmarks/corpus.py --out ../data
+"""
+import argparse
+import io
+import os
+import random
+import zipfile
+from xml.sax.saxutils import escape
+
+# size -> (experience entries, bullets per entry, projects, JD paragraphs)
+SIZES = {
+    "small": (2, 3, 2, 2),
+    "medium": (6, 5, 5, 6),
+    "large": (30, 8, 20, 25),
+}
+
+SKILLS = [
+    "Python", "Java", "TypeScript", "React", "Node.js", "FastAPI", "Django", "Flask",
+    "SQL", "PostgreSQL", "MongoDB", "Redis", "Kafka", "Spark", "Airflow", "Docker",
+    "Kubernetes", "Terraform", "AWS", "GCP", "Azure", "GraphQL", "REST", "CI/CD",
+    "PyTorch", "TensorFlow", "scikit-learn", "pandas", "NumPy", "Linux", "Git", "Go",
+]
+VERBS = [
+    "Built", "Designed", "Led", "Optimized", "Migrated", "Automated", "Scaled",
+    "Deployed", "Refactored", "Instrumented", "Shipped", "Maintained",
+]
+OBJECTS = [
+    "a recommendation service", "the billing pipeline", "an internal search API",
+    "real-time analytics dashboards", "the CI pipeline", "a feature store",
+    "customer-facing microservices", "batch ETL jobs", "the mobile backend",
+]
+OUTCOMES = [
+    "cutting p95 latency by {n}%", "serving {n}k requests per second",
+    "reducing cloud spend by {n}%", "for {n}M monthly users", "raising test coverage to {n}%",
+]
+COMPANIES = ["Acme", "Globex", "Initech", "Umbrella", "Hooli", "Stark", "Wayne", "Tyrell"]
+BOILERPLATE = [
+    "We are a fast-growing company on a mission to change how people work.",
+    "Our culture values ownership, curiosity and humble, driven people.",
+    "We offer competitive salary, equity, health benefits and a flexible schedule.",
+    "We are an equal opportunity employer and value diversity at our company.",
+]
+
+
+def _rng(kind: str, size: str, seed: int) -> random.Random:
+    return random.Random(f"{kind}:{size}:{seed}")
+
+
+def _bullet(rng: random.Random) -> str:
+    outcome = rng.choice(OUTCOMES).format(n=rng.randint(2, 95))
+    skills = ", ".join(rng.sample(SKILLS, 2))
+    return f"{rng.choice(VERBS)} {rng.choice(OBJECTS)} with {skills}, {outcome}"
+
+
+def make_job_description(size: str = "medium", seed: int = 0) -> str:
+    rng = _rng("jd", size, seed)
+    _, _, _, paragraphs = SIZES[size]
+    skills = rng.sample(SKILLS, 8)
+    parts = [f"About us: {rng.choice(BOILERPLATE)}"]
+    parts += [rng.choice(BOILERPLATE) for _ in range(paragraphs)]
+    parts.append("Responsibilities:")
+    parts += [f"- {_bullet(rng)}" for _ in range(paragraphs)]
+    parts.append("Requirements:")
+    parts += [f"- {rng.randint(2, 8)}+ years of experience with {s}" for s in skills]
+    return "\n".join(parts)
+
+
+def make_resume_text(size: str = "medium", seed: int = 0) -> str:
+    """Plain text as pdfminer/docx2txt would extract it."""
+    rng = _rng("resume", size, seed)
+    entries, bullets, projects, _ = SIZES[size]
+    lines = [
+        "Jordan Example",
+        f"jordan.example{seed}@example.com | +1 555 {rng.randint(100, 999)} {rng.randint(1000, 9999)}",
+        "https://github.com/jordan-example",
+        "Education",
+        "BSc Computer Science, State University (2016 - 2020)",
+        "Experience",
+    ]
+    for i in range(entries):
+        lines.append(f"Software Engineer, {COMPANIES[i % len(COMPANIES)]} ({2020 + i % 5} - {2021 + i % 5})")
+        lines += [f"- {_bullet(rng)}" for _ in range(bullets)]
+    lines.append("Projects")
+    for i in range(projects):
+        lines.append(f"Project {i} | {', '.join(rng.sample(SKILLS, 3))}")
+        lines += [f"* {_bullet(rng)}" for _ in range(max(1, bullets // 2))]
+    lines.append("Technical Skills")
+    lines.append(", ".join(rng.sample(SKILLS, 12)))
+    return "\n".join(lines)
+
+
+def make_resume_latex(size: str = "medium", seed: int = 0) -> str:
+    """A Jake-style LaTeX resume, built without latex_service so it doesn't drift with it."""
+    rng = _rng("latex", size, seed)
+    entries, bullets, projects, _ = SIZES[size]
+
+    def items(n):
+        out = [r"\resumeItemListStart"]
+        out += [rf"  \resumeItem{{{_bullet(rng).replace('%', chr(92) + '%')}}}" for _ in range(n)]
+        out.append(r"\resumeItemListEnd")
+        return out
+
+    lines = [
+        r"\documentclass[letterpaper,11pt]{article}",
+        r"\newcommand{\resumeItem}[1]{\item\small{{#1 \vspace{-2pt}}}}",
+        r"\newcommand{\resumeItemListStart}{\begin{itemize}}",
+        r"\newcommand{\resumeItemListEnd}{\end{itemize}\vspace{-5pt}}",
+        r"\begin{document}",
+        r"\begin{center}\textbf{\Huge Jordan Example}\end{center}",
+        r"\section{Education}",
+        "BSc Computer Science, State University",
+        r"\section{Experience}",
+    ]
+    for i in range(entries):
+        lines.append(rf"\textbf{{Software Engineer}} | {COMPANIES[i % len(COMPANIES)]}")
+        lines += items(bullets)
+    lines.append(r"\section{Projects}")
+    for i in range(projects):
+        lines.append(rf"\textbf{{Project {i}}} | ({', '.join(rng.sample(SKILLS, 3))})")
+        lines += items(max(1, bullets // 2))
+    lines.append(r"\section{Technical Skills}")
+    lines.append(", ".join(rng.sample(SKILLS, 12)))
+    lines.append(r"\end{document}")
+    return "\n".join(lines)
+
+
+def make_saved_entries(count: int, seed: int = 0):
+    """(experiences, projects) rows shaped like the Supabase tables."""
+    rng = _rng("saved", str(count), seed)
+    experiences = [
+        {
+            "id": str(i), "role": "Engineer", "company": COMPANIES[i % len(COMPANIES)],
+            "start_date": "2020-01", "end_date": "2022-06",
+            "bullets": [_bullet(rng) for _ in range(3)],
+        }
+        for i in range(count)
+    ]
+    projects = [
+        {
+            "id": str(i), "name": f"Project {i}", "start_date": "2021-01", "end_date": "2021-09",
+            "tech_stack": rng.sample(SKILLS, 3), "bullets": [_bullet(rng) for _ in range(2)],
+        }
+        for i in range(count)
+    ]
+    return experiences, projects
+
+
+# -------------------- binary formats --------------------
+
+def make_docx(text: str) -> bytes:
+    """Minimal WordprocessingML package (one paragraph per line)."""
+    paragraphs = "".join(
+        f'<w:p><w:r><w:t xml:space="preserve">{escape(line)}</w:t></w:r></w:p>'
+        for line in text.splitlines()
+    )
+    files = {
+        "[Content_Types].xml": (
+            '<?xml version="1.0" encoding="UTF-8"?>'
+            '<Types xmlns="http://schemas.openxmlformats.org/package/2006/content-types">'
+            '<Default Extension="rels" ContentType="application/vnd.openxmlformats-package.relationships+xml"/>'
+            '<Default Extension="xml" ContentType="application/xml"/>'
+            '<Override PartName="/word/document.xml" '
+            'ContentType="application/vnd.openxmlformats-officedocument.wordprocessingml.document.main+xml"/>'
+            '</Types>'
+        ),
+        "_rels/.rels": (
+            '<?xml version="1.0" encoding="UTF-8"?>'
+            '<Relationships xmlns="http://schemas.openxmlformats.org/package/2006/relationships">'
+            '<Relationship Id="rId1" Target="word/document.xml" '
+            'Type="http://schemas.openxmlformats.org/officeDocument/2006/relationships/officeDocument"/>'
+            '</Relationships>'
+        ),
+        "word/document.xml": (
+            '<?xml version="1.0" encoding="UTF-8"?>'
+            '<w:document xmlns:w="http://schemas.openxmlformats.org/wordprocessingml/2006/main">'
+            f'<w:body>{paragraphs}</w:body></w:document>'
+        ),
+    }
+    buffer = io.BytesIO()
+    with zipfile.ZipFile(buffer, "w", zipfile.ZIP_DEFLATED) as z:
+        for name, content in files.items():
+            info = zipfile.ZipInfo(name, date_time=(2020, 1, 1, 0, 0, 0))   # fixed: reproducible bytes
+            z.writestr(info, content)
+    return buffer.getvalue()
+
+
+def make_pdf(text: str, lines_per_page: int = 60) -> bytes:
+    """Minimal multi-page PDF with Helvetica text, one text line per resume line."""
+    def pdf_string(s):
+        s = s.encode("latin-1", "replace").decode("latin-1")
+        return "(" + s.replace("\\", "\\\\").replace("(", "\\(").replace(")", "\\)") + ")"
+
+    lines = text.splitlines() or [""]
+    pages = [lines[i:i + lines_per_page] for i in range(0, len(lines), lines_per_page)]
+
+    objects = ["<< /Type /Catalog /Pages 2 0 R >>", None, "<< /Type /Font /Subtype /Type1 /BaseFont /Helvetica >>"]
+    page_ids = []
+    for page in pages:
+        ops = ["BT", "/F1 9 Tf", "11 TL", "40 760 Td"]
+        for line in page:
+            ops += [f"{pdf_string(line)} Tj", "T*"]
+        ops.append("ET")
+        stream = "\n".join(ops).encode("latin-1")
+        objects.append(f"<< /Length {len(stream)} >>\nstream\n{stream.decode('latin-1')}\nendstream")
+        content_id = len(objects)
+        objects.append(
+            f"<< /Type /Page /Parent 2 0 R /MediaBox [0 0 612 792] "
+            f"/Resources << /Font << /F1 3 0 R >> >> /Contents {content_id} 0 R >>"
+        )
+        page_ids.append(len(objects))
+    objects[1] = f"<< /Type /Pages /Kids [{' '.join(f'{i} 0 R' for i in page_ids)}] /Count {len(page_ids)} >>"
+
+    out = io.BytesIO()
+    out.write(b"%PDF-1.4\n")
+    offsets = []
+    for number, body in enumerate(objects, start=1):
+        offsets.append(out.tell())
+        out.write(f"{number} 0 obj\n{body}\nendobj\n".encode("latin-1"))
+    xref = out.tell()
+    out.write(f"xref\n0 {len(objects) + 1}\n0000000000 65535 f \n".encode())
+    for offset in offsets:
+        out.write(f"{offset:010d} 00000 n \n".encode())
+    out.write(f"trailer\n<< /Size {len(objects) + 1} /Root 1 0 R >>\nstartxref\n{xref}\n%%EOF\n".encode())
+    return out.getvalue()
+
+
+def write_samples(out_dir: str, seed: int = 0):
+    """Write one JD and one resume (txt, tex, pdf, docx) per size under out_dir."""
+    jobs = os.path.join(out_dir, "sample_jobs")
+    resumes = os.path.join(out_dir, "sample_resumes")
+    os.makedirs(jobs, exist_ok=True)
+    os.makedirs(resumes, exist_ok=True)
+    for size in SIZES:
+        with open(os.path.join(jobs, f"jd_{size}.txt"), "w", encoding="utf-8") as f:
+            f.write(make_job_description(size, seed))
+        text = make_resume_text(size, seed)
+        with open(os.path.join(resumes, f"resume_{size}.txt"), "w", encoding="utf-8") as f:
+            f.write(text)
+        with open(os.path.join(resumes, f"resume_{size}.tex"), "w", encoding="utf-8") as f:
+            f.write(make_resume_latex(size, seed))
+        with open(os.path.join(resumes, f"resume_{size}.pdf"), "wb") as f:
+            f.write(make_pdf(text))
+        with open(os.path.join(resumes, f"resume_{size}.docx"), "wb") as f:
+            f.write(make_docx(text))
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--out", required=True, help="directory to write sample_jobs/ and sample_resumes/ into")
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+    write_samples(args.out, args.seed)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,21 @@
+import os
+import sys
+
+import pytest
+
+# Add parent directory (backend/) to path
+sys.path.append(os.path.dirname(os.path.dirname(__file__)))
+
+# Memory-only result store and profile stamps: tests must not read or leave state on disk
+os.environ["RESULT_STORE_DB"] = ""
+os.environ["PROFILE_STAMP_DB"] = ""
+
+from app.services import result_store
+
+
+@pytest.fixture(autouse=True)
+def empty_result_store():
+    """Stored rewrites would otherwise answer identical requests across tests."""
+    result_store.results.clear()
+    yield
+    result_store.results.clear()
@@ -0,0 +1,82 @@
+import os
+import sys
+import time
+
+import pytest
+from fastapi import Depends, FastAPI, HTTPException, Request
+from fastapi.testclient import TestClient
+from jose import jwt
+
+# Add parent directory (backend/) to path
+sys.path.append(os.path.dirname(os.path.dirname(__file__)))
+
+from app.utils import auth
+from app.utils.auth import verify_jwt, get_optional_user, jwt_cache, token_digest
+
+SECRET = "test-secret"
+
+
+@pytest.fixture(autouse=True)
+def counted_decode(monkeypatch):
+    """Count real jose decodes; clear the cache between tests."""
+    monkeypatch.setattr(auth.Config, "SUPABASE_JWT_SECRET", SECRET)
+    jwt_cache.clear()
+    calls = []
+    real_decode = jwt.decode
+
+    def decode(*args, **kwargs):
+        calls.append(args[0])
+        return real_decode(*args, **kwargs)
+
+    monkeypatch.setattr(auth.jwt, "decode", decode)
+    yield calls
+    jwt_cache.clear()
+
+
+def make_token(sub="user-1", expires_in=600):
+    return jwt.encode({"sub": sub, "exp": int(time.time()) + expires_in}, SECRET, algorithm="HS256")
+
+
+def test_valid_token_decoded_once_and_expires_at_exp(counted_decode):
+    token = make_token(expires_in=120)
+
+    assert verify_jwt(token)["sub"] == "user-1"
+    assert verify_jwt(token)["sub"] == "user-1"
+
+    assert len(counted_decode) == 1
+    assert 100 < jwt_cache.ttl_remaining(token_digest(token)) <= 120
+
+
+def test_cached_claims_cannot_be_mutated_by_callers():
+    token = make_token()
+    verify_jwt(token)["sub"] = "someone-else"
+    assert verify_jwt(token)["sub"] == "user-1"
+
+
+def test_invalid_token_is_negative_cached(counted_decode):
+    forged = jwt.encode({"sub": "user-1"}, "wrong-secret", algorithm="HS256")
+
+    for _ in range(3):
+        with pytest.raises(HTTPException) as exc:
+            verify_jwt(forged)
+        assert exc.value.status_code == 401
+
+    assert len(counted_decode) == 1
+    assert jwt_cache.ttl_remaining(token_digest(forged)) <= auth.Config.JWT_NEGATIVE_TTL
+
+
+def test_optional_user_decoded_once_per_request(counted_decode):
+    app = FastAPI()
+
+    @app.get("/whoami")
+    async def whoami(request: Request, user=Depends(get_optional_user)):
+        again = await get_optional_user(request)
+        return {"sub": user and user["sub"], "same": again is user}
+
+    with TestClient(app) as client:
+        res = client.get("/whoami", headers={"Authorization": f"Bearer {make_token('user-7')}"})
+        assert res.json() == {"sub": "user-7", "same": True}
+        assert client.get("/whoami").json() == {"sub": None, "same": True}
+        assert client.get("/whoami", headers={"Authorization": "Bearer garbage"}).json()["sub"] is None
+
+    assert len(counted_decode) == 2
@@ -0,0 +1,66 @@
+import json
+import os
+import subprocess
+import sys
+
+# Add parent directory (backend/) and benchmarks/ to path
+BACKEND_DIR = os.path.dirname(os.path.dirname(__file__))
+sys.path.append(BACKEND_DIR)
+sys.path.append(os.path.join(BACKEND_DIR, "benchmarks"))
+
+import corpus
+from bench_services import FALLBACK_MAX_FEATURES, compare
+from app.services import keyword_service
+from app.services.resume_parser import parse_resume
+
+
+def test_corpus_is_deterministic_and_scales():
+    for size in corpus.SIZES:
+        assert corpus.make_resume_text(size) == corpus.make_resume_text(size)
+        assert corpus.make_pdf(corpus.make_resume_text(size)) == corpus.make_pdf(corpus.make_resume_text(size))
+        assert corpus.make_docx("a\nb") == corpus.make_docx("a\nb")
+    assert corpus.make_resume_text("small", seed=1) != corpus.make_resume_text("small", seed=2)
+    assert len(corpus.make_resume_text("small")) < len(corpus.make_resume_text("large"))
+
+    doc = parse_resume(corpus.make_resume_text("medium"))
+    assert list(doc.sections) == ["Education", "Experience", "Projects", "Technical Skills"]
+
+
+def test_fallback_cases_reach_the_spacy_pass():
+    # Otherwise keywords.fallback.* would only time the taxonomy scan
+    for size in corpus.SIZES:
+        focused = keyword_service.extract_relevant_sections(corpus.make_job_description(size))
+        skills, _ = keyword_service._taxonomy_skills(focused, FALLBACK_MAX_FEATURES)
+        assert len(skills) < FALLBACK_MAX_FEATURES
+
+
+def test_compare_flags_only_real_regressions():
+    baseline = {
+        "fast": {"median_ms": 1.0},
+        "noisy": {"median_ms": 0.01},
+        "stable": {"median_ms": 10.0},
+        "skipped": {"skipped": "OSError"},
+    }
+    current = {
+        "fast": {"median_ms": 1.5},      # +50%
+        "noisy": {"median_ms": 0.03},    # +200% but only 0.02 ms
+        "stable": {"median_ms": 11.0},   # +10%
+        "skipped": {"median_ms": 5.0},
+        "new_case": {"median_ms": 1.0},
+    }
+    regressions = compare(current, baseline, threshold=0.25, min_delta_ms=0.05)
+    assert [r["case"] for r in regressions] == ["fast"]
+    assert regressions[0]["change"] == "+50.0%"
+
+
+def test_report_is_the_only_thing_on_stdout():
+    # keywords.fallback prints "Using fallback ..." from inside the service
+    out = subprocess.run(
+        [sys.executable, os.path.join(BACKEND_DIR, "benchmarks", "bench_services.py"),
+         "--filter", "keywords.fallback.small", "--repeat", "1", "--warmup", "0"],
+        capture_output=True, text=True, check=True,
+    )
+
+    report = json.loads(out.stdout)
+    assert list(report["results"]) == ["keywords.fallback.small"]
+    assert "Using fallback" in out.stderr
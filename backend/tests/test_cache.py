@@ -0,0 +1,110 @@
+import os
+import sys
+import time
+
+# Add parent directory (backend/) to path
+sys.path.append(os.path.dirname(os.path.dirname(__file__)))
+
+from app.utils.cache import TTLCache, SQLiteCache, TieredCache
+
+
+def test_lru_eviction_and_counters():
+    cache = TTLCache(max_entries=2, ttl=60)
+    cache.set("a", 1)
+    cache.set("b", 2)
+    assert cache.get("a") == 1      # "a" becomes most recently used
+    cache.set("c", 3)               # evicts "b"
+
+    assert cache.get("b") is None
+    assert cache.get("c") == 3
+    assert cache.stats() == {
+        "entries": 2, "weight": 2, "hits": 2, "misses": 1, "evictions": 1, "expirations": 0,
+    }
+
+
+def test_per_entry_ttl_expires():
+    cache = TTLCache(max_entries=10, ttl=60)
+    cache.set("short", ["x"], ttl=0.01)
+    cache.set("long", ["y"])
+    time.sleep(0.02)
+
+    assert cache.get("short") is None
+    assert cache.get("long") == ["y"]
+    assert cache.stats()["expirations"] == 1
+
+
+def test_weight_bound():
+    cache = TTLCache(max_entries=100, ttl=60, max_weight=10, weigher=len)
+    cache.set("a", b"12345")
+    cache.set("b", b"12345")
+    cache.set("c", b"1")            # total 11 > 10 -> evict "a"
+    cache.set("huge", b"x" * 50)    # larger than the whole budget: skipped
+
+    assert cache.get("a") is None
+    assert cache.get("huge") is None
+    assert cache.stats()["weight"] == 6
+
+
+def test_persistent_tier_survives_new_memory_tier(tmp_path):
+    path = str(tmp_path / "cache.db")
+    first = TieredCache(TTLCache(ttl=60), SQLiteCache(path, table="keywords"))
+    first.set("jd", ["python", "sql"])
+
+    second = TieredCache(TTLCache(ttl=60), SQLiteCache(path, table="keywords"))
+    assert second.get("jd") == ["python", "sql"]
+    assert second.memory.get("jd") == ["python", "sql"]   # promoted
+    assert second.persistent.stats()["hits"] == 1
+
+
+def test_persistent_tier_evicts_least_recently_read_over_byte_budget(tmp_path):
+    cache = SQLiteCache(str(tmp_path / "results.db"), table="results", max_bytes=100)
+    cache.set("a", "x" * 40, ttl=60)   # ~42 bytes of JSON each
+    cache.set("b", "y" * 40, ttl=60)
+    assert cache.get("a") is not None  # "a" is now more recent than "b"
+    cache.set("c", "z" * 40, ttl=60)   # over budget -> evict "b"
+
+    assert cache.get("b") is None
+    assert cache.get("a") == "x" * 40
+    assert cache.get("c") == "z" * 40
+    stats = cache.stats()
+    assert stats["evictions"] == 1
+    assert stats["bytes"] <= 100
+
+    cache.set("huge", "h" * 500, ttl=60)   # larger than the whole budget: skipped
+    assert cache.get("huge") is None
+    assert cache.stats()["entries"] == 2
+
+
+def test_persistent_tier_upgrades_old_tables(tmp_path):
+    import sqlite3
+    path = str(tmp_path / "old.db")
+    conn = sqlite3.connect(path)
+    conn.execute("CREATE TABLE keywords (key TEXT PRIMARY KEY, value TEXT, expires_at REAL)")
+    conn.execute("INSERT INTO keywords VALUES ('jd', '[\"python\"]', 9e12)")
+    conn.commit()
+    conn.close()
+
+    cache = SQLiteCache(path, table="keywords", max_bytes=1000)
+    assert cache.get("jd") == ["python"]
+    cache.set("jd2", ["sql"], ttl=60)
+    assert cache.stats()["entries"] == 2
+
+
+def test_persistent_byte_total_tracks_every_write(tmp_path):
+    path = str(tmp_path / "results.db")
+    cache = SQLiteCache(path, table="results", max_bytes=10_000)
+    other = SQLiteCache(path, table="results", max_bytes=10_000)   # a second worker process
+
+    def summed():
+        return cache._conn.execute("SELECT COALESCE(SUM(size), 0) FROM results").fetchone()[0]
+
+    cache.set("a", "x" * 40, ttl=60)
+    other.set("b", "y" * 100, ttl=60)
+    cache.set("a", "x" * 10, ttl=60)     # overwrite shrinks the entry
+    other.pop("b")
+    cache.set("gone", "z" * 30, ttl=-1)
+    assert cache.get("gone") is None    # expired row deleted on read
+
+    assert cache.stats()["bytes"] == other.stats()["bytes"] == summed() == len('"' + "x" * 10 + '"')
+    cache.clear()
+    assert other.stats()["bytes"] == 0
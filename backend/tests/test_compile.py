@@ -0,0 +1,127 @@
+import asyncio
+import json
+import os
+import shutil
+import stat
+import sys
+
+import pytest
+
+# Add parent directory (backend/) to path
+sys.path.append(os.path.dirname(os.path.dirname(__file__)))
+
+from app.services import compile_service
+from app.services.compile_service import LocalCompileBackend, CompileError, CompileTimeout
+
+DOC = "\\documentclass{article}\n\\begin{document}\nHello\n\\end{document}"
+
+STUB = """#!{python}
+import json, os, re, sys, time
+src = open(sys.argv[-1]).read()
+with open(os.path.join(os.path.dirname(__file__), "calls.log"), "a") as log:
+    log.write(os.getcwd() + "\\n")
+with open(os.path.join(os.path.dirname(__file__), "env.json"), "w") as out:
+    json.dump(dict(os.environ), out)
+with open(os.path.join(os.path.dirname(__file__), "argv.json"), "w") as out:
+    json.dump(sys.argv[1:], out)
+# Like kpathsea: openin_any=p refuses absolute paths and ..
+for path in re.findall(r"\\\\input\\{([^}]*)\\}", src):
+    if os.environ.get("openin_any") == "p" and (os.path.isabs(path) or ".." in path):
+        print(f"! I can't find file `{path}'.")
+        sys.exit(1)
+    src += open(path).read()
+if "FAIL" in src:
+    print("! Undefined control sequence.")
+    sys.exit(1)
+if "SLOW" in src:
+    time.sleep(5)
+with open("resume.pdf", "wb") as out:
+    out.write(b"%PDF-1.4 stub " + str(len(src)).encode())
+"""
+
+
+def make_stub(path):
+    path.write_text(STUB.replace("{python}", sys.executable))
+    path.chmod(path.stat().st_mode | stat.S_IEXEC)
+    return path
+
+
+@pytest.fixture
+def stub_compiler(tmp_path):
+    return make_stub(tmp_path / "pdflatex")
+
+
+def calls(stub_compiler):
+    log = stub_compiler.parent / "calls.log"
+    return log.read_text().splitlines() if log.exists() else []
+
+
+def test_local_backend_compiles_in_sandbox_dir(stub_compiler):
+    backend = LocalCompileBackend(str(stub_compiler), concurrency=2, timeout=5)
+    pdf = asyncio.run(backend.compile(DOC))
+
+    assert pdf.startswith(b"%PDF")
+    [job_dir] = calls(stub_compiler)
+    assert os.path.basename(job_dir).startswith("latex-job-")
+    assert not os.path.exists(job_dir)  # cleaned up after the job
+
+
+def test_local_backend_reports_errors_and_timeouts(stub_compiler):
+    backend = LocalCompileBackend(str(stub_compiler), concurrency=1, timeout=0.5)
+
+    with pytest.raises(CompileError, match="Undefined control sequence"):
+        asyncio.run(backend.compile(DOC.replace("Hello", "FAIL")))
+    with pytest.raises(CompileTimeout):
+        asyncio.run(backend.compile(DOC.replace("Hello", "SLOW")))
+
+
+def test_compile_pdf_serves_unchanged_source_from_cache(stub_compiler):
+    compile_service.set_backend(LocalCompileBackend(str(stub_compiler), timeout=5))
+    compile_service.pdf_cache.clear()
+    try:
+        first, hit1 = asyncio.run(compile_service.compile_pdf(DOC))
+        # Same document modulo fences, CRLFs and trailing spaces
+        second, hit2 = asyncio.run(compile_service.compile_pdf("```latex\n" + DOC.replace("\n", "  \r\n") + "\n```"))
+    finally:
+        compile_service.set_backend(None)
+
+    assert (hit1, hit2) == (False, True)
+    assert first == second
+    assert len(calls(stub_compiler)) == 1
+
+
+def test_local_backend_gets_no_secrets_and_cannot_read_outside_job_dir(stub_compiler, tmp_path, monkeypatch):
+    secret = tmp_path / ".env"
+    secret.write_text("GEMINI_API_KEY=top-secret")
+    monkeypatch.setenv("GEMINI_API_KEY", "top-secret")
+    monkeypatch.setenv("TEXMFHOME", "/opt/texmf")
+    backend = LocalCompileBackend(str(stub_compiler), timeout=5)
+
+    with pytest.raises(CompileError, match="can't find file"):
+        asyncio.run(backend.compile(DOC.replace("Hello", "\\input{" + str(secret) + "}")))
+
+    env = json.loads((stub_compiler.parent / "env.json").read_text())
+    assert "GEMINI_API_KEY" not in env
+    assert (env["openin_any"], env["openout_any"]) == ("p", "p")
+    assert env["TEXMFHOME"] == "/opt/texmf"
+    assert env["HOME"] == calls(stub_compiler)[0]
+
+
+@pytest.mark.parametrize("name, flag", [("pdflatex", "-no-shell-escape"), ("tectonic", "--untrusted")])
+def test_local_backend_runs_compiler_untrusted(tmp_path, name, flag):
+    stub = make_stub(tmp_path / name)
+    asyncio.run(LocalCompileBackend(str(stub), timeout=5).compile(DOC))
+
+    argv = json.loads((tmp_path / "argv.json").read_text())
+    assert flag in argv
+    assert argv[-1] == "resume.tex"
+
+
+@pytest.mark.skipif(not shutil.which("pdflatex"), reason="pdflatex not installed")
+def test_pdflatex_refuses_absolute_input(tmp_path):
+    secret = tmp_path / "secret.tex"
+    secret.write_text("top-secret")
+    backend = LocalCompileBackend("pdflatex", timeout=30)
+
+    with pytest.raises(CompileError):
+        asyncio.run(backend.compile(DOC.replace("Hello", "\\input{" + str(secret) + "}")))
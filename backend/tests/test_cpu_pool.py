@@ -0,0 +1,89 @@
+import asyncio
+import os
+import sys
+import time
+
+import pytest
+
+# Add parent directory (backend/) to path
+sys.path.append(os.path.dirname(os.path.dirname(__file__)))
+
+from app.services import score_service
+from app.services.cpu_pool import CPUPool, CPUTaskTimeout
+
+JD = "Backend engineer with Python, FastAPI, Docker and PostgreSQL experience."
+RESUME = r"\resumeItem{Built FastAPI services in Python, deployed with Docker}"
+KEYWORDS = ["Python", "FastAPI", "Docker", "PostgreSQL"]
+
+
+@pytest.fixture
+def pool():
+    pool = CPUPool(workers=2, preload=("sklearn", "tfidf_analyzer", "stemmer"), timeout=60)
+    pool.start()
+    yield pool
+    pool.shutdown()
+
+
+@pytest.fixture
+def bare_pool():
+    pool = CPUPool(workers=2, preload=(), timeout=60)
+    pool.start()
+    yield pool
+    pool.shutdown()
+
+
+def test_scoring_in_worker_processes_matches_in_process(pool):
+    async def main():
+        return await asyncio.gather(*[
+            pool.run(score_service.compute_ats_score, JD, RESUME, KEYWORDS) for _ in range(4)
+        ])
+
+    results = asyncio.run(main())
+
+    assert results == [score_service.compute_ats_score(JD, RESUME, KEYWORDS)] * 4
+    stats = pool.stats()
+    assert stats["completed"] == 4 and stats["in_flight"] == 0
+    assert stats["max_in_flight"] == 4 and stats["queued"] == 0
+
+
+def test_task_timeout_raises_and_is_counted(pool):
+    with pytest.raises(CPUTaskTimeout):
+        asyncio.run(pool.run(time.sleep, 5, timeout=0.2))
+
+    assert pool.stats()["timeouts"] == 1
+
+
+def test_dead_worker_restarts_the_pool_once(bare_pool):
+    pool = bare_pool
+    from concurrent.futures.process import BrokenProcessPool
+
+    async def main():
+        # Every in-flight task fails with BrokenProcessPool; only one may restart the pool
+        results = await asyncio.gather(*[pool.run(os._exit, 1) for _ in range(4)], return_exceptions=True)
+        executor = pool.executor
+        after = await pool.run(abs, -3)
+        return results, executor, after
+
+    results, executor, after = asyncio.run(main())
+
+    assert all(isinstance(r, BrokenProcessPool) for r in results)
+    assert pool.stats()["restarts"] == 1
+    assert pool.executor is executor
+    assert after == 3
+
+
+def test_pool_recycled_when_every_worker_is_stuck(bare_pool):
+    pool = bare_pool
+    async def main():
+        await asyncio.gather(*[pool.run(time.sleep, 0.5) for _ in range(2)])   # both workers up
+        stuck = await asyncio.gather(*[pool.run(time.sleep, 30, timeout=0.5) for _ in range(2)], return_exceptions=True)
+        start = time.perf_counter()
+        await pool.run(os.getpid, timeout=20)
+        return stuck, time.perf_counter() - start
+
+    stuck, elapsed = asyncio.run(main())
+
+    assert all(isinstance(r, CPUTaskTimeout) for r in stuck)
+    stats = pool.stats()
+    assert (stats["recycles"], stats["stuck"]) == (1, 0)
+    assert elapsed < 20   # served by the fresh pool, not after the sleeps
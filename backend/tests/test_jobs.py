@@ -0,0 +1,188 @@
+import asyncio
+import os
+import sys
+import time
+
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+# Add parent directory (backend/) to path
+sys.path.append(os.path.dirname(os.path.dirname(__file__)))
+
+from app.routes.job_routes import router as job_router
+from app.services import job_service, keyword_service, rewrite_service, llm_client
+from app.services.job_service import JobQueue, QueueFull
+from app.services.supabase_service import get_supabase
+
+RESUME = r"""\documentclass{article}
+\begin{document}
+\section{Experience}
+\resumeItem{Built services in Python}
+\end{document}"""
+
+JD = "Backend engineer with Python, FastAPI and Docker experience."
+
+
+def make_app():
+    app = FastAPI()
+    app.include_router(job_router, prefix="/api")
+    app.dependency_overrides[get_supabase] = lambda: None
+    return app
+
+
+@pytest.fixture
+def queue(monkeypatch):
+    q = JobQueue(workers=2, max_queue=10, timeout=5, result_ttl=60, max_results=100)
+    monkeypatch.setattr(job_service, "jobs", q)
+    return q
+
+
+@pytest.fixture
+def fake_pipeline(monkeypatch):
+    async def fake_keywords(job_description, max_features=25, fallback_batch=None):
+        return ["Python", "FastAPI", "Docker"]
+
+    async def fake_rewrite(latex_resume, job_description, keywords, experiences=None, projects=None):
+        await asyncio.sleep(0.05)
+        return latex_resume.replace("Python", "Python and FastAPI")
+
+    monkeypatch.setattr(keyword_service, "extract_keywords_async", fake_keywords)
+    monkeypatch.setattr(rewrite_service, "rewrite_resume_with_gemini_async", fake_rewrite)
+
+
+def wait_for(client, job_id, timeout=5):
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        status = client.get(f"/api/jobs/{job_id}").json()
+        if status["status"] in ("done", "failed"):
+            return status
+        time.sleep(0.02)
+    raise AssertionError("job did not finish")
+
+
+def test_rewrite_job_returns_id_then_result(queue, fake_pipeline):
+    with TestClient(make_app()) as client:
+        res = client.post("/api/jobs/rewrite", data={"latex_content": RESUME, "job_description": JD})
+        assert res.status_code == 202
+        job_id = res.json()["job_id"]
+        assert res.headers["location"] == f"/api/jobs/{job_id}"
+
+        status = wait_for(client, job_id)
+        result = client.get(f"/api/jobs/{job_id}/result")
+
+    assert status["status"] == "done"
+    assert [s["stage"] for s in status["stages"]][:2] == ["result_store", "keywords"]
+    assert any(s["stage"] == "rewrite" and s["ms"] >= 40 for s in status["stages"])
+    assert result.status_code == 200
+    body = result.json()
+    assert "Python and FastAPI" in body["tailored_resume"]
+    assert body["ats_score"] > 0
+    assert queue.stats()["completed"] == 1
+
+
+def test_job_input_errors_fail_fast(queue):
+    with TestClient(make_app()) as client:
+        assert client.post("/api/jobs/rewrite", data={"job_description": JD}).status_code == 400
+        res = client.post("/api/jobs/rewrite", data={
+            "latex_content": RESUME, "job_description": JD, "rewrite_mode": "bogus"
+        })
+        assert res.status_code == 400
+    assert queue.submitted == 0
+
+
+def test_full_queue_returns_429(monkeypatch, fake_pipeline):
+    q = JobQueue(workers=1, max_queue=1, timeout=5, result_ttl=60, max_results=100)
+    monkeypatch.setattr(job_service, "jobs", q)
+
+    async def stuck_rewrite(*args, **kwargs):
+        await asyncio.sleep(10)
+
+    monkeypatch.setattr(rewrite_service, "rewrite_resume_with_gemini_async", stuck_rewrite)
+
+    with TestClient(make_app()) as client:
+        data = {"latex_content": RESUME, "job_description": JD}
+        first = client.post("/api/jobs/rewrite", data=data)    # picked up by the worker
+        time.sleep(0.05)
+        second = client.post("/api/jobs/rewrite", data=data)   # waits in the queue
+        third = client.post("/api/jobs/rewrite", data=data)
+
+        assert (first.status_code, second.status_code) == (202, 202)
+        assert third.status_code == 429
+        assert third.headers["retry-after"]
+        assert client.get(f"/api/jobs/{first.json()['job_id']}/result").status_code == 202
+        assert client.get(f"/api/jobs/{second.json()['job_id']}").json()["queue_position"] == 0
+        client.portal.call(q.shutdown)
+    assert q.rejected == 1
+
+
+def test_failed_job_reports_upstream_status(queue, fake_pipeline, monkeypatch):
+    async def unavailable(*args, **kwargs):
+        raise llm_client.CircuitOpenError("circuit open")
+
+    monkeypatch.setattr(rewrite_service, "rewrite_resume_with_gemini_async", unavailable)
+
+    with TestClient(make_app()) as client:
+        job_id = client.post("/api/jobs/rewrite", data={"latex_content": RESUME, "job_description": JD}).json()["job_id"]
+        status = wait_for(client, job_id)
+        result = client.get(f"/api/jobs/{job_id}/result")
+
+    assert status["status"] == "failed"
+    assert status["error"]["status_code"] == 503
+    assert result.status_code == 503
+    assert "circuit open" in result.json()["detail"]
+
+
+def test_unknown_or_foreign_jobs_are_not_found(queue):
+    async def go():
+        job = queue.submit("rewrite", lambda job: asyncio.sleep(0, "ok"), owner="user-a")
+        await asyncio.sleep(0.01)
+        return job
+
+    job = asyncio.run(go())
+    with TestClient(make_app()) as client:
+        assert client.get("/api/jobs/does-not-exist").status_code == 404
+        # Owned by a user: a guest can't read it
+        assert client.get(f"/api/jobs/{job.id}").status_code == 404
+
+
+def test_results_expire_after_ttl():
+    q = JobQueue(workers=1, max_queue=5, timeout=5, result_ttl=0.05, max_results=10)
+
+    async def go():
+        job = q.submit("rewrite", lambda job: asyncio.sleep(0, {"ok": True}))
+        await asyncio.sleep(0.01)
+        assert q.get(job.id).result == {"ok": True}
+        await asyncio.sleep(0.1)
+        found = q.get(job.id)
+        await q.shutdown()
+        return found
+
+    assert asyncio.run(go()) is None
+
+
+def test_job_timeout_marks_failure():
+    q = JobQueue(workers=1, max_queue=5, timeout=0.05, result_ttl=60, max_results=10)
+
+    async def go():
+        job = q.submit("rewrite", lambda job: asyncio.sleep(1))
+        await asyncio.sleep(0.2)
+        await q.shutdown()
+        return job
+
+    job = asyncio.run(go())
+    assert job.status == "failed"
+    assert job.error["status_code"] == 504
+
+
+def test_submit_rejects_when_full():
+    q = JobQueue(workers=0, max_queue=2, timeout=5, result_ttl=60, max_results=10)
+
+    async def go():
+        q.submit("rewrite", lambda job: asyncio.sleep(0))
+        q.submit("rewrite", lambda job: asyncio.sleep(0))
+        with pytest.raises(QueueFull):
+            q.submit("rewrite", lambda job: asyncio.sleep(0))
+
+    asyncio.run(go())
+    assert q.stats()["queued"] == 2
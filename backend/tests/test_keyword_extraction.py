@@ -0,0 +1,120 @@
+import asyncio
+import os
+import sys
+from types import SimpleNamespace
+
+import pytest
+
+# Add parent directory (backend/) to path
+sys.path.append(os.path.dirname(os.path.dirname(__file__)))
+
+from app.config import Config
+from app.services import cpu_pool, keyword_service, model_registry
+from app.services.model_registry import LazyResource
+
+NOUNS = {"pipelines", "dashboards", "analytics", "platform", "warehouse", "billing"}
+
+
+class FakeNLP:
+    """Tags known nouns as NOUN; records how it was called."""
+
+    def __init__(self):
+        self.calls = []
+        self.piped = []
+
+    def _doc(self, text):
+        return [SimpleNamespace(text=w, pos_="NOUN" if w.lower() in NOUNS else "VERB") for w in text.split()]
+
+    def __call__(self, text):
+        self.calls.append(text)
+        return self._doc(text)
+
+    def pipe(self, texts, batch_size=1000, n_process=1):
+        texts = list(texts)
+        self.piped.append((texts, batch_size, n_process))
+        return (self._doc(t) for t in texts)
+
+
+@pytest.fixture
+def fake_nlp(monkeypatch):
+    nlp = FakeNLP()
+    monkeypatch.setattr(model_registry, "spacy_nlp", LazyResource("spacy", lambda: nlp))
+    return nlp
+
+
+JDS = [
+    "Requirements: Python and Kafka for streaming pipelines and analytics dashboards.",
+    "Requirements: build the billing platform and data warehouse with Go and PostgreSQL.",
+    "Requirements: Python, Python, Docker, Kubernetes, Terraform, AWS.",
+]
+
+
+def test_batch_matches_per_document_results(fake_nlp):
+    single = [keyword_service.extract_keywords_fallback(jd, max_features=8) for jd in JDS]
+    batch = keyword_service.extract_keywords_fallback_batch(JDS, max_features=8, batch_size=2)
+
+    assert batch == single
+    assert single[0][:2] == ["Python", "Apache Kafka"]
+    assert "pipelines" in single[0]
+
+
+def test_batch_pipes_only_documents_that_need_general_terms(fake_nlp):
+    keyword_service.extract_keywords_fallback_batch(JDS, max_features=5, batch_size=16, n_process=1)
+
+    # The third JD fills all five slots from the taxonomy
+    [(texts, batch_size, n_process)] = fake_nlp.piped
+    assert len(texts) == 2
+    assert (batch_size, n_process) == (16, 1)
+    assert fake_nlp.calls == []
+
+
+def test_fallback_batch_tags_all_pending_jds_in_one_pipe(fake_nlp, monkeypatch):
+    async def gemini_down(job_description):
+        raise RuntimeError("Gemini unavailable")
+
+    monkeypatch.setattr(keyword_service, "extract_skills_with_gemini_async", gemini_down)
+    monkeypatch.setattr(cpu_pool, "_pool", None)   # run the fallback in a thread
+    keyword_service.keyword_cache.clear()
+    cached_jd = "Requirements: Rust and Redis."
+    keyword_service.keyword_cache.set(keyword_service.keyword_cache_key(cached_jd, 25), ["Rust", "Redis"])
+    batch = keyword_service.FallbackBatch(JDS + [cached_jd])
+
+    async def run():
+        return await asyncio.gather(*(
+            keyword_service.extract_keywords_async(jd, fallback_batch=batch) for jd in JDS + [cached_jd]
+        ))
+
+    results = asyncio.run(run())
+    keyword_service.keyword_cache.clear()
+
+    assert batch.job_descriptions == JDS
+    [(texts, _, n_process)] = fake_nlp.piped
+    assert texts == JDS and n_process == 1
+    assert fake_nlp.calls == []
+    assert results[:3] == [keyword_service.extract_keywords_fallback(jd) for jd in JDS]
+    assert all(keyword_service.is_fallback(r) for r in results[:3])
+    assert results[3] == ["Rust", "Redis"]
+
+
+def test_spacy_input_is_capped(fake_nlp, monkeypatch):
+    monkeypatch.setattr(Config, "SPACY_MAX_CHARS", 40)
+    keyword_service.extract_keywords_fallback(JDS[1] + " filler" * 1000, max_features=25)
+
+    assert len(fake_nlp.calls[0]) == 40
+
+
+def test_spacy_loads_only_the_tagging_components(monkeypatch):
+    spacy = pytest.importorskip("spacy")
+    seen = {}
+
+    def fake_load(name, **kwargs):
+        seen.update(kwargs, name=name)
+        return SimpleNamespace(max_length=1000)
+
+    monkeypatch.setattr(spacy, "load", fake_load)
+    monkeypatch.setattr(Config, "SPACY_MAX_CHARS", 5000)
+    nlp = model_registry._load_spacy()
+
+    assert seen["name"] == Config.SPACY_MODEL
+    assert {"parser", "ner", "lemmatizer"} <= set(seen["exclude"])
+    assert nlp.max_length == 5000
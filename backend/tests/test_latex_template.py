@@ -0,0 +1,80 @@
+import os
+import sys
+
+# Add parent directory (backend/) to path
+sys.path.append(os.path.dirname(os.path.dirname(__file__)))
+
+from app.services import latex_service
+from app.services.latex_service import CompiledTemplate, compile_template, template_values, wrap_in_template
+
+RESUME_TEXT = """Ada Lovelace
+ada@example.com +1 555 123 4567
+Education
+BSc Mathematics, University of London
+Experience
+- Wrote the first published algorithm
+- Annotated the Analytical Engine paper
+Projects
+- Bernoulli number generator
+Skills
+Python, LaTeX, 100% rigor
+"""
+
+USER_TEMPLATE = r"""
+\documentclass{article}
+\newcommand{\resumeItem}[1]{\item{#1}}
+\begin{document}
+{NAME} -- {CONTACT_LINE}
+\section{Experience}{EXP}
+\section{Skills}{SKILLS}
+\section{Again}{NAME}
+\end{document}
+"""
+
+
+def legacy_render(template: str, values: dict) -> str:
+    """The original chained str.replace rendering, kept as the oracle."""
+    out = template
+    for name in latex_service.PLACEHOLDERS:
+        out = out.replace("{" + name + "}", values[name])
+    return out
+
+
+def test_compiled_render_matches_chained_replace():
+    values = template_values(RESUME_TEXT)
+    for template in (latex_service.JAKE_BASE, USER_TEMPLATE.strip(), "no placeholders here"):
+        assert CompiledTemplate(template).render(values) == legacy_render(template, values)
+
+    assert latex_service.fill_jake_template_from_text(RESUME_TEXT) == \
+        legacy_render(latex_service.JAKE_BASE, values).strip()
+
+
+def test_placeholder_set_is_validated():
+    template = CompiledTemplate(USER_TEMPLATE)
+    assert template.placeholders == {"NAME", "CONTACT_LINE", "EXP", "SKILLS"}
+    assert template.missing == {"EDU", "PROJ"}
+    # LaTeX groups that only look like placeholders are left alone
+    assert CompiledTemplate(r"{#1} {Name} {EDUCATION}").placeholders == frozenset()
+
+
+def test_values_are_not_expanded_twice():
+    values = dict.fromkeys(latex_service.PLACEHOLDERS, "")
+    values["NAME"] = "{EDU}"
+    values["EDU"] = "education"
+    assert CompiledTemplate("{NAME}/{EDU}").render(values) == "{EDU}/education"
+
+
+def test_templates_are_cached_by_id_and_content():
+    latex_service.template_cache.clear()
+    first = compile_template(USER_TEMPLATE, "t1")
+    assert compile_template(USER_TEMPLATE, "t1") is first
+    # Same id, edited content: parsed again
+    edited = compile_template(USER_TEMPLATE + "% edited", "t1")
+    assert edited is not first
+    assert len(latex_service.template_cache) == 2
+
+    out = wrap_in_template(RESUME_TEXT, USER_TEMPLATE, "t1")
+    assert out.startswith(r"\documentclass{article}")
+    assert r"\resumeItem{Wrote the first published algorithm}" in out
+    assert r"100\% rigor" in out
+    assert "{NAME}" not in out
@@ -0,0 +1,179 @@
+import asyncio
+import os
+import sys
+import time
+
+import pytest
+
+# Add parent directory (backend/) to path
+sys.path.append(os.path.dirname(os.path.dirname(__file__)))
+
+from app.config import Config
+from app.services import cpu_pool, keyword_service, llm_client
+from app.services.llm_client import CircuitBreaker, CircuitOpenError, LLMBackend, LLMClient, LLMTimeout, TokenBucket
+from app.utils.singleflight import SingleFlight
+
+
+class FakeBackend(LLMBackend):
+    """Pluggable fake LLM: fixed latency, optional failure, counts calls."""
+
+    model_name = "fake"
+
+    def __init__(self, text="Python, FastAPI, Docker, Kafka", delay=0.0, fail=False):
+        self.text = text
+        self.delay = delay
+        self.fail = fail
+        self.calls = 0
+
+    async def generate(self, prompt):
+        self.calls += 1
+        await asyncio.sleep(self.delay)
+        if self.fail:
+            raise RuntimeError("503 Service Unavailable")
+        return self.text
+
+    async def stream(self, prompt):
+        for word in self.text.split():
+            await asyncio.sleep(self.delay)
+            yield word
+
+
+def make_client(backend, rate=1000, burst=1000, concurrency=8, timeout=5, failures=3, reset=30):
+    return LLMClient(
+        backend, rate=rate, burst=burst, concurrency=concurrency, timeout=timeout,
+        breaker=CircuitBreaker(failures, reset), flights=SingleFlight(),
+    )
+
+
+def test_token_bucket_limits_rate():
+    bucket = TokenBucket(rate=50, burst=2)
+
+    async def take(n):
+        for _ in range(n):
+            await bucket.acquire()
+
+    start = time.perf_counter()
+    asyncio.run(take(7))   # 2 from the burst, 5 more at 50/s
+    assert time.perf_counter() - start >= 0.09
+    assert bucket.waits >= 5
+
+
+def test_concurrency_is_bounded():
+    backend = FakeBackend(delay=0.05)
+    client = make_client(backend, concurrency=2)
+    peak = []
+
+    async def watch():
+        for _ in range(10):
+            peak.append(client.in_flight)
+            await asyncio.sleep(0.01)
+
+    async def run():
+        await asyncio.gather(watch(), *(client.generate(f"prompt {i}") for i in range(6)))
+
+    asyncio.run(run())
+    assert max(peak) == 2
+    assert backend.calls == 6
+
+
+def test_breaker_trips_fails_fast_and_recovers():
+    backend = FakeBackend(fail=True)
+    client = make_client(backend, failures=3, reset=0.05)
+
+    async def attempt(prompt="p"):
+        try:
+            return await client.generate(prompt)
+        except Exception as e:
+            return e
+
+    async def run():
+        results = [await attempt() for _ in range(5)]
+        assert [type(r) for r in results] == [RuntimeError] * 3 + [CircuitOpenError] * 2
+        assert backend.calls == 3
+        assert client.breaker.state == "open"
+
+        await asyncio.sleep(0.06)
+        backend.fail = False
+        assert await attempt() == backend.text      # half-open trial succeeds
+        assert client.breaker.state == "closed"
+
+    asyncio.run(run())
+    assert client.breaker.stats()["trips"] == 1
+
+
+def test_timeouts_count_as_failures():
+    client = make_client(FakeBackend(delay=0.2), failures=1)
+
+    with pytest.raises(LLMTimeout):
+        asyncio.run(client.generate("p", timeout=0.01))
+    assert client.stats()["timeouts"] == 1
+    assert client.breaker.state == "open"
+
+
+def test_stream_goes_through_the_client():
+    client = make_client(FakeBackend(text="a b c"))
+
+    async def collect():
+        return [chunk async for chunk in client.stream("p")]
+
+    assert asyncio.run(collect()) == ["a", "b", "c"]
+    assert client.stats()["calls"] == 1
+
+
+# -------------------- hedged keyword extraction --------------------
+
+@pytest.fixture
+def local_keywords(monkeypatch):
+    calls = []
+
+    def fake_fallback(job_description, max_features=25):
+        calls.append(job_description)
+        time.sleep(0.02)
+        return ["local", "keywords"]
+
+    monkeypatch.setattr(keyword_service, "extract_keywords_fallback", fake_fallback)
+    monkeypatch.setattr(cpu_pool, "_pool", None)   # run the fallback in a thread
+    keyword_service.keyword_cache.clear()
+    return calls
+
+
+def test_fast_gemini_wins_without_starting_the_local_extractor(monkeypatch, local_keywords):
+    monkeypatch.setattr(llm_client, "gemini", make_client(FakeBackend(delay=0.01)))
+    monkeypatch.setattr(Config, "KEYWORD_HEDGE_DEADLINE", 1.0)
+
+    result = asyncio.run(keyword_service.extract_keywords_async("JD fast"))
+    assert result == ["Python", "FastAPI", "Docker", "Kafka"]
+    assert local_keywords == []
+
+
+def test_slow_gemini_is_hedged_by_the_local_extractor(monkeypatch, local_keywords):
+    backend = FakeBackend(delay=0.5)
+    monkeypatch.setattr(llm_client, "gemini", make_client(backend))
+    monkeypatch.setattr(Config, "KEYWORD_HEDGE_DEADLINE", 0.05)
+
+    async def run():
+        start = time.perf_counter()
+        result = await keyword_service.extract_keywords_async("JD slow")
+        elapsed = time.perf_counter() - start
+        # Gemini keeps running in the background and replaces the fallback in the cache
+        await asyncio.sleep(0.6)
+        return result, elapsed
+
+    result, elapsed = asyncio.run(run())
+    assert result == ["local", "keywords"]
+    assert elapsed < 0.3
+    key = keyword_service.keyword_cache_key("JD slow", 25)
+    assert keyword_service.keyword_cache.get(key) == ["Python", "FastAPI", "Docker", "Kafka"]
+
+
+def test_open_circuit_goes_straight_to_the_local_extractor(monkeypatch, local_keywords):
+    backend = FakeBackend(fail=True)
+    client = make_client(backend, failures=1)
+    client.breaker.record_failure()
+    monkeypatch.setattr(llm_client, "gemini", client)
+    monkeypatch.setattr(Config, "KEYWORD_HEDGE_DEADLINE", 5.0)
+
+    start = time.perf_counter()
+    assert asyncio.run(keyword_service.extract_keywords_async("JD outage")) == ["local", "keywords"]
+    assert time.perf_counter() - start < 1.0
+    assert backend.calls == 0
@@ -0,0 +1,143 @@
+import asyncio
+import os
+import sys
+
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+# Add parent directory (backend/) to path
+sys.path.append(os.path.dirname(os.path.dirname(__file__)))
+
+from app.routes.metrics import router as metrics_router
+from app.routes.resume_routes import router as resume_router
+from app.services import keyword_service, rewrite_service, llm_client
+from app.services.supabase_service import get_supabase
+from app.utils import metrics
+from app.utils.metrics import Counter, Histogram, ServerTimingMiddleware, server_timing, timed
+
+RESUME = r"""\documentclass{article}
+\begin{document}
+\section{Experience}
+\resumeItem{Built services in Python}
+\end{document}"""
+
+JD = "Backend engineer with Python, FastAPI and Docker experience."
+
+
+def make_app():
+    app = FastAPI()
+    app.add_middleware(ServerTimingMiddleware)
+    app.include_router(resume_router, prefix="/api")
+    app.include_router(metrics_router)
+    app.dependency_overrides[get_supabase] = lambda: None
+    return app
+
+
+@pytest.fixture
+def fake_pipeline(monkeypatch):
+    async def fake_keywords(job_description, max_features=25, fallback_batch=None):
+        return ["Python", "FastAPI", "Docker"]
+
+    async def fake_rewrite(latex_resume, job_description, keywords, experiences=None, projects=None):
+        await asyncio.sleep(0.01)
+        return latex_resume.replace("Python", "Python and FastAPI")
+
+    monkeypatch.setattr(keyword_service, "extract_keywords_async", fake_keywords)
+    monkeypatch.setattr(rewrite_service, "rewrite_resume_with_gemini_async", fake_rewrite)
+
+
+def test_histogram_buckets_are_cumulative():
+    h = Histogram("t_seconds", "test", "stage", buckets=(0.1, 1))
+    h.observe("parse", 0.05)
+    h.observe("parse", 0.5)
+    h.observe("parse", 5)
+    text = "\n".join(h.render())
+
+    assert 't_seconds_bucket{stage="parse",le="0.1"} 1' in text
+    assert 't_seconds_bucket{stage="parse",le="1"} 2' in text
+    assert 't_seconds_bucket{stage="parse",le="+Inf"} 3' in text
+    assert 't_seconds_count{stage="parse"} 3' in text
+    assert h.snapshot()["parse"]["sum"] == pytest.approx(5.55)
+
+
+def test_counter_and_server_timing_format():
+    c = Counter("t_total", "test", "reason")
+    c.inc("slow")
+    c.inc("slow")
+    assert c.get("slow") == 2
+    assert 't_total{reason="slow"} 2' in c.render()
+
+    assert server_timing([("parse", 0.0123), ("rewrite", 1.5)], total=2) == (
+        "parse;dur=12.3, rewrite;dur=1500.0, total;dur=2000.0"
+    )
+
+
+def test_timed_outside_a_request_only_feeds_the_histogram():
+    before = metrics.stage_seconds.snapshot().get("unit_test", {"count": 0})["count"]
+    with timed("unit_test"):
+        pass
+    assert metrics.stage_seconds.snapshot()["unit_test"]["count"] == before + 1
+
+
+def test_rewrite_response_carries_server_timing(fake_pipeline):
+    with TestClient(make_app()) as client:
+        res = client.post("/api/rewrite", data={"latex_content": RESUME, "job_description": JD})
+
+    assert res.status_code == 200
+    header = res.headers["server-timing"]
+    stages = [part.split(";")[0] for part in header.split(", ")]
+    assert stages[0] == "parse"
+    assert {"keywords", "rewrite", "score", "total"} <= set(stages)
+    rewrite_ms = float(header.split("rewrite;dur=")[1].split(",")[0])
+    assert rewrite_ms >= 10
+
+
+def test_metrics_endpoint_exposes_stages_caches_and_llm(fake_pipeline, monkeypatch):
+    monkeypatch.setattr(metrics, "keyword_fallbacks", Counter(
+        "resumatch_keyword_fallbacks_total", "test", "reason"
+    ))
+    metrics.keyword_fallbacks.inc("gemini_slow")
+
+    with TestClient(make_app()) as client:
+        client.post("/api/rewrite", data={"latex_content": RESUME, "job_description": JD})
+        res = client.get("/metrics")
+
+    assert res.status_code == 200
+    assert res.headers["content-type"].startswith("text/plain")
+    text = res.text
+    assert "# TYPE resumatch_stage_seconds histogram" in text
+    assert 'resumatch_stage_seconds_count{stage="rewrite"}' in text
+    assert 'resumatch_keyword_fallbacks_total{reason="gemini_slow"} 1' in text
+    assert 'resumatch_cache_hits_total{cache="keywords_memory"}' in text
+    assert 'resumatch_cache_entries{cache="templates"}' in text
+    assert 'resumatch_llm_calls_total{outcome="started"}' in text
+    assert f'resumatch_llm_in_flight{{model="{llm_client.gemini.backend.model_name}"}} 0' in text
+    assert 'resumatch_singleflight_calls_total{kind="coalesced"}' in text
+
+
+def test_keyword_hedge_counts_slow_gemini(monkeypatch):
+    counter = Counter("t_fallbacks_total", "test", "reason")
+    monkeypatch.setattr(keyword_service, "keyword_fallbacks", counter)
+    monkeypatch.setattr(keyword_service.Config, "KEYWORD_HEDGE_DEADLINE", 0.01)
+    keyword_service.keyword_cache.clear()
+
+    async def slow_gemini(job_description):
+        await asyncio.sleep(1)
+        return ["Python"]
+
+    async def quick_fallback(fn, *args):
+        return ["python", "docker"]
+
+    monkeypatch.setattr(keyword_service, "extract_skills_with_gemini_async", slow_gemini)
+    monkeypatch.setattr(keyword_service.cpu_pool, "run", quick_fallback)
+
+    async def go():
+        result = await keyword_service.extract_keywords_async(JD + " metrics")
+        for task in list(keyword_service._background):
+            task.cancel()
+        return result
+
+    assert asyncio.run(go()) == ["python", "docker"]
+    assert counter.get("gemini_slow") == 1
+    assert counter.get("gemini_failed") == 0
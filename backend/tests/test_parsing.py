@@ -0,0 +1,194 @@
+import asyncio
+import io
+import os
+import sys
+import tempfile
+import tracemalloc
+import zipfile
+
+import pytest
+from fastapi import FastAPI, UploadFile as FastAPIUploadFile
+from fastapi.testclient import TestClient
+from starlette.datastructures import UploadFile
+
+# Add parent directory (backend/) to path
+sys.path.append(os.path.dirname(os.path.dirname(__file__)))
+
+from app.services import parsing_service
+from app.services.parsing_service import extract_text_from_resume, UploadTooLargeError
+from app.utils.body_limit import BodyLimitMiddleware
+
+
+class GeneratedStream:
+    """Readable stream of `size` bytes produced on demand (no big source buffer)."""
+
+    def __init__(self, size):
+        self.remaining = size
+        self.consumed = 0
+
+    def read(self, n=-1):
+        n = self.remaining if n < 0 else min(n, self.remaining)
+        self.remaining -= n
+        self.consumed += n
+        return b"x" * n
+
+
+def make_docx(text: str) -> bytes:
+    document = (
+        '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>'
+        '<w:document xmlns:w="http://schemas.openxmlformats.org/wordprocessingml/2006/main">'
+        f"<w:body><w:p><w:r><w:t>{text}</w:t></w:r></w:p></w:body></w:document>"
+    )
+    buf = io.BytesIO()
+    with zipfile.ZipFile(buf, "w") as z:
+        z.writestr("word/document.xml", document)
+    return buf.getvalue()
+
+
+def make_pdf(text: str, padding: int = 0) -> bytes:
+    """One-page PDF showing `text`; `padding` bytes of comment lines make it as large as needed."""
+    stream = f"BT /F1 12 Tf 72 720 Td ({text}) Tj ET".encode()
+    objects = [
+        b"<< /Type /Catalog /Pages 2 0 R >>",
+        b"<< /Type /Pages /Kids [3 0 R] /Count 1 >>",
+        b"<< /Type /Page /Parent 2 0 R /MediaBox [0 0 612 792] /Contents 4 0 R "
+        b"/Resources << /Font << /F1 5 0 R >> >> >>",
+        b"<< /Length %d >>\nstream\n" % len(stream) + stream + b"\nendstream",
+        b"<< /Type /Font /Subtype /Type1 /BaseFont /Helvetica >>",
+    ]
+    out = bytearray(b"%PDF-1.4\n")
+    out += (b"%" + b"0" * 1022 + b"\n") * (padding // 1024)
+    offsets = []
+    for i, body in enumerate(objects, start=1):
+        offsets.append(len(out))
+        out += b"%d 0 obj\n" % i + body + b"\nendobj\n"
+    xref = len(out)
+    out += b"xref\n0 %d\n0000000000 65535 f \n" % (len(objects) + 1)
+    for off in offsets:
+        out += b"%010d 00000 n \n" % off
+    out += b"trailer\n<< /Size %d /Root 1 0 R >>\nstartxref\n%d\n%%%%EOF\n" % (len(objects) + 1, xref)
+    return bytes(out)
+
+
+def test_declared_size_rejected_without_reading(monkeypatch):
+    monkeypatch.setattr(parsing_service.Config, "MAX_UPLOAD_BYTES", 1024)
+    stream = GeneratedStream(4096)
+    upload = UploadFile(file=stream, filename="resume.pdf", size=4096)
+
+    with pytest.raises(UploadTooLargeError):
+        extract_text_from_resume(upload)
+    assert stream.consumed == 0
+
+
+def test_pdf_and_docx_extraction_leave_no_temp_files():
+    before = set(os.listdir(tempfile.gettempdir()))
+
+    pdf = UploadFile(file=io.BytesIO(make_pdf("Jane Doe Python Engineer")), filename="Resume.PDF")
+    docx = UploadFile(file=io.BytesIO(make_docx("Jane Doe FastAPI Developer")), filename="resume.docx")
+
+    assert "Jane Doe Python Engineer" in extract_text_from_resume(pdf)
+    assert extract_text_from_resume(docx) == "Jane Doe FastAPI Developer"
+    assert set(os.listdir(tempfile.gettempdir())) == before
+
+
+def test_unsupported_type_rejected():
+    with pytest.raises(ValueError, match="Unsupported file type"):
+        extract_text_from_resume(UploadFile(file=io.BytesIO(b"hi"), filename="resume.txt"))
+
+
+def limited_app(max_bytes):
+    app = FastAPI()
+    received = []
+
+    @app.post("/upload")
+    async def upload(resume: FastAPIUploadFile):
+        received.append(resume.filename)
+        return {"ok": True}
+
+    return BodyLimitMiddleware(app, max_bytes=max_bytes), received
+
+
+def test_oversized_body_rejected_before_parsing():
+    app, received = limited_app(64 * 1024)
+    with TestClient(app) as client:
+        declared = client.post("/upload", files={"resume": ("r.pdf", b"x" * 200_000, "application/pdf")})
+        small = client.post("/upload", files={"resume": ("r.pdf", b"x" * 1000, "application/pdf")})
+
+    assert declared.status_code == 413
+    assert "limit" in declared.json()["detail"]
+    assert small.status_code == 200
+    assert received == ["r.pdf"]
+
+
+def test_streamed_body_cut_off_at_the_limit():
+    app, received = limited_app(64 * 1024)
+    stream = GeneratedStream(50 * 1024 * 1024)
+    sent = []
+
+    preamble = [b'--x\r\nContent-Disposition: form-data; name="resume"; filename="r.pdf"\r\n\r\n']
+
+    async def receive():
+        chunk = preamble.pop() if preamble else stream.read(16 * 1024)
+        return {"type": "http.request", "body": chunk, "more_body": stream.remaining > 0}
+
+    async def send(message):
+        sent.append(message)
+
+    # Chunked transfer: no Content-Length to check up front
+    scope = {
+        "type": "http", "method": "POST", "path": "/upload", "raw_path": b"/upload", "query_string": b"",
+        "headers": [(b"content-type", b"multipart/form-data; boundary=x")],
+        "http_version": "1.1", "scheme": "http", "server": ("test", 80), "client": ("test", 1), "root_path": "",
+    }
+    asyncio.run(app(scope, receive, send))
+
+    assert sent[0]["status"] == 413
+    assert stream.consumed <= 64 * 1024 + 16 * 1024
+    assert received == []
+
+
+def test_large_upload_peak_memory_is_bounded():
+    size = 8 * 1024 * 1024
+    pdf = make_pdf("Jane Doe Python Engineer", padding=size)
+    boundary = b"x"
+    parts = [
+        b"--x\r\nContent-Disposition: form-data; name=\"resume\"; filename=\"r.pdf\"\r\n"
+        b"Content-Type: application/pdf\r\n\r\n",
+        *(pdf[i:i + 64 * 1024] for i in range(0, len(pdf), 64 * 1024)),
+        b"\r\n--" + boundary + b"--\r\n",
+    ]
+    texts, sent = [], []
+
+    app = FastAPI()
+
+    @app.post("/upload")
+    async def upload(resume: FastAPIUploadFile):
+        texts.append(extract_text_from_resume(resume))
+        return {"ok": True}
+
+    limited = BodyLimitMiddleware(app, max_bytes=16 * 1024 * 1024)
+
+    async def receive():
+        chunk = parts.pop(0)
+        return {"type": "http.request", "body": chunk, "more_body": bool(parts)}
+
+    async def send(message):
+        sent.append(message)
+
+    scope = {
+        "type": "http", "method": "POST", "path": "/upload", "raw_path": b"/upload", "query_string": b"",
+        "headers": [(b"content-type", b"multipart/form-data; boundary=x"), (b"content-length", str(sum(map(len, parts))).encode())],
+        "http_version": "1.1", "scheme": "http", "server": ("test", 80), "client": ("test", 1), "root_path": "",
+    }
+    # The request body is already in memory (the client's copy); count what the server allocates
+    tracemalloc.start()
+    try:
+        asyncio.run(limited(scope, receive, send))
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+
+    assert sent[0]["status"] == 200
+    assert "Jane Doe Python Engineer" in texts[0]
+    # Starlette spools past 1 MB to disk and pdfminer seeks: an 8 MB upload stays far below its size
+    assert peak < 3 * 1024 * 1024
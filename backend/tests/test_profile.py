@@ -0,0 +1,151 @@
+import asyncio
+import os
+import sys
+
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+# Add parent directory (backend/) to path
+sys.path.append(os.path.dirname(os.path.dirname(__file__)))
+
+from test_supabase import PostgrestStub, make_client
+from app.routes.resume_routes import router as resume_router
+from app.routes.user_data_routes import router as user_data_router
+from app.services import keyword_service, rewrite_service, profile_service
+from app.services.supabase_service import get_supabase
+from app.utils.auth import get_current_user, get_optional_user
+from app.utils.cache import SQLiteCache, TTLCache
+
+RESUME = r"""\documentclass{article}
+\begin{document}
+\resumeItem{Built services in Python}
+\end{document}"""
+
+
+def make_app(client):
+    app = FastAPI()
+    app.include_router(resume_router, prefix="/api")
+    app.include_router(user_data_router, prefix="/api")
+    app.dependency_overrides[get_current_user] = lambda: {"sub": "u1"}
+    app.dependency_overrides[get_optional_user] = lambda: {"sub": "u1"}
+    app.dependency_overrides[get_supabase] = lambda: client
+    return app
+
+
+def test_returning_user_rewrite_makes_no_supabase_reads(monkeypatch):
+    seen = []
+
+    async def fake_keywords(job_description, max_features=25, fallback_batch=None):
+        return ["Python", "Docker", "Kafka"]
+
+    async def fake_rewrite(latex_resume, job_description, keywords, experiences=None, projects=None):
+        seen.append(([e["company"] for e in experiences], [p["name"] for p in projects]))
+        return latex_resume
+
+    monkeypatch.setattr(keyword_service, "extract_keywords_async", fake_keywords)
+    monkeypatch.setattr(rewrite_service, "rewrite_resume_with_gemini_async", fake_rewrite)
+    profile_service.profile_cache.clear()
+
+    stub = PostgrestStub()
+    form = {"latex_content": RESUME, "job_description": "Python and Docker"}
+
+    def reads():
+        return sum(1 for c in stub.calls if c.method == "GET")
+
+    with TestClient(make_app(make_client(stub))) as http:
+        http.post("/api/experiences/add", data={"company": "Acme", "bullets_json": "[]"})
+        http.post("/api/projects/add", data={"name": "Parser", "tech_stack_json": "[]", "bullets_json": "[]"})
+
+        assert http.post("/api/rewrite", data=form).status_code == 200
+        assert reads() == 2
+
+        # Bypass the tailored-result store so the rewrite runs again
+        http.post("/api/rewrite", data={**form, "bypass_cache": "true"})
+        assert reads() == 2  # served from the profile cache
+
+        # Write-through: adding an experience refreshes experiences only
+        http.post("/api/experiences/add", data={"company": "Globex", "bullets_json": "[]"})
+        http.post("/api/rewrite", data=form)
+        assert reads() == 3
+
+    assert seen == [(["Acme"], ["Parser"])] * 2 + [(["Acme", "Globex"], ["Parser"])]
+
+
+def test_template_cached_and_dropped_on_delete():
+    profile_service.profile_cache.clear()
+    stub = PostgrestStub()
+    stub.tables["resume_templates"] = [{"id": "7", "user_id": "u1", "latex": "TPL"}]
+    client = make_client(stub)
+
+    async def run():
+        first = await profile_service.get_template_latex(client, "u1", "7")
+        second = await profile_service.get_template_latex(client, "u1", "7")
+        other_user = await profile_service.get_template_latex(client, "u2", "7")
+        stub.tables["resume_templates"] = []
+        profile_service.invalidate("u1", "resume_templates", "7")
+        after_delete = await profile_service.get_template_latex(client, "u1", "7")
+        return first, second, other_user, after_delete
+
+    assert asyncio.run(run()) == ("TPL", "TPL", None, None)
+    assert len(stub.calls) == 3
+
+
+class RacingStub(PostgrestStub):
+    """A concurrent add_project commits right after each read is served."""
+
+    race = True
+
+    def handler(self, request):
+        response = super().handler(request)
+        if self.race:
+            self.tables["projects"].append({"id": "2", "user_id": "u1", "name": "New"})
+            profile_service.invalidate("u1", "projects")
+            self.race = False
+        return response
+
+
+def test_fetch_racing_a_write_is_not_cached():
+    profile_service.profile_cache.clear()
+    stub = RacingStub()
+    stub.tables["projects"] = [{"id": "1", "user_id": "u1", "name": "Old"}]
+    client = make_client(stub)
+
+    async def run():
+        stale = await profile_service.get_user_rows(client, "u1", "projects")
+        fresh = await profile_service.get_user_rows(client, "u1", "projects")
+        return stale, fresh
+
+    stale, fresh = asyncio.run(run())
+    assert [p["name"] for p in stale] == ["Old"]
+    assert [p["name"] for p in fresh] == ["Old", "New"]
+
+
+def test_write_in_another_worker_invalidates_this_workers_cache(tmp_path, monkeypatch):
+    profile_service.profile_cache.clear()
+    stamps = str(tmp_path / "profile_stamps.db")
+    monkeypatch.setattr(profile_service, "_stamps", SQLiteCache(stamps, table="profile_stamps"))
+    stub = PostgrestStub()
+    stub.tables["projects"] = [{"id": "1", "user_id": "u1", "name": "Old"}]
+    client = make_client(stub)
+
+    def write_in_other_worker():
+        # Its own in-process caches; only the stamp file is shared
+        stub.tables["projects"].append({"id": "2", "user_id": "u1", "name": "New"})
+        with monkeypatch.context() as other:
+            other.setattr(profile_service, "profile_cache", TTLCache(max_entries=8, ttl=600))
+            other.setattr(profile_service, "_invalidated", TTLCache(max_entries=8, ttl=300))
+            other.setattr(profile_service, "_stamps", SQLiteCache(stamps, table="profile_stamps"))
+            profile_service.invalidate("u1", "projects")
+
+    async def run():
+        first = await profile_service.get_user_rows(client, "u1", "projects")
+        cached = await profile_service.get_user_rows(client, "u1", "projects")
+        write_in_other_worker()
+        after_write = await profile_service.get_user_rows(client, "u1", "projects")
+        cached_again = await profile_service.get_user_rows(client, "u1", "projects")
+        return first, cached, after_write, cached_again
+
+    first, cached, after_write, cached_again = asyncio.run(run())
+    assert len(first) == len(cached) == 1
+    assert [p["name"] for p in after_write] == [p["name"] for p in cached_again] == ["Old", "New"]
+    assert len(stub.calls) == 2
@@ -0,0 +1,173 @@
+import asyncio
+import os
+import sqlite3
+import sys
+import time
+
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+# Add parent directory (backend/) to path
+sys.path.append(os.path.dirname(os.path.dirname(__file__)))
+
+from app.config import Config
+from app.routes import resume_routes
+from app.routes.resume_routes import router as resume_router
+from app.services import keyword_service, rewrite_service, result_store, llm_client
+from app.services.supabase_service import get_supabase
+from app.utils.cache import TTLCache, SQLiteCache, TieredCache
+
+RESUME = r"""\documentclass{article}
+\begin{document}
+\section{Experience}
+\resumeItem{Built services in Python}
+\end{document}"""
+
+JD = "Backend engineer with Python, FastAPI and Docker experience."
+
+
+def make_app():
+    app = FastAPI()
+    app.include_router(resume_router, prefix="/api")
+    app.dependency_overrides[get_supabase] = lambda: None
+    return app
+
+
+@pytest.fixture
+def counting_pipeline(monkeypatch):
+    calls = {"keywords": 0, "rewrite": 0}
+
+    async def fake_keywords(job_description, max_features=25, fallback_batch=None):
+        calls["keywords"] += 1
+        return ["Python", "FastAPI", "Docker"]
+
+    async def fake_rewrite(latex_resume, job_description, keywords, experiences=None, projects=None):
+        calls["rewrite"] += 1
+        return latex_resume.replace("Python", f"Python and FastAPI (v{calls['rewrite']})")
+
+    monkeypatch.setattr(keyword_service, "extract_keywords_async", fake_keywords)
+    monkeypatch.setattr(rewrite_service, "rewrite_resume_with_gemini_async", fake_rewrite)
+    return calls
+
+
+def test_repeat_rewrite_is_served_from_the_store(counting_pipeline):
+    form = {"latex_content": RESUME, "job_description": JD}
+    with TestClient(make_app()) as client:
+        first = client.post("/api/rewrite", data=form).json()
+        second = client.post("/api/rewrite", data=form).json()
+        other_jd = client.post("/api/rewrite", data={**form, "job_description": JD + " Kafka."}).json()
+
+    assert first["cached"] is False
+    assert second["cached"] is True
+    assert {k: v for k, v in second.items() if k != "cached"} == {k: v for k, v in first.items() if k != "cached"}
+    assert other_jd["cached"] is False
+    assert counting_pipeline == {"keywords": 2, "rewrite": 2}
+
+
+def test_bypass_flag_regenerates_and_refreshes_the_store(counting_pipeline):
+    form = {"latex_content": RESUME, "job_description": JD}
+    with TestClient(make_app()) as client:
+        client.post("/api/rewrite", data=form)
+        fresh = client.post("/api/rewrite", data={**form, "bypass_cache": "true"}).json()
+        again = client.post("/api/rewrite", data=form).json()
+
+    assert fresh["cached"] is False
+    assert "(v2)" in fresh["tailored_resume"]
+    assert again["cached"] is True
+    assert "(v2)" in again["tailored_resume"]
+    assert counting_pipeline["rewrite"] == 2
+
+
+def test_key_covers_profile_mode_model_and_prompt_version(monkeypatch):
+    base = result_store.result_key(RESUME, JD, "full", [{"company": "Acme"}], [])
+    assert base == result_store.result_key(RESUME, JD, "full", [{"company": "Acme"}], [])
+    assert base != result_store.result_key(RESUME, JD, "full", [{"company": "Globex"}], [])
+    assert base != result_store.result_key(RESUME, JD, "sections", [{"company": "Acme"}], [])
+
+    monkeypatch.setattr(result_store, "PROMPT_VERSION", "next")
+    assert base != result_store.result_key(RESUME, JD, "full", [{"company": "Acme"}], [])
+    monkeypatch.undo()
+
+    monkeypatch.setattr(llm_client.gemini.backend, "model_name", "other-model")
+    assert base != result_store.result_key(RESUME, JD, "full", [{"company": "Acme"}], [])
+
+
+def test_disk_tier_serves_results_after_restart(tmp_path, counting_pipeline, monkeypatch):
+    path = str(tmp_path / "results.db")
+    monkeypatch.setattr(result_store, "results", TieredCache(TTLCache(ttl=60), SQLiteCache(path, table="tailored_results")))
+    form = {"latex_content": RESUME, "job_description": JD}
+    with TestClient(make_app()) as client:
+        client.post("/api/rewrite", data=form)
+
+    # New process: empty memory tier, same database file
+    monkeypatch.setattr(result_store, "results", TieredCache(TTLCache(ttl=60), SQLiteCache(path, table="tailored_results")))
+    with TestClient(make_app()) as client:
+        res = client.post("/api/rewrite", data=form).json()
+
+    assert res["cached"] is True
+    assert res["keywords"] == ["Python", "FastAPI", "Docker"]
+    assert res["ats_score"] > 0
+    assert counting_pipeline["rewrite"] == 1
+
+
+def test_keywords_overlap_the_profile_fetch_and_stop_on_a_hit(monkeypatch, counting_pipeline):
+    finished = []
+
+    async def slow_keywords(job_description, max_features=25, fallback_batch=None):
+        await asyncio.sleep(0.3)
+        finished.append(job_description)
+        return ["Python", "FastAPI", "Docker"]
+
+    async def slow_profile(user_id, supabase):
+        await asyncio.sleep(0.2)
+        return [{"company": "Acme"}], []
+
+    monkeypatch.setattr(keyword_service, "extract_keywords_async", slow_keywords)
+    monkeypatch.setattr(resume_routes, "load_profile", slow_profile)
+
+    async def go():
+        start = time.perf_counter()
+        first = await resume_routes.run_rewrite(RESUME, JD, "full", "user-1", None)
+        elapsed = time.perf_counter() - start
+        second = await resume_routes.run_rewrite(RESUME, JD, "full", "user-1", None)
+        await asyncio.sleep(0.3)   # a leaked keyword task would finish here
+        return first, elapsed, second
+
+    first, elapsed, second = asyncio.run(go())
+    assert elapsed < 0.45   # not 0.2 + 0.3 back to back
+    assert (first["cached"], second["cached"]) == (False, True)
+    assert finished == [JD]
+
+
+def test_results_on_fallback_keywords_expire_quickly(monkeypatch, counting_pipeline):
+    async def fallback_keywords(job_description, max_features=25, fallback_batch=None):
+        return keyword_service.FallbackKeywords(["Python", "FastAPI"])
+
+    monkeypatch.setattr(keyword_service, "extract_keywords_async", fallback_keywords)
+    monkeypatch.setattr(Config, "KEYWORD_FALLBACK_TTL", 0.05)
+    form = {"latex_content": RESUME, "job_description": JD}
+    with TestClient(make_app()) as client:
+        client.post("/api/rewrite", data=form)
+        time.sleep(0.1)
+        again = client.post("/api/rewrite", data=form).json()
+
+    assert again["cached"] is False
+    assert counting_pipeline["rewrite"] == 2
+
+
+def test_store_failures_never_fail_the_rewrite(monkeypatch, counting_pipeline):
+    def locked(*args, **kwargs):
+        raise sqlite3.OperationalError("database is locked")
+
+    def disk_full(*args, **kwargs):
+        raise sqlite3.OperationalError("database or disk is full")
+
+    monkeypatch.setattr(result_store.results, "get", locked)
+    monkeypatch.setattr(result_store.results, "set", disk_full)
+    with TestClient(make_app()) as client:
+        res = client.post("/api/rewrite", data={"latex_content": RESUME, "job_description": JD})
+
+    assert res.status_code == 200
+    assert res.json()["cached"] is False
+    assert counting_pipeline == {"keywords": 1, "rewrite": 1}
@@ -0,0 +1,80 @@
+import os
+import sys
+
+# Add parent directory (backend/) to path
+sys.path.append(os.path.dirname(os.path.dirname(__file__)))
+
+from app.services import latex_service, score_service
+from app.services.resume_parser import Entry, parse_resume
+
+RESUME_TEXT = """Grace Hopper
+grace_hopper@example.com | +1 (555) 010-2030 | https://github.com/ghopper
+EDUCATION
+PhD Mathematics, Yale
+Experience
+Rear Admiral, US Navy
+- Led the COBOL standardization effort
+- Popularized the term "debugging"
+
+Senior Mathematician, Eckert-Mauchly
+* Wrote the A-0 compiler
+Technical Skills: COBOL, FLOW-MATIC, 100% grit
+Experience
+Lecturer, Vassar
+"""
+
+
+def test_parses_contact_sections_entries_and_bullets():
+    doc = parse_resume(RESUME_TEXT)
+
+    assert doc.contact["name"] == "Grace Hopper"
+    assert doc.contact["email"] == "grace_hopper@example.com"
+    assert doc.contact["github"] == "https://github.com/ghopper"
+    assert list(doc.sections) == ["Education", "Experience", "Technical Skills"]
+    assert doc.sections["Experience"].entries == [
+        Entry("Rear Admiral, US Navy", ["Led the COBOL standardization effort", 'Popularized the term "debugging"']),
+        Entry("Senior Mathematician, Eckert-Mauchly", ["Wrote the A-0 compiler"]),
+        Entry("Lecturer, Vassar"),   # repeated header reopens the section
+    ]
+    assert doc.section("Skills", "Technical Skills").entries == [Entry("COBOL, FLOW-MATIC, 100% grit")]
+
+
+def test_header_words_inside_lines_do_not_start_sections():
+    doc = parse_resume("Name\nExperience\nExperienced in research and leadership\n- Projects shipped: 4")
+    assert list(doc.sections) == ["Experience"]
+    assert doc.sections["Experience"].entries == [
+        Entry("Experienced in research and leadership", ["Projects shipped: 4"])
+    ]
+
+
+def test_rendering_from_document():
+    doc = parse_resume(RESUME_TEXT)
+    values = latex_service.template_values(doc)
+
+    assert values["CONTACT_LINE"] == r"+1 (555) 010-2030 | grace\_hopper@example.com | https://github.com/ghopper"
+    assert values["EXP"].splitlines()[:4] == [
+        "Rear Admiral, US Navy",
+        r"\resumeItemListStart",
+        r"\resumeItem{Led the COBOL standardization effort}",
+        r'\resumeItem{Popularized the term "debugging"}',
+    ]
+    assert values["SKILLS"] == r"COBOL, FLOW-MATIC, 100\% grit"
+    assert latex_service.wrap_in_jake_template(doc) == latex_service.wrap_in_jake_template(RESUME_TEXT)
+
+
+def test_latex_escape_matches_sequential_replaces():
+    s = r"a\b & 50% $x #1 snake_case {braces} ~home ^up"
+    expected = s.replace("\\", r"\\").replace("&", r"\&").replace("%", r"\%")
+    expected = expected.replace("$", r"\$").replace("#", r"\#").replace("_", r"\_")
+    expected = expected.replace("{", r"\{").replace("}", r"\}").replace("~", r"\textasciitilde{}")
+    expected = expected.replace("^", r"\textasciicircum{}")
+    assert latex_service.latex_escape(s) == expected
+
+
+def test_scoring_reuses_the_document_index():
+    doc = parse_resume(RESUME_TEXT)
+    keywords = ["COBOL", "compiler", "Python"]
+
+    index = score_service.build_match_index(doc)
+    assert score_service.build_match_index(doc) is index
+    assert score_service.keyword_match_score(keywords, doc) == score_service.keyword_match_score(keywords, RESUME_TEXT)
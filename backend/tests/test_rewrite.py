@@ -0,0 +1,416 @@
+import asyncio
+import json
+import os
+import sys
+import time
+from types import SimpleNamespace
+
+import httpx
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+# Add parent directory (backend/) to path
+sys.path.append(os.path.dirname(os.path.dirname(__file__)))
+
+from app.routes.health import router as health_router
+from app.routes.resume_routes import router as resume_router
+from app.services import keyword_service, rewrite_service, model_registry, llm_client, profile_service, latex_service, parsing_service, resume_parser
+from app.services.llm_client import CircuitBreaker, GeminiBackend, LLMClient
+from app.services.supabase_service import get_supabase
+from app.utils.auth import get_optional_user
+
+RESUME = r"""\documentclass{article}
+\begin{document}
+\section{Experience}
+\resumeItem{Built services in Python}
+\end{document}"""
+
+JD = "Backend engineer with Python, FastAPI and Docker experience."
+
+
+def make_app():
+    app = FastAPI()
+    app.include_router(resume_router, prefix="/api")
+    app.dependency_overrides[get_supabase] = lambda: None  # guest requests never touch Supabase
+    return app
+
+
+def parse_sse(body: str):
+    events = []
+    for block in body.strip().split("\n\n"):
+        lines = dict(line.split(": ", 1) for line in block.splitlines())
+        events.append((lines["event"], json.loads(lines["data"])))
+    return events
+
+
+def test_stream_emits_chunks_then_final_score(monkeypatch):
+    async def fake_keywords(job_description, max_features=25, fallback_batch=None):
+        return ["Python", "FastAPI", "Docker"]
+
+    async def fake_stream(latex_resume, job_description, keywords, experiences=None, projects=None):
+        for part in latex_resume.replace("Built services in Python", "Built FastAPI services in Python on Docker").split("\n"):
+            await asyncio.sleep(0)
+            yield part + "\n"
+
+    monkeypatch.setattr(keyword_service, "extract_keywords_async", fake_keywords)
+    monkeypatch.setattr(rewrite_service, "stream_rewrite_with_gemini", fake_stream)
+
+    with TestClient(make_app()) as client:
+        res = client.post("/api/rewrite/stream", data={"latex_content": RESUME, "job_description": JD})
+
+    assert res.headers["content-type"].startswith("text/event-stream")
+    events = parse_sse(res.text)
+    names = [name for name, _ in events]
+
+    assert names[:3] == ["stage", "keywords", "stage"]
+    assert names.count("chunk") == len(RESUME.split("\n"))
+    assert names[-1] == "done"
+    done = events[-1][1]
+    assert "Built FastAPI services" in done["tailored_resume"]
+    assert done["keywords"] == ["Python", "FastAPI", "Docker"]
+    assert done["ats_score"] > 0
+
+
+def test_stream_reports_upstream_failure_as_error_event(monkeypatch):
+    async def fake_keywords(job_description, max_features=25, fallback_batch=None):
+        return ["Python", "FastAPI", "Docker"]
+
+    async def failing_stream(*args, **kwargs):
+        yield "\\begin{document}"
+        raise RuntimeError("quota exceeded")
+
+    monkeypatch.setattr(keyword_service, "extract_keywords_async", fake_keywords)
+    monkeypatch.setattr(rewrite_service, "stream_rewrite_with_gemini", failing_stream)
+
+    with TestClient(make_app()) as client:
+        res = client.post("/api/rewrite/stream", data={"latex_content": RESUME, "job_description": JD})
+
+    name, data = parse_sse(res.text)[-1]
+    assert name == "error"
+    assert "quota exceeded" in data["detail"]
+
+
+def test_stream_rejects_missing_resume_before_streaming():
+    with TestClient(make_app()) as client:
+        res = client.post("/api/rewrite/stream", data={"job_description": JD})
+    assert res.status_code == 400
+
+
+SECTIONED = r"""\documentclass{article}
+\newcommand{\resumeItem}[1]{\item{#1}}
+\begin{document}
+\begin{center}Ada Lovelace\end{center}
+
+\section{Education}
+University of London
+
+\section{Experience}
+\resumeItem{Wrote the first algorithm}
+
+\section*{Projects}
+\resumeItem{Difference engine notes}
+\end{document}"""
+
+
+class SlowFakeGemini:
+    """Stands in for google.generativeai: each call sleeps, then tags the section."""
+
+    def __init__(self, delay):
+        self.delay = delay
+        self.prompts = []
+        self.active = 0
+        self.max_active = 0
+
+    def GenerativeModel(self, name):
+        return self
+
+    async def generate_content_async(self, prompt):
+        self.prompts.append(prompt)
+        self.active += 1
+        self.max_active = max(self.max_active, self.active)
+        await asyncio.sleep(self.delay)
+        self.active -= 1
+        section = prompt.split('Original LaTeX Section:\n"""', 1)[1].rsplit('"""', 1)[0]
+        return SimpleNamespace(text="```latex\n" + section.strip() + " % tailored\n```")
+
+
+@pytest.fixture
+def unthrottled_gemini(monkeypatch):
+    """A fresh Gemini client so earlier tests' rate-limit usage can't skew timings."""
+    client = LLMClient(
+        GeminiBackend("test-model"), rate=1000, burst=1000, concurrency=8, timeout=5,
+        breaker=CircuitBreaker(5, 30),
+    )
+    monkeypatch.setattr(llm_client, "gemini", client)
+    return client
+
+
+def test_split_latex_sections_keeps_preamble_and_header():
+    head, sections, tail = rewrite_service.split_latex_sections(SECTIONED)
+    assert head.rstrip().endswith(r"\begin{center}Ada Lovelace\end{center}")
+    assert [title for title, _ in sections] == ["Education", "Experience", "Projects"]
+    assert tail == r"\end{document}"
+    assert head + "".join(latex for _, latex in sections) + tail == SECTIONED
+    assert rewrite_service.split_latex_sections(RESUME.replace(r"\section{Experience}", "")) is None
+
+
+def test_sections_are_rewritten_concurrently_and_reassembled(monkeypatch, unthrottled_gemini):
+    fake = SlowFakeGemini(delay=0.2)
+    monkeypatch.setattr(model_registry.gemini, "get", lambda: fake)
+    experiences = [{"role": "Analyst", "company": "Babbage & Co", "bullets": []}]
+
+    start = time.perf_counter()
+    out = asyncio.run(rewrite_service.rewrite_resume_sectioned_async(
+        SECTIONED, JD, ["Python"], experiences=experiences, concurrency=3
+    ))
+    elapsed = time.perf_counter() - start
+
+    assert elapsed < 0.4          # ~ one section's latency, not three
+    assert fake.max_active == 3
+    assert out.startswith(r"\documentclass{article}")
+    assert out.endswith(r"\end{document}")
+    assert out.count("% tailored") == 3
+    assert "```" not in out
+    # Saved experiences only go to the Experience section's prompt
+    assert ["Babbage & Co" in p for p in fake.prompts] == [False, True, False]
+
+
+def test_section_concurrency_is_bounded(monkeypatch, unthrottled_gemini):
+    fake = SlowFakeGemini(delay=0.05)
+    monkeypatch.setattr(model_registry.gemini, "get", lambda: fake)
+
+    asyncio.run(rewrite_service.rewrite_resume_sectioned_async(SECTIONED, JD, ["Python"], concurrency=1))
+    assert fake.max_active == 1
+
+
+def saved_experiences(n):
+    return [
+        {"role": f"Engineer {i}", "company": f"Company {i}", "bullets": [f"Maintained internal tool number {i} " * 5]}
+        for i in range(n)
+    ]
+
+
+def test_prompt_plan_keeps_everything_under_budget():
+    experiences = saved_experiences(2)
+    plan = rewrite_service.plan_rewrite_prompt(RESUME, JD, ["Python"], experiences, [], budget=100_000)
+
+    assert plan.job_description == JD
+    assert plan.experiences == experiences
+    prompt = rewrite_service.build_rewrite_prompt(RESUME, JD, ["Python"], experiences, [])
+    assert plan.stats["prompt_tokens"] == rewrite_service.estimate_tokens(prompt)
+    assert plan.stats["experiences"] == "2/2"
+    assert not plan.stats["jd_trimmed"]
+
+
+def test_prompt_plan_ranks_saved_entries_and_enforces_budget():
+    experiences = saved_experiences(40)
+    experiences[25]["bullets"] = ["Built FastAPI services in Python"]
+    projects = [
+        {"name": "Dockerized Python CLI", "tech_stack": ["Python", "Docker"], "bullets": []},
+        {"name": "Watercolor portfolio", "tech_stack": [], "bullets": []},
+    ]
+    jd = "About us: we are a friendly company with a long history. " * 40 + "Requirements: Python, FastAPI and Docker."
+    keywords = ["Python", "FastAPI", "Docker"]
+
+    base = rewrite_service.estimate_tokens(rewrite_service.build_rewrite_prompt(RESUME, jd, keywords))
+    plan = rewrite_service.plan_rewrite_prompt(RESUME, jd, keywords, experiences, projects, budget=base - 200)
+
+    assert plan.stats["jd_trimmed"]
+    assert plan.job_description.startswith("Requirements:")
+    assert plan.stats["prompt_tokens"] <= plan.stats["budget"]
+    # The two keyword-matching entries are ranked first and survive
+    assert any(e is experiences[25] for e in plan.experiences)
+    assert plan.projects == [projects[0]]
+    assert plan.stats["included"][:2] == [
+        {"type": "experience", "index": 25, "relevance": 0.667},
+        {"type": "project", "index": 0, "relevance": 0.667},
+    ]
+    assert len(plan.experiences) + len(plan.projects) <= rewrite_service.Config.PROMPT_MAX_SAVED_ENTRIES
+
+
+def test_prompt_plan_leaves_out_saved_entries_already_on_the_resume():
+    doc = resume_parser.parse_resume("Jane Doe\nExperience\nSenior Engineer 1, Company 1\n- Built APIs\nProjects\nChess Engine\n")
+    experiences = saved_experiences(2)     # Engineer 0 at Company 0, Engineer 1 at Company 1
+    experiences.append({"role": "Data Analyst", "company": "Company 1", "bullets": []})
+    projects = [{"name": "Chess Engine", "bullets": []}, {"name": "Ray Tracer", "bullets": []}]
+
+    plan = rewrite_service.plan_rewrite_prompt(RESUME, JD, ["Python"], experiences, projects, resume_doc=doc)
+
+    # Another role at a company on the resume is still a new entry
+    assert plan.experiences == [experiences[0], experiences[2]]
+    assert plan.projects == [projects[1]]
+    assert plan.stats["already_on_resume"] == 2
+
+
+def test_upload_is_parsed_once_and_the_document_is_shared(monkeypatch):
+    text = "Jane Doe\njane@example.com\nExperience\nEngineer, Acme\n- Built Python services\n"
+    parsed, rendered = [], []
+
+    def counting_parse(text):
+        parsed.append(text)
+        return real_parse(text)
+
+    def recording_wrap(resume):
+        rendered.append(resume)
+        return real_wrap(resume)
+
+    async def fake_keywords(job_description, max_features=25, fallback_batch=None):
+        return ["Python", "FastAPI"]
+
+    async def fake_rewrite(latex_resume, job_description, keywords, experiences=None, projects=None):
+        return latex_resume.replace("Python", "Python and FastAPI")
+
+    real_parse, real_wrap = resume_parser.parse_resume, latex_service.wrap_in_jake_template
+    monkeypatch.setattr(parsing_service, "extract_text_from_resume", lambda upload: text)
+    monkeypatch.setattr(resume_parser, "parse_resume", counting_parse)
+    monkeypatch.setattr(latex_service, "wrap_in_jake_template", recording_wrap)
+    monkeypatch.setattr(keyword_service, "extract_keywords_async", fake_keywords)
+    monkeypatch.setattr(rewrite_service, "rewrite_resume_with_gemini_async", fake_rewrite)
+
+    with TestClient(make_app()) as client:
+        res = client.post(
+            "/api/rewrite",
+            files={"resume": ("resume.pdf", b"%PDF-", "application/pdf")},
+            data={"job_description": JD},
+        )
+
+    assert res.status_code == 200
+    body = res.json()
+    assert parsed == [text]
+    [doc] = rendered
+    assert isinstance(doc, resume_parser.ResumeDocument)
+    assert body["ats_score"] > 0 and "original_ats_score" not in body
+
+
+# -------------------- event loop --------------------
+
+def test_rewrite_overlaps_slow_stages_and_leaves_the_loop_free(monkeypatch):
+    spans = {}
+
+    async def slow(name, seconds):
+        start = time.perf_counter()
+        await asyncio.sleep(seconds)
+        spans.setdefault(name, []).append((start, time.perf_counter()))
+
+    async def slow_keywords(job_description, max_features=25, fallback_batch=None):
+        await slow("keywords", 0.3)
+        return ["Python", "FastAPI", "Docker"]
+
+    async def slow_rows(supabase, user_id, table):
+        await slow("profile", 0.3)
+        return []
+
+    async def slow_rewrite(latex_resume, job_description, keywords, experiences=None, projects=None):
+        await slow("rewrite", 0.2)
+        return latex_resume.replace("Python", "Python, FastAPI and Docker")
+
+    monkeypatch.setattr(keyword_service, "extract_keywords_async", slow_keywords)
+    monkeypatch.setattr(profile_service, "get_user_rows", slow_rows)
+    monkeypatch.setattr(rewrite_service, "rewrite_resume_with_gemini_async", slow_rewrite)
+
+    app = make_app()
+    app.include_router(health_router, prefix="/api")
+    app.dependency_overrides[get_optional_user] = lambda: {"sub": "user-1"}
+
+    async def run():
+        transport = httpx.ASGITransport(app=app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://test") as client:
+            start = time.perf_counter()
+            rewrite = asyncio.ensure_future(client.post(
+                "/api/rewrite", data={"latex_content": RESUME, "job_description": JD, "bypass_cache": "true"}
+            ))
+            await asyncio.sleep(0.05)
+            health = await client.get("/api/health")
+            health_done = time.perf_counter()
+            rewrite_in_flight = not rewrite.done()
+            res = await rewrite
+            return res, health, health_done - start, rewrite_in_flight, time.perf_counter() - start
+
+    res, health, health_s, rewrite_in_flight, total_s = asyncio.run(run())
+
+    assert res.status_code == 200 and "FastAPI and Docker" in res.json()["tailored_resume"]
+    # /api/health was answered while the rewrite was still waiting on its fakes
+    assert health.status_code == 200
+    assert rewrite_in_flight and health_s < 0.15
+    # Keywords overlapped both profile fetches: ~0.3 s + 0.2 s, not 0.3 + 0.3 + 0.2
+    [(kw_start, kw_end)] = spans["keywords"]
+    assert all(start < kw_end and kw_start < end for start, end in spans["profile"])
+    assert total_s < 0.75
+
+
+# -------------------- batch --------------------
+
+def test_batch_shares_profile_and_streams_each_result(monkeypatch):
+    profile_fetches = []
+    active = peak = 0
+
+    async def fake_rows(supabase, user_id, table):
+        profile_fetches.append(table)
+        return [{"role": "Engineer", "company": "Acme", "bullets": ["Shipped Python APIs"]}] if table == "experiences" else []
+
+    async def fake_keywords(job_description, max_features=25, fallback_batch=None):
+        return [job_description.split()[0]]
+
+    async def fake_rewrite(latex_resume, job_description, keywords, experiences=None, projects=None):
+        nonlocal active, peak
+        active += 1
+        peak = max(peak, active)
+        # Later JDs finish first, so results arrive out of submission order
+        await asyncio.sleep(0.01 * (5 - int(job_description.split()[1])))
+        active -= 1
+        assert experiences and experiences[0]["company"] == "Acme"
+        return latex_resume.replace("Python", keywords[0] + " and Python")
+
+    monkeypatch.setattr(profile_service, "get_user_rows", fake_rows)
+    monkeypatch.setattr(keyword_service, "extract_keywords_async", fake_keywords)
+    monkeypatch.setattr(rewrite_service, "rewrite_resume_with_gemini_async", fake_rewrite)
+    monkeypatch.setattr(rewrite_service.Config, "BATCH_CONCURRENCY", 2)
+
+    app = make_app()
+    app.dependency_overrides[get_optional_user] = lambda: {"sub": "user-1"}
+    jds = [f"Skill{i} {i} backend role" for i in range(5)]
+    with TestClient(app) as client:
+        res = client.post("/api/rewrite/batch", data={"latex_content": RESUME, "job_descriptions": json.dumps(jds)})
+
+    events = parse_sse(res.text)
+    assert events[0] == ("start", {"count": 5, "rewrite_mode": "full"})
+    assert events[-1] == ("done", {"count": 5, "failed": 0})
+    results = {data["index"]: data for name, data in events if name == "result"}
+    assert sorted(results) == [0, 1, 2, 3, 4]
+    assert [data["index"] for name, data in events if name == "result"] != [0, 1, 2, 3, 4]
+    assert "Skill3 and Python" in results[3]["tailored_resume"]
+    assert results[3]["keywords"] == ["Skill3"]
+    assert sorted(profile_fetches) == ["experiences", "projects"]
+    assert peak == 2
+
+
+def test_batch_reports_per_jd_errors(monkeypatch):
+    async def fake_keywords(job_description, max_features=25, fallback_batch=None):
+        return ["Python"]
+
+    async def flaky_rewrite(latex_resume, job_description, keywords, experiences=None, projects=None):
+        if "bad" in job_description:
+            raise llm_client.LLMTimeout("slow upstream")
+        return latex_resume
+
+    monkeypatch.setattr(keyword_service, "extract_keywords_async", fake_keywords)
+    monkeypatch.setattr(rewrite_service, "rewrite_resume_with_gemini_async", flaky_rewrite)
+
+    with TestClient(make_app()) as client:
+        res = client.post("/api/rewrite/batch", data={
+            "latex_content": RESUME, "job_descriptions": json.dumps(["good JD", "bad JD"])
+        })
+
+    events = dict((data.get("index", name), (name, data)) for name, data in parse_sse(res.text))
+    assert events[0][0] == "result"
+    assert events[1][0] == "error"
+    assert events[1][1]["status_code"] == 503
+    assert parse_sse(res.text)[-1] == ("done", {"count": 2, "failed": 1})
+
+
+@pytest.mark.parametrize("payload", ["not json", "[]", '["ok", 3]', json.dumps(["jd"] * 100)])
+def test_batch_rejects_bad_job_descriptions(payload):
+    with TestClient(make_app()) as client:
+        res = client.post("/api/rewrite/batch", data={"latex_content": RESUME, "job_descriptions": payload})
+    assert res.status_code == 400
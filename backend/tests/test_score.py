@@ -0,0 +1,256 @@
+import os
+import random
+import sys
+from difflib import SequenceMatcher
+
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+# Add parent directory (backend/) to path
+sys.path.append(os.path.dirname(os.path.dirname(__file__)))
+
+from app.routes.resume_routes import router as resume_router
+from app.services import model_registry, score_service, score_session_service
+from app.services.latex_service import strip_code_fences
+from app.services.score_service import normalize, stem, build_match_index, keyword_match_score, KeywordMatchIndex, compute_ats_score
+
+VOCAB = [
+    "python", "java", "javascript", "typescript", "react", "node.js", "express",
+    "fastapi", "flask", "django", "sql", "postgresql", "mysql", "mongodb",
+    "docker", "kubernetes", "ci/cd", "git", "graphql", "linux", "tensorflow",
+    "pytorch", "machine learning", "deep learning", "nlp", "computer vision",
+    "c++", "c#", "go", "rust", "scala", "spark", "hadoop", "kafka", "airflow",
+    "developed", "developing", "engineering", "engineer", "optimized", "optimizing",
+    "scalable", "scalability", "pipelines", "pipeline", "analytics", "analysis",
+    "microservices", "microservice", "deployment", "deployed", "testing", "tested",
+    "recommendation", "recommendations", "latency", "throughput", "distributed",
+    "aws", "azure", "gcp", "terraform", "redis", "celery", "pandas", "numpy",
+]
+
+
+def legacy_keyword_match_score(keywords, resume_text):
+    """The original O(K x T) implementation, kept as the regression oracle."""
+    resume_norm = normalize(resume_text)
+    resume_tokens = set(resume_norm.split())
+    hits = 0
+    for kw in keywords:
+        kw_norm = normalize(kw)
+        if kw_norm in resume_norm:
+            hits += 1
+            continue
+        for token in resume_tokens:
+            if kw_norm == token:
+                hits += 1
+                break
+        else:
+            for token in resume_tokens:
+                if SequenceMatcher(None, stem(kw_norm).lower(), stem(token).lower()).ratio() >= 0.75:
+                    hits += 1
+                    break
+    if len(keywords) == 0:
+        return 0.0
+    return hits / len(keywords)
+
+
+def mutate(word, rng):
+    """Introduce a typo: insert, delete or substitute one character."""
+    if len(word) < 3:
+        return word
+    i = rng.randrange(len(word))
+    op = rng.choice("ids")
+    letter = rng.choice("abcdefghijklmnopqrstuvwxyz")
+    if op == "i":
+        return word[:i] + letter + word[i:]
+    if op == "d":
+        return word[:i] + word[i + 1:]
+    return word[:i] + letter + word[i + 1:]
+
+
+def regression_corpus(seed=451, cases=150):
+    rng = random.Random(seed)
+    for _ in range(cases):
+        resume_words = [mutate(rng.choice(VOCAB), rng) if rng.random() < 0.3 else rng.choice(VOCAB)
+                        for _ in range(rng.randint(20, 120))]
+        keywords = [mutate(rng.choice(VOCAB), rng) if rng.random() < 0.5 else rng.choice(VOCAB)
+                    for _ in range(rng.randint(0, 20))]
+        yield keywords, " ".join(resume_words)
+
+
+def test_indexed_matching_matches_legacy_scores():
+    # Taxonomy aliases are an addition on top of the legacy rules; compare without them
+    for keywords, resume_text in regression_corpus():
+        index = KeywordMatchIndex(resume_text, skill_aliases=False)
+        assert keyword_match_score(keywords, resume_text, index=index) == legacy_keyword_match_score(keywords, resume_text)
+
+
+def test_keywords_match_taxonomy_aliases():
+    resume_text = "Deployed services to k8s with GitHub Actions; built ML models in sklearn."
+    keywords = ["Kubernetes", "Machine Learning", "scikit-learn", "Terraform"]
+
+    assert keyword_match_score(keywords, resume_text) == 0.75
+    index = KeywordMatchIndex(resume_text, skill_aliases=False)
+    assert keyword_match_score(keywords, resume_text, index=index) < 0.75
+
+
+def test_fuzzy_lookup_touches_few_candidates():
+    rng = random.Random(7)
+    resume_text = " ".join(
+        "".join(rng.choice("abcdefghijklmnopqrstuvwxyz") for _ in range(rng.randint(4, 10)))
+        for _ in range(3000)
+    )
+    index = build_match_index(resume_text)
+    keywords = ["kubernetes", "terraform", "postgresql", "tensorflow", "observability"]
+
+    score = keyword_match_score(keywords, resume_text, index=index)
+
+    assert score == legacy_keyword_match_score(keywords, resume_text)
+    assert index.comparisons < 10 * len(keywords)
+    assert len(index.tokens) > 2500
+
+
+def test_stem_is_memoized():
+    score_service.stem.cache_clear()
+    build_match_index("developed developing developer")
+    build_match_index("developed developing developer")
+    assert score_service.stem.cache_info().hits >= 3
+
+
+# -------------------- scoring sessions --------------------
+
+JD = """We are looking for a backend engineer with Python, FastAPI and PostgreSQL.
+Responsibilities: build scalable APIs, containerize services with Docker,
+design data pipelines and improve latency."""
+
+KEYWORDS = ["Python", "FastAPI", "PostgreSQL", "Docker", "Kubernetes", "pipelines"]
+
+RESUME = r"""\begin{document}
+\section{Experience}
+\resumeItem{Built FastAPI services in Python backed by PostgreSQL}
+\resumeItem{Reduced latency of data pipeline jobs by 35\%}
+\section{Projects}
+\resumeItem{Recommendation engine deployed with Docker}
+\end{document}"""
+
+
+def test_session_score_matches_full_recompute():
+    _, session = score_session_service.create_session(JD, KEYWORDS)
+
+    texts = [
+        RESUME,
+        RESUME.replace("Docker", "Docker and Kubernetes"),
+        RESUME.replace(r"\section{Projects}", ""),
+        "```latex\n" + RESUME + "\n```",
+        "",
+    ]
+    for text in texts:
+        assert session.update(text) == compute_ats_score(JD, strip_code_fences(text), KEYWORDS)
+
+
+def test_session_only_retokenizes_changed_lines():
+    _, session = score_session_service.create_session(JD, KEYWORDS)
+    session.update(RESUME)
+    before = session.lines_tokenized
+
+    start = session.text.index("Docker")
+    score = session.apply_edits([{"start": start, "end": start + len("Docker"), "text": "Kubernetes"}])
+
+    assert session.lines_tokenized - before == 1
+    assert score == compute_ats_score(JD, RESUME.replace("Docker", "Kubernetes"), KEYWORDS)
+
+
+def test_session_keeps_normalized_text_and_skills_per_line(monkeypatch):
+    _, session = score_session_service.create_session(JD, KEYWORDS)
+    matcher = model_registry.skill_matcher.get()
+    rng = random.Random(7)
+    lines = RESUME.split("\n") + ["", "  -- k8s, CI/CD --", "(Spring Boot)", "\\hfill"]
+    for _ in range(30):
+        text = "\n".join(rng.sample(lines, rng.randrange(len(lines) + 1)))
+        session.update(text)
+        assert session.index.resume_norm == normalize(text)
+        assert session.index.skills() == set(matcher.count_skills(text))
+
+    scanned = []
+    monkeypatch.setattr(matcher, "count_skills", lambda text: scanned.append(text) or {})
+    session.update(RESUME)
+    scanned.clear()
+    start = session.text.index("Docker")
+    session.apply_edits([{"start": start, "end": start, "text": "k8s and "}])
+
+    assert scanned == ["\\resumeItem{Recommendation engine deployed with k8s and Docker}"]
+
+
+@pytest.mark.parametrize("edits", [
+    [{"start": 5, "end": 2, "text": "x"}],
+    [{"start": 0, "end": 10_000}],
+    [{"start": -1, "end": 0}],
+    [{"start": "0", "end": 1}],
+    [{"start": 0, "end": 1, "text": 3}],
+    [{"start": 0, "end": 0, "text": "x"}, {"start": 0, "end": len(RESUME) + 2}],
+    {"start": 0, "end": 1},
+])
+def test_session_rejects_bad_edits_without_changing_text(edits):
+    _, session = score_session_service.create_session(JD, KEYWORDS)
+    session.update(RESUME)
+
+    with pytest.raises(ValueError):
+        session.apply_edits(edits)
+    assert session.text == RESUME
+
+
+def test_session_route_answers_400_for_bad_edits():
+    app = FastAPI()
+    app.include_router(resume_router, prefix="/api")
+    session_id, session = score_session_service.create_session(JD, KEYWORDS)
+    session.update(RESUME)
+
+    with TestClient(app) as client:
+        out_of_range = client.post(f"/api/score/sessions/{session_id}", data={"edits_json": '[{"start": 0, "end": 99999}]'})
+        not_json = client.post(f"/api/score/sessions/{session_id}", data={"edits_json": "[{"})
+        ok = client.post(f"/api/score/sessions/{session_id}", data={"edits_json": '[{"start": 0, "end": 0, "text": "% "}]'})
+
+    assert out_of_range.status_code == 400
+    assert not_json.status_code == 400
+    assert ok.status_code == 200
+
+
+def test_session_weight_grows_with_tracked_lines():
+    _, session = score_session_service.create_session(JD, KEYWORDS)
+    session.update(RESUME)
+    one = session.approx_bytes()
+    session.update("\n".join(f"\\resumeItem{{Line {i} with Python and Docker}}" for i in range(200)))
+
+    assert session.approx_bytes() > 200 * 200 > one
+
+
+def test_session_is_weighed_under_its_lock(monkeypatch):
+    session_id, session = score_session_service.create_session(JD, KEYWORDS)
+    approx_bytes = session.approx_bytes
+
+    def locked_approx_bytes():
+        # save_session runs on the event loop while another request's update
+        # may be mutating line_tokens in a worker thread
+        assert session.lock.locked()
+        return approx_bytes()
+
+    monkeypatch.setattr(session, "approx_bytes", locked_approx_bytes)
+    session.update(RESUME)
+    session.apply_edits([{"start": 0, "end": 0, "text": "% "}])
+    score_session_service.save_session(session_id, session)
+
+    with session.lock:
+        assert session.weight == approx_bytes()
+    assert score_session_service.sessions.stats()["weight"] >= session.weight
+
+
+def test_session_store_is_bounded():
+    store = score_session_service.sessions
+    old_max = store.max_entries
+    store.max_entries = 2
+    try:
+        first, _ = score_session_service.create_session(JD, KEYWORDS)
+        score_session_service.create_session(JD, KEYWORDS)
+        score_session_service.create_session(JD, KEYWORDS)
+        assert score_session_service.get_session(first) is None
+    finally:
+        store.max_entries = old_max
@@ -0,0 +1,108 @@
+import asyncio
+import os
+import sys
+from types import SimpleNamespace
+
+import pytest
+
+# Add parent directory (backend/) to path
+sys.path.append(os.path.dirname(os.path.dirname(__file__)))
+
+from app.services import keyword_service, rewrite_service, model_registry
+from app.utils.singleflight import SingleFlight, gemini_flights
+
+RESUME = r"""\documentclass{article}
+\begin{document}
+\resumeItem{Built services in Python}
+\end{document}"""
+
+
+class FakeSlowGemini:
+    """Stands in for google.generativeai with a slow, counting backend."""
+
+    def __init__(self, delay=0.1, text="Python, FastAPI, Docker, Kafka", fail=False):
+        self.delay = delay
+        self.text = text
+        self.fail = fail
+        self.calls = 0
+
+    def GenerativeModel(self, name):
+        return self
+
+    async def generate_content_async(self, prompt):
+        self.calls += 1
+        await asyncio.sleep(self.delay)
+        if self.fail:
+            raise RuntimeError("upstream 503")
+        return SimpleNamespace(text=self.text)
+
+
+@pytest.fixture
+def fake_gemini(monkeypatch):
+    fake = FakeSlowGemini()
+    monkeypatch.setattr(model_registry.gemini, "get", lambda: fake)
+    return fake
+
+
+def test_concurrent_identical_keyword_calls_share_one_upstream_call(fake_gemini):
+    before = gemini_flights.stats()
+
+    async def burst():
+        return await asyncio.gather(*(
+            keyword_service.extract_skills_with_gemini_async("Backend role: Python, FastAPI") for _ in range(5)
+        ))
+
+    results = asyncio.run(burst())
+    after = gemini_flights.stats()
+
+    assert fake_gemini.calls == 1
+    assert all(r == ["Python", "FastAPI", "Docker", "Kafka"] for r in results)
+    assert after["coalesced"] - before["coalesced"] == 4
+    assert after["in_flight"] == 0
+
+
+def test_different_inputs_and_later_calls_are_not_coalesced(fake_gemini):
+    async def run():
+        await asyncio.gather(
+            rewrite_service.rewrite_resume_with_gemini_async(RESUME, "JD one", ["Python"]),
+            rewrite_service.rewrite_resume_with_gemini_async(RESUME, "JD two", ["Python"]),
+        )
+        # Not a cache: the same call after the first finished goes upstream again
+        await rewrite_service.rewrite_resume_with_gemini_async(RESUME, "JD one", ["Python"])
+
+    asyncio.run(run())
+    assert fake_gemini.calls == 3
+
+
+def test_errors_reach_every_waiter_and_are_not_remembered():
+    flights = SingleFlight()
+    fake = FakeSlowGemini(fail=True)
+
+    async def call():
+        return await flights.do("k", fake.generate_content_async, "prompt")
+
+    async def run():
+        return await asyncio.gather(call(), call(), return_exceptions=True)
+
+    results = asyncio.run(run())
+    assert [str(r) for r in results] == ["upstream 503", "upstream 503"]
+
+    fake.fail = False
+    assert asyncio.run(call()).text == fake.text
+    assert fake.calls == 2
+    assert flights.stats()["coalesced"] == 1
+
+
+def test_cancelled_caller_does_not_cancel_the_shared_call():
+    flights = SingleFlight()
+    fake = FakeSlowGemini(delay=0.05)
+
+    async def run():
+        first = asyncio.ensure_future(flights.do("k", fake.generate_content_async, "prompt"))
+        second = asyncio.ensure_future(flights.do("k", fake.generate_content_async, "prompt"))
+        await asyncio.sleep(0.01)
+        first.cancel()
+        return await second
+
+    assert asyncio.run(run()).text == fake.text
+    assert fake.calls == 1
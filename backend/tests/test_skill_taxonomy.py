@@ -0,0 +1,94 @@
+import json
+import os
+import sys
+
+# Add parent directory (backend/) to path
+sys.path.append(os.path.dirname(os.path.dirname(__file__)))
+
+from app.services import keyword_service, model_registry
+from app.services.model_registry import LazyResource
+from app.services.skill_taxonomy import SkillMatcher, build_matcher
+
+ENTRIES = [
+    {"name": "Java", "category": "language"},
+    {"name": "JavaScript", "category": "language", "aliases": ["JS"]},
+    {"name": "Spring", "category": "framework"},
+    {"name": "Spring Boot", "category": "framework"},
+    {"name": "Machine learning", "category": "ai", "aliases": ["ML"]},
+    {"name": "Kubernetes", "category": "devops", "aliases": ["k8s"]},
+    {"name": "React", "category": "framework", "exact": ["React"]},
+    {"name": "Swift", "category": "language", "exact": ["Swift"]},
+    {"name": "C++", "category": "language", "aliases": ["cpp"]},
+    {"name": "CI/CD", "category": "devops", "aliases": ["cicd"]},
+]
+
+
+def names(matcher, text):
+    return [m.name for m in matcher.find(text)]
+
+
+def test_multi_word_skills_and_aliases_resolve_to_canonical_names():
+    matcher = SkillMatcher(ENTRIES)
+    text = "Ship ML models on k8s; machine learning at scale with JS"
+
+    assert names(matcher, text) == ["Machine learning", "Kubernetes", "Machine learning", "JavaScript"]
+    assert matcher.count_skills(text) == {"Machine learning": 2, "Kubernetes": 1, "JavaScript": 1}
+    assert matcher.canonical("K8S") == "Kubernetes"
+    assert matcher.canonical("docker") is None
+
+
+def test_leftmost_longest_and_word_boundaries():
+    matcher = SkillMatcher(ENTRIES)
+
+    assert names(matcher, "Spring Boot and Spring") == ["Spring Boot", "Spring"]
+    assert names(matcher, "javascript, not java") == ["JavaScript", "Java"]
+    assert names(matcher, "cppcheck and C++ with CI/CD") == ["C++", "CI/CD"]
+
+
+def test_exact_terms_are_case_sensitive():
+    matcher = SkillMatcher(ENTRIES)
+
+    assert names(matcher, "we react swiftly") == []
+    assert names(matcher, "Swift and React apps") == ["Swift", "React"]
+
+
+def test_match_spans_point_into_the_text():
+    matcher = SkillMatcher(ENTRIES)
+    text = "Experience with Spring Boot."
+
+    [match] = matcher.find(text)
+    assert text[match.start:match.end] == "Spring Boot"
+    assert match.category == "framework"
+
+
+def test_bundled_taxonomy_loads():
+    matcher = build_matcher()
+
+    assert len(matcher.categories) > 1000
+    assert names(matcher, "Node.js services on k8s with sklearn") == ["Node.js", "Kubernetes", "scikit-learn"]
+
+
+def test_custom_taxonomy_file(tmp_path):
+    path = tmp_path / "skills.json"
+    path.write_text(json.dumps([{"name": "Widgetry", "category": "internal", "aliases": ["wdg"]}]))
+
+    matcher = build_matcher(str(path))
+    assert names(matcher, "Built wdg tooling") == ["Widgetry"]
+
+
+def test_fallback_lists_canonical_skills_first(monkeypatch):
+    monkeypatch.setattr(model_registry, "skill_matcher", LazyResource("skill_matcher", lambda: SkillMatcher(ENTRIES)))
+    jd = "Requirements: k8s, Kubernetes operators, ML pipelines and Spring Boot services."
+
+    assert keyword_service.extract_keywords_fallback(jd, max_features=2) == ["Kubernetes", "Machine learning"]
+
+
+def test_bundled_taxonomy_ignores_everyday_words():
+    matcher = build_matcher()
+    prose = ("You will join the rest of the team. We value solid judgement and a safe, lean process; "
+             "spark ideas and keep the ui tidy. Leadership and Sales matter.")
+
+    assert names(matcher, prose) == []
+    assert names(matcher, "REST APIs, ML and BI on Spark with SOLID code") == [
+        "REST APIs", "Machine learning", "Business intelligence", "Apache Spark", "SOLID principles",
+    ]
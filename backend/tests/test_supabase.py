@@ -0,0 +1,144 @@
+import asyncio
+import json
+import os
+import sys
+
+import httpx
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+# Add parent directory (backend/) to path
+sys.path.append(os.path.dirname(os.path.dirname(__file__)))
+
+from app.services.supabase_service import SupabaseClient, get_supabase
+from app.routes.user_data_routes import router as user_data_router
+from app.utils.auth import get_current_user
+
+
+class PostgrestStub:
+    """In-memory PostgREST lookalike: eq.<value> filters, insert, patch, delete."""
+
+    def __init__(self, fail_first=0, fail_status=503):
+        self.tables = {}
+        self.calls = []
+        self.fail_first = fail_first
+        self.fail_status = fail_status
+        self.next_id = 1
+
+    def _matches(self, row, params):
+        for key, value in params.items():
+            if key in ("order", "select"):
+                continue
+            if str(row.get(key)) != value.removeprefix("eq."):
+                return False
+        return True
+
+    def handler(self, request: httpx.Request) -> httpx.Response:
+        self.calls.append(request)
+        if self.fail_first > 0:
+            self.fail_first -= 1
+            return httpx.Response(self.fail_status)
+
+        table = request.url.path.rsplit("/", 1)[-1]
+        rows = self.tables.setdefault(table, [])
+        params = dict(request.url.params)
+
+        if request.method == "GET":
+            found = [r for r in rows if self._matches(r, params)]
+            if "select" in params:
+                cols = params["select"].split(",")
+                found = [{c: r.get(c) for c in cols} for r in found]
+            return httpx.Response(200, json=found)
+        if request.method == "POST":
+            row = {"id": str(self.next_id), **json.loads(request.content)}
+            self.next_id += 1
+            rows.append(row)
+            return httpx.Response(201)
+        if request.method == "PATCH":
+            for r in rows:
+                if self._matches(r, params):
+                    r.update(json.loads(request.content))
+            return httpx.Response(204)
+        if request.method == "DELETE":
+            self.tables[table] = [r for r in rows if not self._matches(r, params)]
+            return httpx.Response(204)
+        return httpx.Response(405)
+
+
+def make_client(stub, **kwargs):
+    return SupabaseClient(
+        "http://stub.local", "service-key",
+        backoff=0, transport=httpx.MockTransport(stub.handler), **kwargs
+    )
+
+
+def test_crud_roundtrip_through_shared_client():
+    stub = PostgrestStub()
+
+    async def run():
+        client = make_client(stub)
+        await client.insert("experiences", {"user_id": "u1", "company": "Acme"})
+        await client.insert("experiences", {"user_id": "u2", "company": "Other"})
+        rows = await client.fetch_user_rows("experiences", "u1")
+        await client.update("experiences", {"id": f"eq.{rows[0]['id']}"}, {"company": "Acme Corp"})
+        renamed = await client.fetch_user_rows("experiences", "u1")
+        await client.delete("experiences", {"id": f"eq.{rows[0]['id']}", "user_id": "eq.u1"})
+        remaining = await client.fetch_user_rows("experiences", "u1")
+        stats = client.stats()
+        await client.aclose()
+        return rows, renamed, remaining, stats
+
+    rows, renamed, remaining, stats = asyncio.run(run())
+
+    assert [r["company"] for r in rows] == ["Acme"]
+    assert renamed[0]["company"] == "Acme Corp"
+    assert remaining == []
+    assert stats["requests"] == 7
+    assert stats["in_flight"] == 0
+    assert stats["failures"] == 0
+    assert stub.calls[0].headers["apikey"] == "service-key"
+
+
+def test_retries_idempotent_requests_on_5xx():
+    stub = PostgrestStub(fail_first=2, fail_status=503)
+
+    async def run():
+        client = make_client(stub, max_retries=3)
+        res = await client.select("projects", {"user_id": "eq.u1"})
+        return res, client.stats()
+
+    res, stats = asyncio.run(run())
+
+    assert res.status_code == 200
+    assert stats["retries"] == 2
+    assert len(stub.calls) == 3
+
+
+def test_insert_not_retried_on_ambiguous_500():
+    stub = PostgrestStub(fail_first=1, fail_status=500)
+
+    async def run():
+        client = make_client(stub, max_retries=3)
+        return await client.insert("resumes", {"user_id": "u1", "title": "x"})
+
+    res = asyncio.run(run())
+
+    assert res.status_code == 500
+    assert len(stub.calls) == 1
+
+
+def test_routes_use_injected_client():
+    stub = PostgrestStub()
+    client = make_client(stub)
+
+    app = FastAPI()
+    app.include_router(user_data_router, prefix="/api")
+    app.dependency_overrides[get_current_user] = lambda: {"sub": "u1"}
+    app.dependency_overrides[get_supabase] = lambda: client
+
+    with TestClient(app) as http:
+        assert http.post("/api/templates/save", data={"title": "T", "latex": "L"}).json() == {"status": "success"}
+        templates = http.get("/api/templates").json()
+        assert [t["title"] for t in templates] == ["T"]
+        http.post(f"/api/templates/{templates[0]['id']}/rename", data={"new_title": "T2"})
+        assert http.get("/api/templates").json()[0]["title"] == "T2"